@@ -0,0 +1,170 @@
+"""
+Pre-agrupación local (sin IA) de las noticias del día por similitud de texto.
+- Vectoriza título + bajada con TF-IDF disperso (scipy.sparse si está instalado,
+  numpy denso si no).
+- Une las noticias con similitud coseno mayor al umbral (componentes conexas con
+  union-find) y vuelve a partir con un umbral más alto los grupos demasiado grandes,
+  para que una palabra común no encadene asuntos distintos.
+- Conserva solo los grupos publicados por al menos MIN_FUENTES medios distintos.
+
+El resultado es determinístico y tarda milisegundos; agrupar_temas.py usa a Gemini
+solo para ponerle nombre a cada grupo y resumirlo.
+"""
+
+import math
+from collections import Counter
+from typing import List, Dict
+import logging
+
+import numpy as np
+
+try:
+    from scipy import sparse
+    SCIPY_DISPONIBLE = True
+except ImportError:
+    SCIPY_DISPONIBLE = False
+
+import compactar_prompt
+from resumen_extractivo import tokenizar
+
+# Parámetros
+UMBRAL_SIMILITUD = 0.3       # Similitud coseno mínima para unir dos noticias
+PASO_UMBRAL = 0.1            # Cuánto sube el umbral al volver a partir un grupo grande
+MAX_TAMANO_GRUPO = 25        # Grupos más grandes se vuelven a partir
+MIN_FUENTES = 2              # Medios distintos mínimos por grupo (MIN_FUENTES_POR_TEMA)
+
+
+def texto_noticia(noticia: Dict) -> str:
+    """Título (dos veces, para darle más peso) y bajada sin HTML."""
+    titulo = compactar_prompt.limpiar_texto(noticia.get('titulo', ''))
+    return f"{titulo} {titulo} {compactar_prompt.limpiar_texto(noticia.get('resumen', ''))}"
+
+
+def vectorizar(textos: List[str]):
+    """
+    Matriz TF-IDF (noticias x vocabulario) con tf sublineal y filas normalizadas (L2).
+
+    Returns:
+        scipy.sparse.csr_matrix si scipy está disponible; si no, numpy.ndarray
+    """
+    vocabulario = {}
+    filas, columnas, valores = [], [], []
+    for fila, texto in enumerate(textos):
+        for token, cantidad in Counter(tokenizar(texto)).items():
+            filas.append(fila)
+            columnas.append(vocabulario.setdefault(token, len(vocabulario)))
+            valores.append(1.0 + math.log(cantidad))
+
+    filas = np.array(filas, dtype=np.int32)
+    columnas = np.array(columnas, dtype=np.int32)
+    valores = np.array(valores, dtype=np.float32)
+
+    frecuencia_documentos = np.bincount(columnas, minlength=len(vocabulario))
+    idf = np.log((1 + len(textos)) / (1 + frecuencia_documentos)) + 1.0
+    valores *= idf[columnas].astype(np.float32)
+
+    normas = np.sqrt(np.bincount(filas, weights=valores ** 2, minlength=len(textos)))
+    normas[normas == 0] = 1.0
+    valores /= normas[filas].astype(np.float32)
+
+    forma = (len(textos), max(len(vocabulario), 1))
+    if SCIPY_DISPONIBLE:
+        return sparse.csr_matrix((valores, (filas, columnas)), shape=forma)
+    matriz = np.zeros(forma, dtype=np.float32)
+    matriz[filas, columnas] = valores
+    return matriz
+
+
+def pares_similares(matriz, indices: List[int], umbral: float) -> List[tuple]:
+    """
+    Pares (i, j) de las filas `indices` con similitud coseno >= umbral (i < j, posiciones locales).
+    """
+    sub = matriz[indices]
+    similitud = sub @ sub.T
+    if SCIPY_DISPONIBLE:
+        similitud = sparse.triu(similitud, k=1).tocoo()
+        mascara = similitud.data >= umbral
+        return list(zip(similitud.row[mascara].tolist(), similitud.col[mascara].tolist()))
+    filas, columnas = np.nonzero(np.triu(similitud, k=1) >= umbral)
+    return list(zip(filas.tolist(), columnas.tolist()))
+
+
+def componentes(cantidad: int, pares: List[tuple]) -> List[List[int]]:
+    """
+    Componentes conexas (union-find con compresión de caminos) de un grafo dado por sus aristas.
+    """
+    padre = list(range(cantidad))
+
+    def raiz(x: int) -> int:
+        while padre[x] != x:
+            padre[x] = padre[padre[x]]
+            x = padre[x]
+        return x
+
+    for i, j in pares:
+        ri, rj = raiz(i), raiz(j)
+        if ri != rj:
+            padre[max(ri, rj)] = min(ri, rj)
+
+    grupos = {}
+    for x in range(cantidad):
+        grupos.setdefault(raiz(x), []).append(x)
+    return list(grupos.values())
+
+
+def agrupar_indices(matriz, indices: List[int], umbral: float) -> List[List[int]]:
+    """
+    Agrupa las filas `indices` por similitud y vuelve a partir los grupos grandes con un umbral mayor.
+    """
+    resultado = []
+    for grupo in componentes(len(indices), pares_similares(matriz, indices, umbral)):
+        miembros = [indices[k] for k in grupo]
+        if len(miembros) > MAX_TAMANO_GRUPO and umbral + PASO_UMBRAL < 1.0:
+            resultado.extend(agrupar_indices(matriz, miembros, umbral + PASO_UMBRAL))
+        else:
+            resultado.append(miembros)
+    return resultado
+
+
+def fuentes_grupo(grupo: List[int], noticias: List[Dict]) -> set:
+    """Medios distintos de un grupo (índices 0-based)."""
+    return {noticias[i].get('fuente', '') for i in grupo if noticias[i].get('fuente')}
+
+
+def agrupar_noticias(noticias: List[Dict], umbral: float = UMBRAL_SIMILITUD,
+                     min_fuentes: int = MIN_FUENTES) -> List[List[int]]:
+    """
+    Pre-agrupa noticias por similitud de título y bajada.
+
+    Args:
+        noticias: Noticias a agrupar
+        umbral: Similitud coseno mínima para unir dos noticias
+        min_fuentes: Medios distintos mínimos para conservar un grupo
+
+    Returns:
+        Grupos de índices 0-based, de mayor a menor cobertura (medios distintos, cantidad de notas).
+        Dentro de cada grupo, la primera noticia es la más cercana al centroide.
+    """
+    if not noticias:
+        return []
+
+    matriz = vectorizar([texto_noticia(n) for n in noticias])
+    grupos = [
+        grupo for grupo in agrupar_indices(matriz, list(range(len(noticias))), umbral)
+        if len(fuentes_grupo(grupo, noticias)) >= min_fuentes
+    ]
+
+    # Ordenar cada grupo por cercanía al centroide (la primera noticia lo representa)
+    ordenados = []
+    for grupo in grupos:
+        sub = matriz[grupo]
+        centroide = np.asarray(sub.mean(axis=0)).ravel()
+        cercania = np.asarray(sub @ centroide).ravel()
+        ordenados.append([grupo[k] for k in np.argsort(-cercania, kind="stable")])
+
+    ordenados.sort(key=lambda g: (len(fuentes_grupo(g, noticias)), len(g)), reverse=True)
+    logging.info(
+        f"  Pre-agrupación local: {len(noticias)} noticias → {len(ordenados)} grupos "
+        f"con ≥{min_fuentes} fuentes ({'scipy.sparse' if SCIPY_DISPONIBLE else 'numpy'})"
+    )
+    return ordenados
@@ -5,19 +5,20 @@ Versión MVP: Agrupación básica y generación de resúmenes por tema.
 
 import json
 import os
-import time
+from concurrent.futures import Future
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
 from typing import List, Dict
 import logging
 import re
 
-try:
-    from google import genai
-except ImportError:
-    logging.error("Error: google-genai no está instalado.")
-    logging.error("Instálalo con: pip install google-genai")
-    exit(1)
+import agrupacion_local
+import almacen_contenido
+import cache_llm
+import compactar_prompt
+import historico_temas_db
+import metricas_temas
+import planificador_gemini
 
 # Configuración de logging
 logging.basicConfig(
@@ -38,6 +39,25 @@ MAX_NOTICIAS_ANALIZAR = 150  # Máximo de noticias para analizar
 MAX_TEMAS_DETECTAR = 10      # Máximo de temas a detectar
 MIN_FUENTES_POR_TEMA = 2     # Mínimo de fuentes diferentes por tema
 
+# Modo de agrupación (AGRUPACION_MODO):
+# - local: pre-agrupación TF-IDF sin IA; Gemini solo nombra los grupos (ver agrupacion_local)
+# - jerarquico: map-reduce; cada bloque de titulares se agrupa por separado y en paralelo,
+#   y después un paso de fusión unifica los temas de todos los bloques
+# - simple: un único prompt con MAX_NOTICIAS_ANALIZAR noticias
+MODO_AGRUPACION = os.getenv("AGRUPACION_MODO", "local")
+MAX_NOTICIAS_JERARQUICO = 1200   # Máximo de noticias en los modos local y jerárquico (todo el día)
+TITULARES_POR_BLOQUE = 150       # Tope de entradas por prompt de agrupación
+MAX_TEMAS_POR_BLOQUE = 8         # Temas que puede devolver cada bloque
+MAX_NOTICIAS_POR_TEMA = 15       # Tope de noticias por tema fusionado (acota el prompt del resumen)
+MAX_GRUPOS_CANDIDATOS = 20       # Grupos locales que se le pasan a Gemini para nombrar
+TITULARES_POR_GRUPO = 4          # Titulares de muestra por grupo en el prompt de nombres
+
+# Versión de los prompts: cambiarla invalida las respuestas cacheadas
+VERSION_PROMPT_AGRUPACION = "agrupacion-v2"
+VERSION_PROMPT_FUSION = "fusion-v1"
+VERSION_PROMPT_NOMBRES = "nombres-v1"
+VERSION_PROMPT_TEMA = "tema-v1"
+
 
 def obtener_api_key() -> str:
     """
@@ -71,6 +91,9 @@ def cargar_noticias_del_dia() -> Dict:
     Intenta cargar noticias con contenido completo desde data/.
     Si no existe, usa las del frontend/ (sin contenido completo).
     
+    Los textos completos no vienen en el JSON: quedan en el almacén comprimido
+    y se leen después, solo para las noticias que se usan (ver almacen_contenido).
+    
     Returns:
         Diccionario con los datos del JSON
     """
@@ -94,134 +117,30 @@ def cargar_noticias_del_dia() -> Dict:
     return data
 
 
-def inicializar_historico() -> Dict:
-    """
-    Crea estructura vacía de histórico.
-    
-    Returns:
-        Diccionario vacío de histórico
-    """
-    return {
-        'temas': {},
-        'ultima_actualizacion': datetime.now().isoformat(),
-        'total_temas_activos': 0,
-        'total_temas_inactivos': 0,
-        'total_temas_historicos': 0
-    }
-
-
-def cargar_historico() -> Dict:
-    """
-    Carga el archivo histórico de temas.
-    Si no existe, retorna estructura vacía.
-    
-    Returns:
-        Diccionario con histórico de temas
-    """
-    archivo_historico = TEMAS_DIR / "historico_temas.json"
-    
-    if not archivo_historico.exists():
-        logging.info("📂 No existe histórico previo, creando nuevo")
-        return inicializar_historico()
-    
-    try:
-        with open(archivo_historico, "r", encoding="utf-8") as f:
-            historico = json.load(f)
-        logging.info(f"✓ Histórico cargado: {len(historico.get('temas', {}))} temas registrados")
-        return historico
-    except Exception as e:
-        logging.error(f"Error al cargar histórico: {str(e)}")
-        return inicializar_historico()
-
-
-def guardar_historico(historico: Dict):
-    """
-    Guarda el histórico actualizado en data/temas/ y frontend/data/.
-    
-    Args:
-        historico: Diccionario completo del histórico
-    """
-    # Actualizar timestamp
-    historico['ultima_actualizacion'] = datetime.now().isoformat()
-    
-    # Recalcular contadores
-    temas_activos = sum(1 for t in historico['temas'].values() if t.get('estado') == 'activo')
-    temas_inactivos = sum(1 for t in historico['temas'].values() if t.get('estado') == 'inactivo')
-    
-    historico['total_temas_activos'] = temas_activos
-    historico['total_temas_inactivos'] = temas_inactivos
-    historico['total_temas_historicos'] = len(historico['temas'])
-    
-    # Guardar en data/temas/
-    TEMAS_DIR.mkdir(parents=True, exist_ok=True)
-    archivo_historico = TEMAS_DIR / "historico_temas.json"
-    
-    with open(archivo_historico, "w", encoding="utf-8") as f:
-        json.dump(historico, f, ensure_ascii=False, indent=2)
-    
-    logging.info(f"✓ Histórico guardado: {archivo_historico.name}")
-    
-    # NOTA: NO se copia a frontend/data/ porque el frontend no lo usa
-    # El histórico solo se mantiene en data/temas/ para tracking interno
-
-
-def calcular_similitud_simple(texto1: str, texto2: str) -> float:
-    """
-    Calcula similitud básica entre dos textos (0.0 a 1.0).
-    Usa comparación de palabras en común (Jaccard similarity).
-    
-    Args:
-        texto1: Primer texto normalizado
-        texto2: Segundo texto normalizado
-        
-    Returns:
-        Valor de 0.0 (nada similar) a 1.0 (idéntico)
-    """
-    palabras1 = set(texto1.split())
-    palabras2 = set(texto2.split())
-    
-    if not palabras1 or not palabras2:
-        return 0.0
-    
-    comunes = palabras1.intersection(palabras2)
-    union = palabras1.union(palabras2)
-    
-    return len(comunes) / len(union) if union else 0.0
-
-
-def encontrar_tema_existente(nombre_tema: str, nombre_normalizado: str, historico: Dict, umbral: float = 0.75) -> str:
+def encontrar_tema_existente(nombre_tema: str, nombre_normalizado: str, conn_historico, umbral: float = 0.75) -> str:
     """
     Busca si el tema ya existe en el histórico.
     
     Args:
         nombre_tema: Nombre original del tema
         nombre_normalizado: Nombre normalizado del tema
-        historico: Diccionario con histórico de temas
+        conn_historico: Conexión al histórico de temas (ver historico_temas_db)
         umbral: Umbral de similitud para match (default 0.75 = 75%)
         
     Returns:
         tema_id si existe, None si es nuevo
     """
-    for tema_id, datos in historico.get('temas', {}).items():
-        # 1. Match exacto por nombre normalizado
-        if datos.get('tema_normalizado') == nombre_normalizado:
-            logging.info(f"  🔗 Match exacto: '{nombre_tema}' = '{datos['tema']}'")
-            return tema_id
-        
-        # 2. Match por alias
-        if nombre_normalizado in datos.get('alias', []):
-            logging.info(f"  🔗 Match por alias: '{nombre_tema}' = '{datos['tema']}'")
-            return tema_id
-        
-        # 3. Match por similitud (palabras en común)
-        similitud = calcular_similitud_simple(nombre_normalizado, datos.get('tema_normalizado', ''))
-        if similitud >= umbral:
-            logging.info(f"  🔗 Match por similitud ({int(similitud*100)}%): '{nombre_tema}' ≈ '{datos['tema']}'")
-            return tema_id
-    
-    # No se encontró match
-    logging.info(f"  ⭐ Tema NUEVO: '{nombre_tema}'")
-    return None
+    encontrado = historico_temas_db.buscar_tema(conn_historico, nombre_normalizado, umbral)
+    if not encontrado:
+        logging.info(f"  ⭐ Tema NUEVO: '{nombre_tema}'")
+        return None
+    
+    tema_id, tema_existente, tipo, similitud = encontrado
+    if tipo == "similitud":
+        logging.info(f"  🔗 Match por similitud ({int(similitud*100)}%): '{nombre_tema}' ≈ '{tema_existente}'")
+    else:
+        logging.info(f"  🔗 Match {tipo}: '{nombre_tema}' = '{tema_existente}'")
+    return tema_id
 
 
 def seleccionar_noticias_para_analisis(noticias: List[Dict], max_noticias: int = MAX_NOTICIAS_ANALIZAR) -> List[Dict]:
@@ -258,115 +177,6 @@ def seleccionar_noticias_para_analisis(noticias: List[Dict], max_noticias: int =
     return noticias_ordenadas[:max_noticias]
 
 
-def calcular_tendencia(apariciones: List[Dict]) -> str:
-    """
-    Calcula la tendencia del tema basándose en las últimas apariciones.
-    
-    Args:
-        apariciones: Lista de apariciones del tema
-        
-    Returns:
-        "nuevo", "creciente", "estable", "decreciente"
-    """
-    if len(apariciones) < 2:
-        return "nuevo"
-    
-    # Comparar últimas dos apariciones
-    ultimas_dos = apariciones[-2:]
-    cantidad_anterior = ultimas_dos[0].get('cantidad_noticias', 0)
-    cantidad_actual = ultimas_dos[1].get('cantidad_noticias', 0)
-    
-    diff = cantidad_actual - cantidad_anterior
-    
-    if diff > 0:
-        return "creciente"
-    elif diff < 0:
-        return "decreciente"
-    else:
-        return "estable"
-
-
-def calcular_metricas(apariciones: List[Dict]) -> Dict:
-    """
-    Calcula métricas estadísticas del tema.
-    
-    Args:
-        apariciones: Lista de apariciones del tema
-        
-    Returns:
-        Diccionario con métricas
-    """
-    if not apariciones:
-        return {
-            'pico_noticias': 0,
-            'minimo_noticias': 0,
-            'promedio_noticias_dia': 0.0,
-            'fuentes_unicas': []
-        }
-    
-    cantidades = [a.get('cantidad_noticias', 0) for a in apariciones]
-    todas_fuentes = set()
-    for a in apariciones:
-        todas_fuentes.update(a.get('fuentes', []))
-    
-    return {
-        'pico_noticias': max(cantidades) if cantidades else 0,
-        'minimo_noticias': min(cantidades) if cantidades else 0,
-        'promedio_noticias_dia': round(sum(cantidades) / len(cantidades), 1) if cantidades else 0.0,
-        'fuentes_unicas': sorted(list(todas_fuentes))
-    }
-
-
-def actualizar_estado_temas(historico: Dict, fecha_actual: str):
-    """
-    Actualiza el estado de todos los temas en el histórico.
-    Marca como inactivos los que no aparecieron en los últimos 3 días.
-    
-    Args:
-        historico: Diccionario del histórico
-        fecha_actual: Fecha de hoy en formato YYYY-MM-DD
-    """
-    from datetime import datetime, timedelta
-    
-    fecha_hoy = datetime.strptime(fecha_actual, "%Y-%m-%d")
-    
-    for tema_id, datos in historico.get('temas', {}).items():
-        fecha_ultima = datos.get('fecha_ultima_aparicion', fecha_actual)
-        fecha_ultima_dt = datetime.strptime(fecha_ultima, "%Y-%m-%d")
-        
-        dias_sin_aparecer = (fecha_hoy - fecha_ultima_dt).days
-        
-        # Marcar como inactivo si no apareció por 3+ días
-        if dias_sin_aparecer >= 3 and datos.get('estado') == 'activo':
-            datos['estado'] = 'inactivo'
-            datos['dias_inactivo'] = dias_sin_aparecer
-            logging.info(f"  ⏸️  Tema inactivo: '{datos['tema']}' ({dias_sin_aparecer} días sin aparecer)")
-        
-        # Si reaparece después de estar inactivo, reactivar
-        elif dias_sin_aparecer == 0 and datos.get('estado') == 'inactivo':
-            datos['estado'] = 'reactivado'
-            datos['dias_inactivo'] = 0
-            logging.info(f"  ▶️  Tema reactivado: '{datos['tema']}'")
-
-
-def limpiar_apariciones_antiguas(historico: Dict, max_dias: int = 30):
-    """
-    Limita el histórico a los últimos X días para cada tema.
-    
-    Args:
-        historico: Diccionario del histórico
-        max_dias: Máximo de días a mantener
-    """
-    for tema_id, datos in historico.get('temas', {}).items():
-        apariciones = datos.get('apariciones', [])
-        
-        if len(apariciones) > max_dias:
-            # Mantener solo las últimas max_dias apariciones
-            antes = len(apariciones)
-            datos['apariciones'] = apariciones[-max_dias:]
-            logging.info(f"  🗑️  Limpiadas apariciones antiguas de '{datos['tema']}': {antes} → {len(datos['apariciones'])}")
-
-
 def limpiar_html(texto: str) -> str:
     """Limpia HTML del texto."""
     if not texto:
@@ -376,25 +186,24 @@ def limpiar_html(texto: str) -> str:
     return texto.strip()
 
 
-def crear_prompt_agrupacion(noticias: List[Dict]) -> str:
+def crear_prompt_agrupacion(entradas: List[Dict], max_temas: int = MAX_TEMAS_DETECTAR) -> str:
     """
     Crea el prompt para que Gemini agrupe las noticias por tema.
     
     Args:
-        noticias: Lista de noticias a agrupar
+        entradas: Noticias compactadas (ver compactar_prompt.compactar_noticias)
+        max_temas: Máximo de temas a pedir
         
     Returns:
         Prompt completo
     """
-    # Construir lista de titulares numerados
+    # Construir lista de titulares numerados (una línea por nota, con todos sus medios)
     lista_titulares = ""
-    for idx, noticia in enumerate(noticias, 1):
-        titulo = noticia.get('titulo', 'Sin título')
-        fuente = noticia.get('fuente', '')
-        categoria = noticia.get('categoria_url', '')
-        lista_titulares += f"{idx}. {titulo} [{fuente} - {categoria}]\n"
+    for idx, entrada in enumerate(entradas, 1):
+        fuentes = ", ".join(entrada['fuentes'])
+        lista_titulares += f"{idx}. {entrada['titulo']} [{fuentes} - {entrada['categoria']}]\n"
     
-    prompt = f"""Analizá los siguientes {len(noticias)} titulares de noticias argentinas y agrupalos por tema ESPECÍFICO.
+    prompt = f"""Analizá los siguientes {len(entradas)} titulares de noticias argentinas y agrupalos por tema ESPECÍFICO.
 
 TITULARES:
 {lista_titulares}
@@ -413,9 +222,9 @@ CRITERIOS DE AGRUPACIÓN:
    ✗ "Economía argentina"
    ✗ "Política nacional"
    ✗ "Noticias internacionales"
-5. Cada grupo debe tener al menos 2 titulares relacionados DE DIFERENTES FUENTES
+5. Cada grupo debe tener al menos 2 titulares relacionados DE DIFERENTES FUENTES (un titular con varias fuentes entre corchetes ya es la misma noticia publicada por varios medios)
 6. Un titular puede pertenecer solo a UN tema
-7. Máximo {MAX_TEMAS_DETECTAR} temas
+7. Máximo {max_temas} temas
 8. Si un titular no encaja claramente en ningún grupo, no lo fuerces
 9. Nombres de 3-8 palabras
 10. Priorizá temas con mayor cobertura (más fuentes = más relevante)
@@ -587,75 +396,61 @@ Resumen actualizado:"""
     return prompt
 
 
-def llamar_gemini_con_retry(client, model: str, prompt: str, max_intentos: int = 3) -> str:
+def parsear_json_respuesta(texto_respuesta: str) -> Dict:
     """
-    Llama a Gemini con reintentos automáticos si el servicio está sobrecargado.
+    Extrae y parsea el JSON de una respuesta de Gemini (con o sin bloque ```json).
     
-    Args:
-        client: Cliente de Gemini
-        model: Nombre del modelo
-        prompt: Prompt a enviar
-        max_intentos: Número máximo de intentos
-        
-    Returns:
-        Texto de la respuesta
+    Raises:
+        json.JSONDecodeError: Si la respuesta no contiene JSON válido
     """
-    
-    for intento in range(max_intentos):
-        try:
-            response = client.models.generate_content(
-                model=model,
-                contents=[prompt]
-            )
-            return getattr(response, "text", "") or ""
-            
-        except Exception as e:
-            error_msg = str(e)
-            
-            # Si es error 503 (sobrecarga) o 429 (rate limit), reintentar
-            if "503" in error_msg or "429" in error_msg or "UNAVAILABLE" in error_msg or "RESOURCE_EXHAUSTED" in error_msg:
-                if intento < max_intentos - 1:
-                    espera = (intento + 1) * 5  # 5, 10, 15 segundos (más tiempo para rate limit)
-                    logging.warning(f"Servicio sobrecargado. Reintentando en {espera}s... (intento {intento + 1}/{max_intentos})")
-                    time.sleep(espera)
-                    continue
-                else:
-                    logging.error(f"Servicio sobrecargado después de {max_intentos} intentos")
-                    raise
-            else:
-                # Otro tipo de error, no reintentar
-                raise
-    
-    raise Exception("No se pudo completar la solicitud después de múltiples intentos")
+    if "```json" in texto_respuesta:
+        texto_respuesta = texto_respuesta.split("```json")[1].split("```")[0]
+    elif "```" in texto_respuesta:
+        texto_respuesta = texto_respuesta.split("```")[1].split("```")[0]
+    return json.loads(texto_respuesta.strip())
 
 
-def agrupar_con_gemini(noticias: List[Dict], api_key: str) -> Dict:
+def agrupar_con_gemini(noticias: List[Dict], planificador: planificador_gemini.PlanificadorGemini,
+                       conn_cache=None, estadisticas_cache: Dict = None) -> Dict:
     """
     Llama a Gemini para agrupar noticias por tema.
     
     Args:
         noticias: Lista de noticias
-        api_key: API key de Gemini
+        planificador: Planificador compartido (cliente, cuotas y reintentos)
+        conn_cache: Conexión a la caché de respuestas (opcional)
+        estadisticas_cache: Contadores de la caché (requerido si se pasa conn_cache)
         
     Returns:
         Diccionario con temas y sus índices
     """
-    prompt = crear_prompt_agrupacion(noticias)
+    # Las notas repetidas entre medios van una sola vez; el modelo responde con índices de entradas
+    entradas = compactar_prompt.compactar_noticias(noticias, max_tokens_resumen=0, etiqueta="agrupación")
+    prompt = crear_prompt_agrupacion(entradas)
+    texto_respuesta = None
+    
+    clave = None
+    if conn_cache is not None:
+        clave = cache_llm.calcular_clave(
+            planificador.modelo, VERSION_PROMPT_AGRUPACION, cache_llm.ids_noticias(noticias), extra="agrupacion"
+        )
+        texto_respuesta = cache_llm.consultar(conn_cache, clave, estadisticas_cache)
+        if texto_respuesta:
+            logging.info("💾 Agrupación tomada de la caché (mismas noticias que la corrida anterior)")
+            clave = None  # Ya está guardada
     
     try:
-        client = genai.Client(api_key=api_key)
+        if not texto_respuesta:
+            # La agrupación bloquea al resto del script: va primero en la cola
+            texto_respuesta = planificador.generar(prompt, prioridad=planificador_gemini.PRIORIDAD_ALTA)
+        resultado = parsear_json_respuesta(texto_respuesta)
         
-        # Usar gemini-2.5-flash
-        texto_respuesta = llamar_gemini_con_retry(client, "gemini-2.5-flash", prompt)
+        # Traducir índices de entradas compactadas a índices de noticias_seleccionadas
+        for tema in resultado.get("temas", []):
+            tema['indices_titulares'] = compactar_prompt.expandir_indices(tema.get('indices_titulares', []), entradas)
         
-        # Limpiar la respuesta para extraer solo el JSON
-        if "```json" in texto_respuesta:
-            texto_respuesta = texto_respuesta.split("```json")[1].split("```")[0]
-        elif "```" in texto_respuesta:
-            texto_respuesta = texto_respuesta.split("```")[1].split("```")[0]
-        
-        # Parsear JSON
-        resultado = json.loads(texto_respuesta.strip())
+        if clave:
+            cache_llm.guardar(conn_cache, clave, planificador.modelo, VERSION_PROMPT_AGRUPACION, prompt, texto_respuesta)
         return resultado
         
     except json.JSONDecodeError as e:
@@ -667,34 +462,336 @@ def agrupar_con_gemini(noticias: List[Dict], api_key: str) -> Dict:
         raise
 
 
-def generar_resumen_tema(tema: str, noticias_relacionadas: List[Dict], api_key: str, resumen_anterior: str = None) -> str:
+def dividir_en_bloques(entradas: List[Dict], max_por_bloque: int = TITULARES_POR_BLOQUE) -> List[List[Dict]]:
+    """
+    Divide las entradas compactadas en bloques de tamaño parejo (sin un último bloque
+    diminuto). Se ordenan por categoría para que las notas de un mismo asunto tiendan
+    a caer en el mismo bloque.
+    """
+    if not entradas:
+        return []
+    ordenadas = sorted(entradas, key=lambda e: e['categoria'])
+    cantidad_bloques = -(-len(ordenadas) // max_por_bloque)
+    tamano = -(-len(ordenadas) // cantidad_bloques)
+    return [ordenadas[i:i + tamano] for i in range(0, len(ordenadas), tamano)]
+
+
+def crear_prompt_fusion(temas_bloques: List[Dict], noticias: List[Dict]) -> str:
+    """
+    Crea el prompt del paso de fusión: unificar los temas detectados en cada bloque.
+    
+    Args:
+        temas_bloques: Temas de los bloques ({'tema', 'indices_titulares'} con índices de noticias)
+        noticias: Noticias seleccionadas (para mostrar cobertura y un titular de ejemplo)
+        
+    Returns:
+        Prompt completo
+    """
+    lista_temas = ""
+    for idx, tema in enumerate(temas_bloques, 1):
+        relacionadas = [noticias[i - 1] for i in tema['indices_titulares']]
+        fuentes = {n.get('fuente', '') for n in relacionadas if n.get('fuente')}
+        ejemplo = compactar_prompt.limpiar_texto(relacionadas[0].get('titulo', '')) if relacionadas else ""
+        lista_temas += f"{idx}. {tema['tema']} [{len(relacionadas)} notas, {len(fuentes)} fuentes] Ej.: {ejemplo}\n"
+    
+    prompt = f"""Los siguientes {len(temas_bloques)} temas se detectaron por separado en distintos bloques de las noticias argentinas del día. Unificá los que se refieren al MISMO evento o situación concreta y elegí los más relevantes.
+
+TEMAS DETECTADOS:
+{lista_temas}
+CRITERIOS:
+1. Fusioná solo temas que hablan del mismo evento, conflicto o situación PARTICULAR (no por área general)
+2. Un tema puede aparecer en un solo grupo
+3. Conservá nombres ESPECÍFICOS Y CONCRETOS de 3-8 palabras (podés reformular el nombre del grupo)
+4. Máximo {MAX_TEMAS_DETECTAR} temas, priorizando los de mayor cobertura (más notas y más fuentes)
+5. Los temas que no estén entre los más relevantes se omiten
+
+FORMATO DE RESPUESTA (JSON únicamente, sin texto adicional):
+{{
+  "temas": [
+    {{
+      "tema": "Nombre específico del tema o evento",
+      "indices_temas": [1, 4]
+    }}
+  ]
+}}
+
+Respondé SOLO con el JSON:"""
+    
+    return prompt
+
+
+def unir_indices(grupos: List[List[int]], noticias: List[Dict]) -> List[int]:
+    """
+    Une los índices de noticias de varios temas sin repetir, con tope MAX_NOTICIAS_POR_TEMA.
+    Si hay que recortar, se toma primero una noticia por fuente para conservar la diversidad.
+    """
+    indices = []
+    for grupo in grupos:
+        for indice in grupo:
+            if indice not in indices:
+                indices.append(indice)
+    if len(indices) <= MAX_NOTICIAS_POR_TEMA:
+        return indices
+    
+    primeras, resto, fuentes_vistas = [], [], set()
+    for indice in indices:
+        fuente = noticias[indice - 1].get('fuente', '')
+        (resto if fuente in fuentes_vistas else primeras).append(indice)
+        fuentes_vistas.add(fuente)
+    return (primeras + resto)[:MAX_NOTICIAS_POR_TEMA]
+
+
+def cobertura_tema(tema: Dict, noticias: List[Dict]) -> tuple:
+    """Clave de orden por cobertura: (fuentes distintas, cantidad de notas)."""
+    fuentes = {noticias[i - 1].get('fuente', '') for i in tema['indices_titulares']}
+    return (len(fuentes), len(tema['indices_titulares']))
+
+
+def agrupar_jerarquico(noticias: List[Dict], planificador: planificador_gemini.PlanificadorGemini,
+                       conn_cache=None, estadisticas_cache: Dict = None) -> Dict:
+    """
+    Agrupación map-reduce: agrupa cada bloque de titulares en paralelo y después
+    fusiona los temas de los bloques en un único paso.
+    
+    Args:
+        noticias: Lista de noticias (todas las del día, sin tope de 150)
+        planificador: Planificador compartido (cliente, cuotas y reintentos)
+        conn_cache: Conexión a la caché de respuestas (opcional)
+        estadisticas_cache: Contadores de la caché (requerido si se pasa conn_cache)
+        
+    Returns:
+        Diccionario con temas y sus índices (mismo formato que agrupar_con_gemini)
+    """
+    entradas = compactar_prompt.compactar_noticias(noticias, max_tokens_resumen=0, etiqueta="agrupación jerárquica")
+    bloques = dividir_en_bloques(entradas)
+    logging.info(f"Modo jerárquico: {len(entradas)} entradas en {len(bloques)} bloque(s) de hasta {TITULARES_POR_BLOQUE}")
+    
+    # Map: encolar todos los bloques (la agrupación bloquea al resto del script: prioridad alta)
+    encolados = []
+    for bloque in bloques:
+        noticias_bloque = [noticias[i - 1] for entrada in bloque for i in entrada['indices']]
+        prompt = crear_prompt_agrupacion(bloque, max_temas=MAX_TEMAS_POR_BLOQUE)
+        clave = None
+        futuro = None
+        if conn_cache is not None:
+            clave = cache_llm.calcular_clave(
+                planificador.modelo, VERSION_PROMPT_AGRUPACION, cache_llm.ids_noticias(noticias_bloque), extra="agrupacion-bloque"
+            )
+            cacheada = cache_llm.consultar(conn_cache, clave, estadisticas_cache)
+            if cacheada:
+                futuro = Future()
+                futuro.set_result(cacheada)
+                clave = None  # Ya está guardada
+        if futuro is None:
+            futuro = planificador.enviar(prompt, prioridad=planificador_gemini.PRIORIDAD_ALTA)
+        encolados.append({'bloque': bloque, 'prompt': prompt, 'clave': clave, 'futuro': futuro})
+    
+    temas_bloques = []
+    bloques_fallidos = 0
+    for numero, encolado in enumerate(encolados, 1):
+        try:
+            texto_respuesta = encolado['futuro'].result()
+            resultado = parsear_json_respuesta(texto_respuesta)
+        except Exception as e:
+            logging.error(f"  ✗ Bloque {numero}/{len(encolados)}: {str(e)}")
+            bloques_fallidos += 1
+            continue
+        
+        if encolado['clave']:
+            cache_llm.guardar(conn_cache, encolado['clave'], planificador.modelo, VERSION_PROMPT_AGRUPACION,
+                              encolado['prompt'], texto_respuesta)
+        
+        temas = resultado.get("temas", [])
+        for tema in temas:
+            indices = compactar_prompt.expandir_indices(tema.get('indices_titulares', []), encolado['bloque'])
+            if indices and tema.get('tema'):
+                temas_bloques.append({'tema': tema['tema'], 'indices_titulares': indices})
+        logging.info(f"  ✓ Bloque {numero}/{len(encolados)}: {len(temas)} temas")
+    
+    if bloques_fallidos == len(encolados):
+        raise Exception("Fallaron todos los bloques de la agrupación")
+    
+    if len(encolados) == 1:
+        return {'temas': temas_bloques}
+    
+    # Reduce: fusionar los temas de todos los bloques
+    temas_bloques.sort(key=lambda tema: cobertura_tema(tema, noticias), reverse=True)
+    prompt = crear_prompt_fusion(temas_bloques, noticias)
+    clave = None
+    texto_respuesta = None
+    if conn_cache is not None and not bloques_fallidos:
+        clave = cache_llm.calcular_clave(
+            planificador.modelo, VERSION_PROMPT_FUSION, cache_llm.ids_noticias(noticias),
+            extra=json.dumps([tema['tema'] for tema in temas_bloques], ensure_ascii=False)
+        )
+        texto_respuesta = cache_llm.consultar(conn_cache, clave, estadisticas_cache)
+        if texto_respuesta:
+            clave = None
+    
+    try:
+        if not texto_respuesta:
+            texto_respuesta = planificador.generar(prompt, prioridad=planificador_gemini.PRIORIDAD_ALTA)
+        fusion = parsear_json_respuesta(texto_respuesta)
+        
+        temas = []
+        for grupo in fusion.get("temas", [])[:MAX_TEMAS_DETECTAR]:
+            originales = [
+                temas_bloques[i - 1]['indices_titulares'] for i in grupo.get('indices_temas', [])
+                if isinstance(i, int) and 1 <= i <= len(temas_bloques)
+            ]
+            if originales and grupo.get('tema'):
+                temas.append({'tema': grupo['tema'], 'indices_titulares': unir_indices(originales, noticias)})
+        
+        if clave:
+            cache_llm.guardar(conn_cache, clave, planificador.modelo, VERSION_PROMPT_FUSION, prompt, texto_respuesta)
+        logging.info(f"  ✓ Fusión: {len(temas_bloques)} temas de bloques → {len(temas)} temas")
+        return {'temas': temas}
+    
+    except Exception as e:
+        # Sin fusión se usan los temas de los bloques con mayor cobertura, tal como vinieron
+        logging.warning(f"⚠️  Falló la fusión de temas ({str(e)}): se usan los temas de los bloques")
+        return {'temas': [
+            {'tema': tema['tema'], 'indices_titulares': unir_indices([tema['indices_titulares']], noticias)}
+            for tema in temas_bloques[:MAX_TEMAS_DETECTAR]
+        ]}
+
+
+def crear_prompt_nombres(grupos: List[List[int]], noticias: List[Dict]) -> str:
+    """
+    Crea el prompt para nombrar los grupos armados localmente (sin pedir agrupación).
+    
+    Args:
+        grupos: Grupos de índices 0-based (la primera noticia es la más representativa)
+        noticias: Noticias seleccionadas
+        
+    Returns:
+        Prompt completo
+    """
+    lista_grupos = ""
+    for idx, grupo in enumerate(grupos, 1):
+        fuentes = agrupacion_local.fuentes_grupo(grupo, noticias)
+        lista_grupos += f"Grupo {idx} ({len(grupo)} notas, {len(fuentes)} fuentes):\n"
+        for i in grupo[:TITULARES_POR_GRUPO]:
+            titulo = compactar_prompt.limpiar_texto(noticias[i].get('titulo', ''))
+            lista_grupos += f"  - {titulo} [{noticias[i].get('fuente', '')}]\n"
+    
+    prompt = f"""Estos {len(grupos)} grupos de noticias argentinas ya están agrupados por similitud. Poné un nombre a cada grupo que trate sobre un evento o situación concreta.
+
+GRUPOS:
+{lista_grupos}
+CRITERIOS:
+1. Nombres ESPECÍFICOS Y CONCRETOS de 3-8 palabras (ej.: "Negociación salarial docente 2025", "Causa Cuadernos: nuevos testimonios")
+2. Nada de nombres genéricos como "Economía argentina" o "Política nacional"
+3. Omití los grupos que mezclan asuntos distintos o no tienen un eje concreto
+4. Máximo {MAX_TEMAS_DETECTAR} temas, priorizando los de mayor cobertura (más fuentes)
+
+FORMATO DE RESPUESTA (JSON únicamente, sin texto adicional):
+{{
+  "temas": [
+    {{
+      "grupo": 1,
+      "tema": "Nombre específico del tema o evento"
+    }}
+  ]
+}}
+
+Respondé SOLO con el JSON:"""
+    
+    return prompt
+
+
+def agrupar_con_grupos_locales(noticias: List[Dict], planificador: planificador_gemini.PlanificadorGemini,
+                               conn_cache=None, estadisticas_cache: Dict = None) -> Dict:
+    """
+    Agrupa con la pre-agrupación local y usa a Gemini solo para nombrar los grupos.
+    Si Gemini falla, cada grupo toma el nombre de su titular más representativo.
+    
+    Args:
+        noticias: Lista de noticias (todas las del día)
+        planificador: Planificador compartido (cliente, cuotas y reintentos)
+        conn_cache: Conexión a la caché de respuestas (opcional)
+        estadisticas_cache: Contadores de la caché (requerido si se pasa conn_cache)
+        
+    Returns:
+        Diccionario con temas y sus índices (mismo formato que agrupar_con_gemini)
+    """
+    grupos = agrupacion_local.agrupar_noticias(noticias, min_fuentes=MIN_FUENTES_POR_TEMA)[:MAX_GRUPOS_CANDIDATOS]
+    if not grupos:
+        return {'temas': []}
+    
+    def indices_tema(grupo: List[int]) -> List[int]:
+        return unir_indices([[i + 1 for i in grupo]], noticias)
+    
+    prompt = crear_prompt_nombres(grupos, noticias)
+    logging.info(f"Nombrando {len(grupos)} grupos locales (~{planificador_gemini.estimar_tokens(prompt)} tokens)")
+    texto_respuesta = None
+    clave = None
+    if conn_cache is not None:
+        ids = [cache_llm.ids_noticias([noticias[i] for i in grupo]) for grupo in grupos]
+        clave = cache_llm.calcular_clave(
+            planificador.modelo, VERSION_PROMPT_NOMBRES, [id_noticia for grupo in ids for id_noticia in grupo],
+            extra=json.dumps([len(grupo) for grupo in grupos])
+        )
+        texto_respuesta = cache_llm.consultar(conn_cache, clave, estadisticas_cache)
+        if texto_respuesta:
+            logging.info("💾 Nombres de temas tomados de la caché (mismos grupos que la corrida anterior)")
+            clave = None
+    
+    try:
+        if not texto_respuesta:
+            texto_respuesta = planificador.generar(prompt, prioridad=planificador_gemini.PRIORIDAD_ALTA)
+        nombres = parsear_json_respuesta(texto_respuesta)
+        
+        temas = []
+        for tema in nombres.get("temas", [])[:MAX_TEMAS_DETECTAR]:
+            numero = tema.get('grupo')
+            if isinstance(numero, int) and 1 <= numero <= len(grupos) and tema.get('tema'):
+                temas.append({'tema': tema['tema'], 'indices_titulares': indices_tema(grupos[numero - 1])})
+        
+        if clave:
+            cache_llm.guardar(conn_cache, clave, planificador.modelo, VERSION_PROMPT_NOMBRES, prompt, texto_respuesta)
+        return {'temas': temas}
+    
+    except Exception as e:
+        logging.warning(f"⚠️  No se pudieron nombrar los grupos con Gemini ({str(e)}): se usan sus titulares")
+        return {'temas': [
+            {
+                'tema': " ".join(compactar_prompt.limpiar_texto(noticias[grupo[0]].get('titulo', '')).split()[:8]),
+                'indices_titulares': indices_tema(grupo),
+            }
+            for grupo in grupos[:MAX_TEMAS_DETECTAR]
+        ]}
+
+
+def crear_prompt_tema(tema: str, noticias_relacionadas: List[Dict], resumen_anterior: str = None) -> str:
     """
-    Genera o actualiza el resumen de un tema usando Gemini.
+    Elige el prompt según si el tema es nuevo o recurrente.
     
     Args:
         tema: Nombre del tema
         noticias_relacionadas: Lista de noticias completas relacionadas al tema
-        api_key: API key de Gemini
         resumen_anterior: Si existe, integra las novedades. Si es None, genera desde cero
         
     Returns:
-        Resumen generado o actualizado
+        Prompt completo
     """
-    # Decidir qué prompt usar según si es tema nuevo o recurrente
     if resumen_anterior:
         logging.info(f"  🔄 Integrando resumen recurrente...")
-        prompt = crear_prompt_resumen_recurrente(tema, resumen_anterior, noticias_relacionadas)
-    else:
-        logging.info(f"  ✨ Generando resumen nuevo...")
-        prompt = crear_prompt_resumen(tema, noticias_relacionadas)
+        return crear_prompt_resumen_recurrente(tema, resumen_anterior, noticias_relacionadas)
     
+    logging.info(f"  ✨ Generando resumen nuevo...")
+    return crear_prompt_resumen(tema, noticias_relacionadas)
+
+
+def obtener_resumen_tema(tema: str, futuro: Future) -> str:
+    """
+    Espera el resumen encolado en el planificador (ver crear_prompt_tema).
+    
+    Returns:
+        Resumen generado, o un mensaje de error si la API no respondió
+    """
     try:
-        client = genai.Client(api_key=api_key)
-        
-        # Usar gemini-2.5-flash con retry
-        texto_respuesta = llamar_gemini_con_retry(client, "gemini-2.5-flash", prompt)
-        
-        return texto_respuesta.strip()
+        return futuro.result().strip()
         
     except Exception as e:
         logging.error(f"Error al generar resumen para '{tema}': {str(e)}")
@@ -749,6 +846,69 @@ def generar_tema_id(nombre_normalizado: str, fecha: str) -> str:
     return f"{base}_{fecha_corta}"
 
 
+def unificar_temas_corrida(temas: List[Dict], noticias: List[Dict], conn_historico, fecha: str) -> List[Dict]:
+    """
+    Resuelve el tema_id de cada tema detectado antes de pedir resúmenes y fusiona los que
+    resultan ser el mismo tema dentro de la corrida (mismo nombre normalizado, nombres
+    similares o el mismo tema del histórico). Sin esto, dos temas casi iguales de la misma
+    corrida se buscaban en el histórico antes de que se guardara ninguno, salían ambos como
+    nuevos y podían compartir tema_id (uno pisaba al otro en el histórico y el JSON del día
+    quedaba con ids repetidos).
+    
+    Args:
+        temas: Temas devueltos por la agrupación ({'tema', 'indices_titulares'})
+        noticias: Noticias seleccionadas (los índices son 1-based)
+        conn_historico: Conexión al histórico de temas
+        fecha: Fecha de la corrida (para los ids nuevos)
+        
+    Returns:
+        Temas sin repetir, cada uno con 'tema_normalizado', 'tema_id' y 'es_recurrente'
+    """
+    unificados = []
+    por_id = {}        # tema_id -> tema de esta corrida
+    normalizados = {}  # nombre_normalizado -> tema_id (mapa de la corrida)
+    
+    for tema in temas:
+        nombre_tema = tema['tema']
+        nombre_normalizado = normalizar_nombre_tema(nombre_tema)
+        
+        # 1. ¿Ya apareció en esta corrida? (nombre exacto o similar)
+        tema_id = normalizados.get(nombre_normalizado)
+        if tema_id is None:
+            for otro_normalizado, otro_id in normalizados.items():
+                if historico_temas_db.calcular_similitud_simple(nombre_normalizado, otro_normalizado) >= historico_temas_db.UMBRAL_SIMILITUD:
+                    tema_id = otro_id
+                    break
+        
+        # 2. Si no, buscarlo en el histórico o generarle un id nuevo
+        es_recurrente = False
+        if tema_id is None:
+            tema_id = encontrar_tema_existente(nombre_tema, nombre_normalizado, conn_historico)
+            es_recurrente = tema_id is not None
+            if not es_recurrente:
+                # Nombres distintos pueden compartir las primeras palabras: el id no debe pisar otro tema
+                base_id = tema_id = generar_tema_id(nombre_normalizado, fecha)
+                sufijo = 2
+                while tema_id in por_id or historico_temas_db.obtener_tema(conn_historico, tema_id):
+                    tema_id = f"{base_id}_{sufijo}"
+                    sufijo += 1
+        normalizados.setdefault(nombre_normalizado, tema_id)
+        
+        existente = por_id.get(tema_id)
+        if existente:
+            logging.info(f"  🔗 Tema repetido en la corrida: '{nombre_tema}' se fusiona con '{existente['tema']}'")
+            existente['indices_titulares'] = unir_indices(
+                [existente['indices_titulares'], tema['indices_titulares']], noticias
+            )
+            continue
+        
+        unificado = dict(tema, tema_normalizado=nombre_normalizado, tema_id=tema_id, es_recurrente=es_recurrente)
+        por_id[tema_id] = unificado
+        unificados.append(unificado)
+    
+    return unificados
+
+
 def main():
     """
     Función principal que detecta y agrupa temas.
@@ -760,8 +920,9 @@ def main():
     # 1. Obtener API key
     try:
         api_key = obtener_api_key()
+        planificador_gemini.verificar_sdk()
         logging.info("✓ API key de Gemini configurada")
-    except ValueError as e:
+    except (ValueError, ImportError) as e:
         logging.error(str(e))
         return
     
@@ -775,17 +936,24 @@ def main():
         logging.error(f"Error al cargar noticias: {str(e)}")
         return
     
+    # Almacén de textos completos (se lee perezosamente, solo para las noticias de cada tema)
+    almacen = almacen_contenido.abrir_para_dataset(data)
+    
     # 3. Cargar histórico de temas
     logging.info("\n" + "=" * 70)
     logging.info("CARGANDO HISTÓRICO DE TEMAS")
     logging.info("=" * 70)
-    historico = cargar_historico()
+    conn_historico = historico_temas_db.get_connection()
+    totales = historico_temas_db.contar_temas(conn_historico)
+    logging.info(f"✓ Histórico cargado: {totales['total_temas_historicos']} temas registrados")
     
     # 4. Actualizar estados de temas existentes (marcar inactivos)
-    actualizar_estado_temas(historico, fecha_consolidacion)
+    historico_temas_db.actualizar_estados(conn_historico, fecha_consolidacion)
     
     # 5. Seleccionar noticias para análisis
-    noticias_seleccionadas = seleccionar_noticias_para_analisis(noticias)
+    noticias_seleccionadas = seleccionar_noticias_para_analisis(
+        noticias, MAX_NOTICIAS_ANALIZAR if MODO_AGRUPACION == "simple" else MAX_NOTICIAS_JERARQUICO
+    )
     logging.info(f"Seleccionadas {len(noticias_seleccionadas)} noticias para análisis de temas")
     
     # 6. Agrupar noticias por tema con Gemini
@@ -793,11 +961,25 @@ def main():
     logging.info("AGRUPACIÓN POR TEMAS (Gemini AI)")
     logging.info("=" * 70)
     
+    planificador = planificador_gemini.PlanificadorGemini(api_key)
+    conn_cache = cache_llm.get_connection()
+    estadisticas_cache = cache_llm.nuevas_estadisticas()
+    
     try:
-        resultado_agrupacion = agrupar_con_gemini(noticias_seleccionadas, api_key)
+        if MODO_AGRUPACION == "local":
+            resultado_agrupacion = agrupar_con_grupos_locales(noticias_seleccionadas, planificador, conn_cache, estadisticas_cache)
+        elif MODO_AGRUPACION == "jerarquico":
+            resultado_agrupacion = agrupar_jerarquico(noticias_seleccionadas, planificador, conn_cache, estadisticas_cache)
+        else:
+            resultado_agrupacion = agrupar_con_gemini(noticias_seleccionadas, planificador, conn_cache, estadisticas_cache)
         temas_detectados = resultado_agrupacion.get("temas", [])
         logging.info(f"✓ Detectados {len(temas_detectados)} temas")
         
+        # Resolver ids contra el histórico y fusionar repetidos antes de pedir resúmenes
+        temas_detectados = unificar_temas_corrida(
+            temas_detectados, noticias_seleccionadas, conn_historico, fecha_consolidacion
+        )
+        
         for tema_data in temas_detectados:
             logging.info(f"  • {tema_data['tema']}: {len(tema_data['indices_titulares'])} noticias")
             
@@ -821,6 +1003,9 @@ def main():
             except Exception as copy_error:
                 logging.error(f"Error al copiar temas: {str(copy_error)}")
         
+        planificador.cerrar()
+        conn_cache.close()
+        conn_historico.close()
         return
     
     # 5. Generar resúmenes por cada tema
@@ -828,10 +1013,6 @@ def main():
     logging.info("GENERACIÓN DE RESÚMENES")
     logging.info("=" * 70)
     
-    # Pequeño delay después de la agrupación para respetar rate limit
-    logging.info("⏳ Esperando 3s antes de comenzar generación de resúmenes...")
-    time.sleep(3)
-    
     temas_completos = []
     temas_pendientes = list(enumerate(temas_detectados, 1))  # (idx, tema_data)
     max_ciclos_reintento = 2
@@ -842,11 +1023,13 @@ def main():
             logging.info("\n" + "=" * 70)
             logging.info(f"REINTENTANDO TEMAS FALLIDOS (Ciclo {ciclo})")
             logging.info("=" * 70)
-            logging.info(f"⏳ Esperando 30s para resetear rate limit...")
-            time.sleep(30)
         
         temas_para_siguiente_ciclo = []
         
+        # a) Preparar cada tema y encolar su resumen (los temas son independientes:
+        #    el planificador los resuelve en paralelo dentro de la cuota)
+        temas_encolados = []
+        
         for idx_tema, tema_data in temas_pendientes:
             nombre_tema = tema_data['tema']
             indices = tema_data['indices_titulares']
@@ -881,42 +1064,79 @@ def main():
                 logging.warning(f"⚠️  Tema '{nombre_tema}' tiene solo {len(fuentes_unicas)} fuente(s). Requiere mínimo {MIN_FUENTES_POR_TEMA}. Saltando...")
                 continue
             
-            # Normalizar nombre del tema
-            nombre_normalizado = normalizar_nombre_tema(nombre_tema)
-            
-            # Buscar si el tema ya existe en el histórico
-            tema_id_existente = encontrar_tema_existente(nombre_tema, nombre_normalizado, historico)
+            # Id resuelto en unificar_temas_corrida (no cambia entre ciclos de reintento)
+            nombre_normalizado = tema_data['tema_normalizado']
+            tema_id = tema_data['tema_id']
             
             # Generar resumen con Gemini (nuevo o integrado según si existe)
-            resumen_exitoso = False
             resumen_anterior = None
             es_tema_nuevo = True
             es_tema_recurrente = False
-            dias_activo = 1
             
-            if tema_id_existente:
+            if tema_data['es_recurrente']:
                 # Tema RECURRENTE: integrar con resumen anterior
-                tema_historico = historico['temas'][tema_id_existente]
+                tema_historico = historico_temas_db.obtener_tema(conn_historico, tema_id)
                 resumen_anterior = tema_historico.get('resumen_actual', '')
                 es_tema_nuevo = False
                 es_tema_recurrente = True
-                tema_id = tema_id_existente
+            
+            # Si el tema tiene exactamente las mismas noticias que en una corrida anterior, reutilizar
+            # el resumen. Ni el resumen anterior ni si el tema es nuevo forman parte de la clave: en una
+            # re-corrida del día el tema ya figura como recurrente y su resumen cubre estas mismas noticias.
+            clave = cache_llm.calcular_clave(
+                planificador.modelo, VERSION_PROMPT_TEMA,
+                cache_llm.ids_noticias(noticias_completas_relacionadas), extra="tema"
+            )
+            resumen_cacheado = cache_llm.consultar(conn_cache, clave, estadisticas_cache)
+            
+            if resumen_cacheado:
+                logging.info(f"  💾 Resumen tomado de la caché (noticias sin cambios)")
+                prompt = None
+                futuro = Future()
+                futuro.set_result(resumen_cacheado)
             else:
-                # Tema NUEVO: generar ID nuevo
-                tema_id = generar_tema_id(nombre_normalizado, fecha_consolidacion)
+                if almacen:
+                    almacen.completar_noticias(noticias_completas_relacionadas)
+                prompt = crear_prompt_tema(nombre_tema, noticias_completas_relacionadas, resumen_anterior)
+                futuro = planificador.enviar(prompt)
+            
+            temas_encolados.append({
+                'idx_tema': idx_tema,
+                'tema_data': tema_data,
+                'nombre_normalizado': nombre_normalizado,
+                'noticias_para_guardar': noticias_para_guardar,
+                'tema_id': tema_id,
+                'es_tema_nuevo': es_tema_nuevo,
+                'es_tema_recurrente': es_tema_recurrente,
+                'clave': clave,
+                'prompt': prompt,
+                'futuro': futuro
+            })
+        
+        # b) Recoger los resúmenes en el orden original y actualizar el histórico
+        for encolado in temas_encolados:
+            idx_tema = encolado['idx_tema']
+            tema_data = encolado['tema_data']
+            nombre_tema = tema_data['tema']
+            indices = tema_data['indices_titulares']
+            nombre_normalizado = encolado['nombre_normalizado']
+            noticias_para_guardar = encolado['noticias_para_guardar']
+            tema_id = encolado['tema_id']
+            es_tema_nuevo = encolado['es_tema_nuevo']
+            es_tema_recurrente = encolado['es_tema_recurrente']
+            dias_activo = 1
             
             try:
-                resumen = generar_resumen_tema(
-                    nombre_tema, 
-                    noticias_completas_relacionadas, 
-                    api_key,
-                    resumen_anterior=resumen_anterior
-                )
+                resumen = obtener_resumen_tema(nombre_tema, encolado['futuro'])
                 
                 # Verificar que el resumen no sea un mensaje de error
                 if not resumen.startswith("No se pudo generar resumen") and not resumen.startswith("Error al generar"):
                     logging.info(f"✓ Resumen generado ({len(resumen)} caracteres)")
                     
+                    if encolado['prompt']:
+                        cache_llm.guardar(conn_cache, encolado['clave'], planificador.modelo,
+                                          VERSION_PROMPT_TEMA, encolado['prompt'], resumen)
+                    
                     # Determinar categoría principal (la más frecuente, usando categoria_url)
                     categorias = []
                     for idx in indices:
@@ -930,61 +1150,13 @@ def main():
                     categoria_principal = max(set(categorias), key=categorias.count) if categorias else 'otros'
                     fuentes_lista = list(set([n['fuente'] for n in noticias_para_guardar if n.get('fuente')]))
                     
-                    # ACTUALIZAR O CREAR ENTRADA EN HISTÓRICO
-                    if es_tema_recurrente:
-                        # Actualizar tema existente en histórico
-                        tema_historico = historico['temas'][tema_id]
-                        tema_historico['fecha_ultima_aparicion'] = fecha_consolidacion
-                        tema_historico['dias_activo'] = tema_historico.get('dias_activo', 0) + 1
-                        tema_historico['resumen_actual'] = resumen
-                        tema_historico['categoria_principal'] = categoria_principal
-                        tema_historico['estado'] = 'activo'
-                        
-                        # Agregar aparición de hoy
-                        tema_historico['apariciones'].append({
-                            'fecha': fecha_consolidacion,
-                            'cantidad_noticias': len(noticias_para_guardar),
-                            'resumen': resumen,
-                            'fuentes': fuentes_lista,
-                            'categoria_principal': categoria_principal
-                        })
-                        
-                        # Calcular tendencia y métricas
-                        tema_historico['tendencia'] = calcular_tendencia(tema_historico['apariciones'])
-                        tema_historico['metricas'] = calcular_metricas(tema_historico['apariciones'])
-                        tema_historico['total_noticias_acumuladas'] = sum(a.get('cantidad_noticias', 0) for a in tema_historico['apariciones'])
-                        
-                        dias_activo = tema_historico['dias_activo']
-                        
-                    else:
-                        # Crear nuevo tema en histórico
-                        historico['temas'][tema_id] = {
-                            'tema_id': tema_id,
-                            'tema': nombre_tema,
-                            'tema_normalizado': nombre_normalizado,
-                            'alias': [],
-                            'fecha_primer_deteccion': fecha_consolidacion,
-                            'fecha_ultima_aparicion': fecha_consolidacion,
-                            'dias_activo': 1,
-                            'dias_consecutivos': 1,
-                            'dias_inactivo': 0,
-                            'apariciones': [{
-                                'fecha': fecha_consolidacion,
-                                'cantidad_noticias': len(noticias_para_guardar),
-                                'resumen': resumen,
-                                'fuentes': fuentes_lista,
-                                'categoria_principal': categoria_principal
-                            }],
-                            'resumen_actual': resumen,
-                            'categoria_principal': categoria_principal,
-                            'total_noticias_acumuladas': len(noticias_para_guardar),
-                            'estado': 'activo',
-                            'tendencia': 'nuevo',
-                            'metricas': calcular_metricas([{
-                                'cantidad_noticias': len(noticias_para_guardar),
-                                'fuentes': fuentes_lista
-                            }])
-                        }
+                    # Registrar la aparición de hoy en el histórico (crea el tema si es nuevo)
+                    tema_historico = historico_temas_db.registrar_aparicion(
+                        conn_historico, tema_id, nombre_tema, nombre_normalizado, fecha_consolidacion,
+                        len(noticias_para_guardar), resumen, fuentes_lista, categoria_principal,
+                        noticias=noticias_para_guardar
+                    )
+                    dias_activo = tema_historico['dias_activo']
                     
                     # Construir objeto de tema para el JSON del día
                     tema_completo = {
@@ -1000,11 +1172,10 @@ def main():
                         'es_tema_nuevo': es_tema_nuevo,
                         'es_tema_recurrente': es_tema_recurrente,
                         'dias_activo': dias_activo,
-                        'tendencia': historico['temas'][tema_id].get('tendencia', 'nuevo')
+                        'tendencia': tema_historico.get('tendencia', 'nuevo')  # Se recalcula al final con metricas_temas
                     }
                     
                     temas_completos.append(tema_completo)
-                    resumen_exitoso = True
                 else:
                     # Resumen falló, agregar a pendientes para reintentar
                     logging.warning(f"⚠️  Resumen falló, se reintentará después")
@@ -1013,18 +1184,17 @@ def main():
             except Exception as e:
                 logging.error(f"✗ Error al generar resumen: {str(e)}")
                 temas_para_siguiente_ciclo.append((idx_tema, tema_data))
-            
-            # Delay entre resúmenes para respetar rate limit de Gemini (15 RPM)
-            # Solo si fue exitoso y no es el último tema de este ciclo
-            if resumen_exitoso and (idx_tema, tema_data) != temas_pendientes[-1]:
-                delay = 5  # 5 segundos entre cada resumen
-                logging.info(f"⏳ Esperando {delay}s antes del siguiente tema (rate limit)...")
-                time.sleep(delay)
         
         # Actualizar pendientes para el próximo ciclo
         temas_pendientes = temas_para_siguiente_ciclo
         ciclo += 1
     
+    planificador.cerrar()
+    logging.info(f"Gemini: {planificador.resumen_estadisticas()}")
+    logging.info(f"Caché LLM: {cache_llm.resumen_estadisticas(estadisticas_cache)}")
+    cache_llm.purgar(conn_cache)
+    conn_cache.close()
+    
     # Resumen de procesamiento
     if temas_pendientes:
         logging.warning("\n" + "=" * 70)
@@ -1035,14 +1205,23 @@ def main():
         logging.warning("Intenta ejecutar el script nuevamente más tarde cuando la API esté menos cargada.")
         logging.warning("=" * 70)
     
-    # NUEVO: Limpiar apariciones antiguas del histórico (mantener últimas 30)
-    limpiar_apariciones_antiguas(historico, max_dias=30)
+    if almacen:
+        almacen.cerrar()
     
-    # NUEVO: Guardar histórico actualizado
+    # Histórico: cada tema ya se guardó al procesarlo; solo queda recortar apariciones antiguas
     logging.info("\n" + "=" * 70)
     logging.info("ACTUALIZANDO HISTÓRICO")
     logging.info("=" * 70)
-    guardar_historico(historico)
+    historico_temas_db.limpiar_apariciones_antiguas(conn_historico, max_apariciones=30)
+    historico_temas_db.limpiar_noticias_antiguas(conn_historico, fecha_consolidacion)
+    metricas = metricas_temas.actualizar_metricas(conn_historico, fecha_consolidacion)
+    for tema in temas_completos:
+        if tema['tema_id'] in metricas:
+            tema['tendencia'] = metricas[tema['tema_id']]['tendencia']
+    totales = historico_temas_db.contar_temas(conn_historico)
+    logging.info(f"✓ Histórico: {totales['total_temas_activos']} activos, {totales['total_temas_inactivos']} inactivos, "
+                 f"{totales['total_temas_historicos']} en total")
+    conn_historico.close()
     
     # 6. Guardar resultados del día
     logging.info("\n" + "=" * 70)
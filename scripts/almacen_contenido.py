@@ -0,0 +1,197 @@
+"""
+Almacén comprimido del contenido completo de las noticias.
+El texto scrapeado no va embebido en noticias_contenido_*.json: se guarda aparte,
+un registro comprimido por noticia, con un índice de offsets por id. Así el dataset
+principal queda liviano y los consumidores leen solo el texto que necesitan.
+
+Archivos por día (en data/contenido/):
+    contenido_YYYY-MM-DD.bin        Registros comprimidos concatenados
+    contenido_YYYY-MM-DD.idx.json   {"codec": ..., "entradas": {id: [offset, largo, palabras]}}
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+import logging
+
+import cache_contenido
+
+try:
+    import zstandard
+    ZSTD_DISPONIBLE = True
+except ImportError:
+    ZSTD_DISPONIBLE = False
+
+# Rutas
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = BASE_DIR / "data"
+CONTENIDO_DIR = DATA_DIR / "contenido"
+
+# Parámetros
+MAX_DIAS_ALMACEN = 7  # Almacenes de días anteriores que se conservan
+NIVEL_ZSTD = 10
+NIVEL_GZIP = 6
+
+
+def id_noticia(url: str) -> str:
+    """
+    Id estable de una noticia: hash corto de su URL canónica.
+    """
+    return hashlib.sha1(cache_contenido.canonicalizar_url(url).encode("utf-8")).hexdigest()[:16]
+
+
+def comprimir(texto: str, codec: str) -> bytes:
+    datos = texto.encode("utf-8")
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=NIVEL_ZSTD).compress(datos)
+    return gzip.compress(datos, compresslevel=NIVEL_GZIP)
+
+
+def descomprimir(datos: bytes, codec: str) -> str:
+    if codec == "zstd":
+        return zstandard.ZstdDecompressor().decompress(datos).decode("utf-8")
+    return gzip.decompress(datos).decode("utf-8")
+
+
+def rutas_almacen(fecha: str) -> Dict[str, Path]:
+    """
+    Rutas del archivo de datos y del índice de un día.
+    """
+    return {
+        'datos': CONTENIDO_DIR / f"contenido_{fecha}.bin",
+        'indice': CONTENIDO_DIR / f"contenido_{fecha}.idx.json",
+    }
+
+
+def escribir_almacen(fecha: str, contenidos: Dict[str, str]) -> Path:
+    """
+    Escribe (reemplazando) el almacén de un día.
+    Escribe a archivos temporales y los renombra al final, para no dejar
+    un almacén a medio escribir si el proceso se corta.
+
+    Args:
+        fecha: Fecha en formato YYYY-MM-DD
+        contenidos: Diccionario id_noticia -> texto completo
+
+    Returns:
+        Ruta del archivo de datos
+    """
+    CONTENIDO_DIR.mkdir(parents=True, exist_ok=True)
+    rutas = rutas_almacen(fecha)
+    codec = "zstd" if ZSTD_DISPONIBLE else "gzip"
+
+    entradas = {}
+    tmp_datos = rutas['datos'].with_suffix(".bin.tmp")
+    with open(tmp_datos, "wb") as f:
+        for id_contenido, texto in contenidos.items():
+            registro = comprimir(texto, codec)
+            entradas[id_contenido] = [f.tell(), len(registro), len(texto.split())]
+            f.write(registro)
+
+    tmp_indice = rutas['indice'].with_suffix(".json.tmp")
+    with open(tmp_indice, "w", encoding="utf-8") as f:
+        json.dump({'codec': codec, 'entradas': entradas}, f)
+
+    os.replace(tmp_datos, rutas['datos'])
+    os.replace(tmp_indice, rutas['indice'])
+
+    tamano_original = sum(len(t.encode("utf-8")) for t in contenidos.values())
+    tamano_comprimido = rutas['datos'].stat().st_size
+    logging.info(
+        f"Almacén de contenido ({codec}): {len(entradas)} textos, "
+        f"{tamano_original / 1024:.0f} KB → {tamano_comprimido / 1024:.0f} KB"
+    )
+    return rutas['datos']
+
+
+def limpiar_almacenes_antiguos(max_dias: int = MAX_DIAS_ALMACEN):
+    """
+    Conserva solo los almacenes de los últimos max_dias días.
+    """
+    indices = sorted(CONTENIDO_DIR.glob("contenido_*.idx.json"))
+    if len(indices) <= max_dias:
+        return
+
+    for indice in indices[:-max_dias]:
+        fecha = indice.name[len("contenido_"):-len(".idx.json")]
+        for ruta in rutas_almacen(fecha).values():
+            ruta.unlink(missing_ok=True)
+        logging.info(f"Almacén de contenido antiguo eliminado: {fecha}")
+
+
+class AlmacenContenido:
+    """
+    Lector perezoso de un almacén: el índice se carga al abrir y cada texto
+    se lee y descomprime recién cuando se pide.
+    """
+
+    def __init__(self, fecha: str):
+        rutas = rutas_almacen(fecha)
+        with open(rutas['indice'], "r", encoding="utf-8") as f:
+            indice = json.load(f)
+        self.codec = indice['codec']
+        self.entradas = indice['entradas']
+        self.ruta_datos = rutas['datos']
+        self._archivo = None
+
+    def __contains__(self, id_contenido: str) -> bool:
+        return id_contenido in self.entradas
+
+    def obtener(self, id_contenido: str) -> Optional[str]:
+        """
+        Texto completo de una noticia, o None si no está en el almacén.
+        """
+        entrada = self.entradas.get(id_contenido)
+        if entrada is None:
+            return None
+
+        if self._archivo is None:
+            self._archivo = open(self.ruta_datos, "rb")
+
+        offset, largo, _ = entrada
+        self._archivo.seek(offset)
+        return descomprimir(self._archivo.read(largo), self.codec)
+
+    def completar_noticias(self, noticias: List[Dict]) -> int:
+        """
+        Agrega 'contenido_completo' a las noticias indicadas (in-place),
+        leyendo solo esos textos del almacén.
+
+        Returns:
+            Cantidad de noticias completadas
+        """
+        completadas = 0
+        for noticia in noticias:
+            id_contenido = noticia.get('contenido_id')
+            if not id_contenido or noticia.get('contenido_completo'):
+                continue
+            texto = self.obtener(id_contenido)
+            if texto:
+                noticia['contenido_completo'] = texto
+                completadas += 1
+        return completadas
+
+    def cerrar(self):
+        if self._archivo is not None:
+            self._archivo.close()
+            self._archivo = None
+
+
+def abrir_para_dataset(data: Dict) -> Optional[AlmacenContenido]:
+    """
+    Abre el almacén referenciado por un noticias_contenido_*.json.
+    Devuelve None si el dataset tiene el contenido embebido (formato anterior)
+    o si el almacén no existe.
+    """
+    fecha = data.get('almacen_contenido')
+    if not fecha:
+        return None
+
+    if not rutas_almacen(fecha)['indice'].exists():
+        logging.warning(f"No se encontró el almacén de contenido del {fecha}")
+        return None
+
+    return AlmacenContenido(fecha)
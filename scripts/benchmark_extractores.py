@@ -0,0 +1,206 @@
+"""
+Benchmark de extractores de contenido por medio sobre HTML guardado.
+Compara el extractor específico del sitio (extractores_sitios) contra
+newspaper3k y trafilatura: tasa de éxito, tiempo por página, palabras
+extraídas y similitud del texto con el de trafilatura (referencia).
+
+Uso:
+    # 1. Guardar fixtures: N notas por medio desde el último JSON de noticias
+    python scripts/benchmark_extractores.py --guardar 5
+
+    # 2. Correr el benchmark sobre data/fixtures_html/<dominio>/*.html
+    python scripts/benchmark_extractores.py
+
+Las páginas de data/fixtures_html/ son notas reales descargadas con --guardar: son las
+únicas que sirven para validar las reglas de cada medio contra su HTML real.
+"""
+
+import argparse
+import json
+import re
+import statistics
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+import logging
+
+import extraer_contenido
+import estadisticas_extractores
+
+# Configuración de logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+# Rutas
+BASE_DIR = Path(__file__).parent.parent
+FIXTURES_DIR = BASE_DIR / "data" / "fixtures_html"
+ARCHIVO_RESULTADOS = BASE_DIR / "data" / "benchmark_extractores_resultados.json"
+FRONTEND_DIR = BASE_DIR / "frontend" / "data"
+
+# Parámetros
+REPETICIONES = 3  # Corridas por página (se informa la mediana)
+EXTRACTOR_REFERENCIA = "trafilatura"
+
+
+def guardar_fixtures(por_dominio: int):
+    """
+    Descarga hasta `por_dominio` notas de cada medio desde el JSON de noticias más reciente.
+    """
+    archivos = list(FRONTEND_DIR.glob("noticias_[0-9]*.json"))
+    if not archivos:
+        logging.error("No se encontraron archivos de noticias en frontend/data/")
+        return
+
+    archivo = max(archivos, key=lambda p: p.stat().st_mtime)
+    with open(archivo, "r", encoding="utf-8") as f:
+        noticias = json.load(f).get('noticias', [])
+
+    sesion = extraer_contenido.crear_sesion_http()
+    guardadas: Dict[str, int] = {}
+
+    for noticia in noticias:
+        url = noticia.get('link', '')
+        if not url:
+            continue
+
+        dominio = estadisticas_extractores.obtener_dominio(url)
+        if guardadas.get(dominio, 0) >= por_dominio:
+            continue
+
+        descarga = extraer_contenido.descargar_html(url, sesion)
+        if not descarga['html']:
+            continue
+
+        carpeta = FIXTURES_DIR / dominio
+        carpeta.mkdir(parents=True, exist_ok=True)
+        nombre = re.sub(r'[^a-z0-9]+', '-', url.lower().rstrip('/').split('/')[-1])[:80] or "nota"
+        (carpeta / f"{nombre}.html").write_text(descarga['html'], encoding="utf-8")
+
+        guardadas[dominio] = guardadas.get(dominio, 0) + 1
+        logging.info(f"  Guardada: {dominio}/{nombre}.html")
+        time.sleep(extraer_contenido.DELAY_ENTRE_REQUESTS)
+
+    logging.info(f"✓ Fixtures guardados en {FIXTURES_DIR}: {guardadas}")
+
+
+def similitud(texto: Optional[str], referencia: Optional[str]) -> Optional[float]:
+    """
+    Jaccard entre los conjuntos de palabras de dos textos (None si falta alguno).
+    """
+    if not texto or not referencia:
+        return None
+    palabras = set(texto.lower().split())
+    palabras_ref = set(referencia.lower().split())
+    return len(palabras & palabras_ref) / len(palabras | palabras_ref)
+
+
+def medir_importacion() -> Dict[str, float]:
+    """
+    Tiempo de importar los extractores genéricos (se paga una vez por proceso).
+    """
+    tiempos = {}
+    for nombre, modulo in [("newspaper3k", "newspaper"), ("trafilatura", "trafilatura")]:
+        inicio = time.perf_counter()
+        try:
+            __import__(modulo)
+            tiempos[nombre] = time.perf_counter() - inicio
+        except ImportError:
+            tiempos[nombre] = None
+    return tiempos
+
+
+def benchmark_dominio(dominio: str, archivos: List[Path]) -> Dict[str, Dict]:
+    """
+    Corre todos los extractores sobre los fixtures de un dominio.
+
+    Returns:
+        Diccionario extractor -> métricas
+    """
+    extractores = dict(extraer_contenido.EXTRACTORES)
+    crudos = {nombre: {'tiempos': [], 'palabras': [], 'similitudes': [], 'exitos': 0} for nombre in extractores}
+
+    for archivo in archivos:
+        html = archivo.read_text(encoding="utf-8", errors="replace")
+        url = f"https://{dominio}/{archivo.stem}"
+        textos = {}
+
+        for nombre, extractor in extractores.items():
+            tiempos = []
+            for _ in range(REPETICIONES):
+                inicio = time.perf_counter()
+                texto = extractor(url, html)
+                tiempos.append(time.perf_counter() - inicio)
+            textos[nombre] = texto
+            crudos[nombre]['tiempos'].append(statistics.median(tiempos))
+            if texto:
+                crudos[nombre]['exitos'] += 1
+                crudos[nombre]['palabras'].append(len(texto.split()))
+
+        for nombre, texto in textos.items():
+            valor = similitud(texto, textos.get(EXTRACTOR_REFERENCIA))
+            if valor is not None:
+                crudos[nombre]['similitudes'].append(valor)
+
+    metricas = {}
+    for nombre, datos in crudos.items():
+        metricas[nombre] = {
+            'paginas': len(archivos),
+            'tasa_exito': round(datos['exitos'] / len(archivos) * 100, 1),
+            'ms_por_pagina': round(statistics.median(datos['tiempos']) * 1000, 2),
+            'palabras_promedio': round(statistics.mean(datos['palabras'])) if datos['palabras'] else 0,
+            'similitud_referencia': round(statistics.mean(datos['similitudes']), 2) if datos['similitudes'] else None,
+        }
+    return metricas
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de extractores de contenido por medio")
+    parser.add_argument("--guardar", type=int, metavar="N", help="Descargar N notas por medio como fixtures y salir")
+    args = parser.parse_args()
+
+    if args.guardar:
+        guardar_fixtures(args.guardar)
+        return
+
+    carpetas = sorted(p for p in FIXTURES_DIR.glob("*") if p.is_dir()) if FIXTURES_DIR.exists() else []
+    if not carpetas:
+        logging.error(f"No hay fixtures en {FIXTURES_DIR}. Generalos con --guardar N")
+        return
+
+    logging.info("=" * 70)
+    logging.info("BENCHMARK DE EXTRACTORES POR MEDIO")
+    logging.info("=" * 70)
+
+    for nombre, segundos in medir_importacion().items():
+        if segundos is None:
+            logging.info(f"Importación {nombre}: no instalado")
+        else:
+            logging.info(f"Importación {nombre}: {segundos * 1000:.0f} ms")
+
+    resultados = {}
+    for carpeta in carpetas:
+        archivos = sorted(carpeta.glob("*.html"))
+        if not archivos:
+            continue
+
+        metricas = benchmark_dominio(carpeta.name, archivos)
+        resultados[carpeta.name] = metricas
+
+        logging.info(f"\n{carpeta.name} ({len(archivos)} páginas)")
+        logging.info(f"  {'extractor':<12} {'éxito':>7} {'ms/pág':>9} {'palabras':>9} {'sim. ref':>9}")
+        for nombre, m in metricas.items():
+            sim = f"{m['similitud_referencia']:.2f}" if m['similitud_referencia'] is not None else "-"
+            logging.info(f"  {nombre:<12} {m['tasa_exito']:>6.1f}% {m['ms_por_pagina']:>9.2f} {m['palabras_promedio']:>9} {sim:>9}")
+
+    with open(ARCHIVO_RESULTADOS, "w", encoding="utf-8") as f:
+        json.dump(resultados, f, ensure_ascii=False, indent=2)
+
+    logging.info("\n" + "=" * 70)
+    logging.info(f"📁 Resultados guardados en: {ARCHIVO_RESULTADOS}")
+    logging.info("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
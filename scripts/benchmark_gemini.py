@@ -0,0 +1,231 @@
+"""
+Benchmark de las etapas de IA (generar_resumenes_gemini y agrupar_temas) contra el
+servidor Gemini simulado: mide tiempo total, solicitudes por segundo y cómo se
+comportan los reintentos ante errores 429/503 inyectados.
+
+Corre sobre noticias sintéticas en un directorio temporal (no toca data/ ni frontend/)
+y con la caché de respuestas vacía, para que todas las llamadas lleguen al servidor.
+
+Uso:
+    python scripts/benchmark_gemini.py
+    python scripts/benchmark_gemini.py --noticias 150 --latencia 1.0 --tasa-429 0.1 --rpm 10
+"""
+
+import argparse
+import json
+import os
+import random
+import shutil
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List
+import logging
+
+import servidor_gemini_simulado
+
+# Configuración de logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+# Rutas
+BASE_DIR = Path(__file__).parent.parent
+ARCHIVO_RESULTADOS = BASE_DIR / "data" / "benchmark_gemini_resultados.json"
+
+FUENTES = ["Clarín", "La Nación", "Infobae", "Página 12", "Ámbito", "Perfil", "Minuto Uno", "iProfesional"]
+CATEGORIAS = ["internacional", "politica", "economia", "sociedad"]
+PALABRAS = (
+    "gobierno congreso dólar inflación elecciones reforma salarios docentes tarifas energía "
+    "exportaciones cosecha tormenta inundaciones paro transporte tribunal causa ministro "
+    "presupuesto deuda acuerdo cumbre guerra tregua negociación sindicato hospital escuelas"
+).split()
+
+
+def generar_noticias(cantidad: int, fecha: str, semilla: int) -> List[Dict]:
+    """
+    Noticias sintéticas con la misma forma que el consolidado diario.
+    """
+    azar = random.Random(semilla)
+    noticias = []
+    for i in range(cantidad):
+        titulo = " ".join(azar.sample(PALABRAS, 7)).capitalize()
+        if noticias and i % 5 == 4:
+            titulo = noticias[-1]['titulo']  # Misma nota en otro medio (como pasa con los cables de agencia)
+        categoria = CATEGORIAS[i % len(CATEGORIAS)]
+        noticias.append({
+            'titulo': titulo,
+            'link': f"https://medio{i % len(FUENTES)}.com.ar/{categoria}/nota-{i}",
+            'fuente': FUENTES[i % len(FUENTES)],
+            'categoria_url': categoria,
+            'fecha_local': f"{fecha}T{azar.randint(0, 23):02d}:{azar.randint(0, 59):02d}:00-03:00",
+            'resumen': f"<p>{titulo}. " + " ".join(azar.choices(PALABRAS, k=40)) + "</p>",
+        })
+    return noticias
+
+
+def preparar_directorio(directorio: Path, noticias: List[Dict], fecha: str):
+    """
+    Crea data/ y frontend/data/ temporales con el consolidado sintético.
+    """
+    datos = {'fecha_consolidacion': fecha, 'total_noticias': len(noticias), 'noticias': noticias}
+    for carpeta in (directorio / "data", directorio / "frontend"):
+        carpeta.mkdir(parents=True, exist_ok=True)
+        with open(carpeta / f"noticias_{fecha}.json", "w", encoding="utf-8") as f:
+            json.dump(datos, f, ensure_ascii=False)
+
+
+def redirigir_rutas(directorio: Path, modulos: Dict):
+    """
+    Apunta las rutas de los scripts al directorio temporal.
+    """
+    data_dir = directorio / "data"
+    frontend_dir = directorio / "frontend"
+
+    modulos['generar_resumenes_gemini'].DATA_DIR = data_dir
+    modulos['generar_resumenes_gemini'].OUTPUT_DIR = data_dir
+    modulos['generar_resumenes_gemini'].FRONTEND_DIR = frontend_dir
+    modulos['generar_resumenes_gemini'].ARCHIVO_ESTADO = data_dir / "cache" / "estado_resumenes.json"
+
+    modulos['agrupar_temas'].DATA_DIR = data_dir
+    modulos['agrupar_temas'].NOTICIAS_DIR = data_dir
+    modulos['agrupar_temas'].TEMAS_DIR = data_dir / "temas"
+    modulos['agrupar_temas'].FRONTEND_DIR = frontend_dir
+
+    modulos['cache_llm'].CACHE_DIR = data_dir / "cache"
+    modulos['cache_llm'].DB_PATH = data_dir / "cache" / "llm.db"
+    modulos['almacen_contenido'].CONTENIDO_DIR = data_dir / "contenido"
+    modulos['historico_temas_db'].TEMAS_DIR = data_dir / "temas"
+    modulos['historico_temas_db'].DB_PATH = data_dir / "temas" / "historico_temas.db"
+    modulos['historico_temas_db'].ARCHIVO_JSON_ANTERIOR = data_dir / "temas" / "historico_temas.json"
+
+
+def medir_etapa(nombre: str, funcion, config: servidor_gemini_simulado.ConfiguracionSimulador,
+                planificadores: List) -> Dict:
+    """
+    Ejecuta una etapa y devuelve sus métricas (servidor + planificador).
+    """
+    antes = dict(config.contadores)
+    del planificadores[:]
+
+    inicio = time.perf_counter()
+    funcion()
+    segundos = time.perf_counter() - inicio
+
+    servidor = {clave: config.contadores[clave] - antes[clave] for clave in antes}
+    cliente = {'reintentos': 0, 'errores': 0, 'segundos_en_espera': 0.0}
+    for planificador in planificadores:
+        for clave in cliente:
+            cliente[clave] += planificador.estadisticas[clave]
+
+    return {
+        'etapa': nombre,
+        'segundos': round(segundos, 2),
+        'solicitudes': servidor['solicitudes'],
+        'respuestas_ok': servidor['exitos'],
+        'errores_429': servidor['errores_429'],
+        'errores_503': servidor['errores_503'],
+        'reintentos': cliente['reintentos'],
+        'fallidas': cliente['errores'],
+        'segundos_esperando_cuota': round(cliente['segundos_en_espera'], 1),
+        'solicitudes_por_segundo': round(servidor['solicitudes'] / segundos, 2) if segundos else 0.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de las etapas de IA contra el servidor Gemini simulado")
+    parser.add_argument("--noticias", type=int, default=150, help="Cantidad de noticias sintéticas")
+    parser.add_argument("--latencia", type=float, default=servidor_gemini_simulado.LATENCIA)
+    parser.add_argument("--jitter", type=float, default=servidor_gemini_simulado.JITTER)
+    parser.add_argument("--tasa-429", type=float, default=0.05)
+    parser.add_argument("--tasa-503", type=float, default=0.05)
+    parser.add_argument("--rpm", type=int, help="Cuota de solicitudes por minuto del planificador (default: la de producción)")
+    parser.add_argument("--concurrencia", type=int, help="Hilos del planificador (default: el de producción)")
+    parser.add_argument("--semilla", type=int, default=42)
+    parser.add_argument("--detalle", action="store_true", help="Mostrar el log completo de los scripts")
+    args = parser.parse_args()
+
+    config = servidor_gemini_simulado.ConfiguracionSimulador(
+        latencia=args.latencia, jitter=args.jitter, tasa_429=args.tasa_429,
+        tasa_503=args.tasa_503, semilla=args.semilla
+    )
+    servidor = servidor_gemini_simulado.iniciar_servidor(config)
+
+    # Las cuotas del planificador se leen del entorno al importarlo: configurar antes de importar los scripts
+    os.environ['GEMINI_BASE_URL'] = servidor.url
+    os.environ['GEMINI_API_KEY'] = "benchmark-local"
+    if args.rpm:
+        os.environ['GEMINI_RPM'] = str(args.rpm)
+    if args.concurrencia:
+        os.environ['GEMINI_CONCURRENCIA'] = str(args.concurrencia)
+
+    import almacen_contenido
+    import cache_llm
+    import historico_temas_db
+    import planificador_gemini
+    import generar_resumenes_gemini
+    import agrupar_temas
+
+    modulos = {
+        'almacen_contenido': almacen_contenido, 'cache_llm': cache_llm, 'historico_temas_db': historico_temas_db,
+        'generar_resumenes_gemini': generar_resumenes_gemini, 'agrupar_temas': agrupar_temas,
+    }
+
+    # Registrar los planificadores que crean los scripts para leer sus estadísticas
+    planificadores = []
+
+    class PlanificadorMedido(planificador_gemini.PlanificadorGemini):
+        def __init__(self, *posicionales, **nombrados):
+            super().__init__(*posicionales, **nombrados)
+            planificadores.append(self)
+
+    planificador_gemini.PlanificadorGemini = PlanificadorMedido
+
+    directorio = Path(tempfile.mkdtemp(prefix="benchmark_gemini_"))
+    fecha = datetime.now().strftime("%Y-%m-%d")
+    preparar_directorio(directorio, generar_noticias(args.noticias, fecha, args.semilla), fecha)
+    redirigir_rutas(directorio, modulos)
+
+    logging.info("=" * 70)
+    logging.info("BENCHMARK DE ETAPAS DE IA (servidor Gemini simulado)")
+    logging.info("=" * 70)
+    logging.info(f"Servidor: {servidor.url} | latencia {args.latencia}s ±{args.jitter}s | "
+                 f"429: {args.tasa_429:.0%} | 503: {args.tasa_503:.0%}")
+    logging.info(f"Planificador: {planificador_gemini.LIMITE_RPM} RPM, {planificador_gemini.MAX_CONCURRENTES} hilos")
+    logging.info(f"Noticias sintéticas: {args.noticias}")
+
+    nivel_original = logging.getLogger().level
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    if not args.detalle:
+        logging.getLogger().setLevel(logging.ERROR)
+
+    try:
+        resultados = [
+            medir_etapa("generar_resumenes_gemini", generar_resumenes_gemini.main, config, planificadores),
+            medir_etapa("agrupar_temas", agrupar_temas.main, config, planificadores),
+        ]
+    finally:
+        logging.getLogger().setLevel(nivel_original)
+        servidor.shutdown()
+        shutil.rmtree(directorio, ignore_errors=True)
+
+    logging.info(f"\n  {'etapa':<26} {'seg':>7} {'solic':>6} {'ok':>5} {'429':>5} {'503':>5} {'reint':>6} {'fallas':>7} {'solic/s':>8}")
+    for r in resultados:
+        logging.info(
+            f"  {r['etapa']:<26} {r['segundos']:>7.2f} {r['solicitudes']:>6} {r['respuestas_ok']:>5} "
+            f"{r['errores_429']:>5} {r['errores_503']:>5} {r['reintentos']:>6} {r['fallidas']:>7} {r['solicitudes_por_segundo']:>8.2f}"
+        )
+
+    ARCHIVO_RESULTADOS.parent.mkdir(parents=True, exist_ok=True)
+    with open(ARCHIVO_RESULTADOS, "w", encoding="utf-8") as f:
+        json.dump({'parametros': vars(args), 'resultados': resultados}, f, ensure_ascii=False, indent=2)
+
+    logging.info("\n" + "=" * 70)
+    logging.info(f"📁 Resultados guardados en: {ARCHIVO_RESULTADOS}")
+    logging.info("=" * 70)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Benchmark de la búsqueda de temas existentes en el histórico: recorrido completo con
+Jaccard contra cada tema (como antes) frente al índice invertido de historico_temas_db.
+
+Arma un histórico sintético (por defecto 10.000 temas) en una base temporal y busca
+nombres de tres tipos: copias exactas, variantes con una palabra cambiada y temas nuevos.
+Verifica que ambos métodos encuentren lo mismo y mide el tiempo por búsqueda.
+
+Uso:
+    python scripts/benchmark_indice_temas.py
+    python scripts/benchmark_indice_temas.py --temas 50000 --busquedas 500
+"""
+
+import argparse
+import itertools
+import json
+import random
+import shutil
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Optional
+import logging
+
+import historico_temas_db
+
+# Configuración de logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+# Rutas
+BASE_DIR = Path(__file__).parent.parent
+ARCHIVO_RESULTADOS = BASE_DIR / "data" / "benchmark_indice_temas_resultados.json"
+
+TAMANO_VOCABULARIO = 3000
+
+
+def generar_vocabulario(azar: random.Random) -> List[str]:
+    silabas = ["ba", "ce", "di", "fo", "gu", "la", "me", "ni", "po", "ru", "sa", "te", "vi", "zo", "cra", "tren", "pla"]
+    palabras = set()
+    while len(palabras) < TAMANO_VOCABULARIO:
+        palabras.add("".join(azar.choice(silabas) for _ in range(azar.randint(2, 4))))
+    return sorted(palabras)
+
+
+def generar_nombre(azar: random.Random, vocabulario: List[str], pesos: List[float]) -> str:
+    """Nombre normalizado de 3-8 palabras distintas, con frecuencias de Zipf (pocas palabras muy comunes)."""
+    cantidad = azar.randint(3, 8)
+    palabras = []
+    while len(palabras) < cantidad:
+        palabra = azar.choices(vocabulario, cum_weights=pesos)[0]
+        if palabra not in palabras:
+            palabras.append(palabra)
+    return " ".join(palabras)
+
+
+def buscar_lineal(conn, nombre_normalizado: str, umbral: float) -> Optional[str]:
+    """Búsqueda anterior: exacto y alias, y si no, recorre todos los temas hasta el primero que supera el umbral."""
+    fila = conn.execute(
+        'SELECT tema_id FROM temas WHERE tema_normalizado = ? '
+        'UNION ALL SELECT tema_id FROM alias WHERE alias = ?', (nombre_normalizado, nombre_normalizado)
+    ).fetchone()
+    if fila:
+        return fila['tema_id']
+    for fila in conn.execute('SELECT tema_id, tema_normalizado FROM temas'):
+        if historico_temas_db.calcular_similitud_simple(nombre_normalizado, fila['tema_normalizado']) >= umbral:
+            return fila['tema_id']
+    return None
+
+
+def mejor_similitud_lineal(conn, nombre_normalizado: str) -> float:
+    return max(
+        (historico_temas_db.calcular_similitud_simple(nombre_normalizado, fila['tema_normalizado'])
+         for fila in conn.execute('SELECT tema_normalizado FROM temas')),
+        default=0.0
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del índice invertido de temas")
+    parser.add_argument("--temas", type=int, default=10000, help="Temas en el histórico sintético")
+    parser.add_argument("--busquedas", type=int, default=300, help="Nombres a buscar")
+    parser.add_argument("--semilla", type=int, default=42)
+    args = parser.parse_args()
+
+    azar = random.Random(args.semilla)
+    vocabulario = generar_vocabulario(azar)
+    pesos = list(itertools.accumulate(1.0 / rango for rango in range(1, len(vocabulario) + 1)))
+    umbral = historico_temas_db.UMBRAL_SIMILITUD
+
+    directorio = Path(tempfile.mkdtemp(prefix="benchmark_indice_temas_"))
+    historico_temas_db.TEMAS_DIR = directorio
+    historico_temas_db.DB_PATH = directorio / "historico_temas.db"
+    historico_temas_db.ARCHIVO_JSON_ANTERIOR = directorio / "historico_temas.json"
+
+    logging.info("=" * 70)
+    logging.info("BENCHMARK DEL ÍNDICE DE TEMAS")
+    logging.info("=" * 70)
+
+    try:
+        conn = historico_temas_db.get_connection()
+
+        inicio = time.perf_counter()
+        nombres = []
+        with conn:
+            for i in range(args.temas):
+                nombre = generar_nombre(azar, vocabulario, pesos)
+                tema_id = f"tema_{i}"
+                conn.execute(
+                    "INSERT INTO temas (tema_id, tema, tema_normalizado, fecha_primer_deteccion, fecha_ultima_aparicion) "
+                    "VALUES (?, ?, ?, '2026-01-01', '2026-01-01')", (tema_id, nombre, nombre)
+                )
+                historico_temas_db.indexar_tema(conn, tema_id, nombre)
+                nombres.append(nombre)
+        logging.info(f"Histórico sintético: {args.temas} temas en {time.perf_counter() - inicio:.1f}s")
+
+        # Búsquedas: un tercio exactas, un tercio variantes (una palabra cambiada), un tercio nuevas
+        busquedas = []
+        for k in range(args.busquedas):
+            if k % 3 == 0:
+                busquedas.append(azar.choice(nombres))
+            elif k % 3 == 1:
+                palabras = azar.choice(nombres).split()
+                palabras[azar.randrange(len(palabras))] = azar.choice(vocabulario)
+                busquedas.append(" ".join(palabras))
+            else:
+                busquedas.append(generar_nombre(azar, vocabulario, pesos))
+
+        inicio = time.perf_counter()
+        resultados_lineal = [buscar_lineal(conn, nombre, umbral) for nombre in busquedas]
+        segundos_lineal = time.perf_counter() - inicio
+
+        inicio = time.perf_counter()
+        resultados_indice = [historico_temas_db.buscar_tema(conn, nombre, umbral) for nombre in busquedas]
+        segundos_indice = time.perf_counter() - inicio
+
+        # Verificación: mismos aciertos y, si hay match por similitud, el índice devuelve el más parecido
+        diferencias = 0
+        for nombre, lineal, indice in zip(busquedas, resultados_lineal, resultados_indice):
+            if (lineal is None) != (indice is None):
+                diferencias += 1
+            elif indice is not None and indice[2] == "similitud" and abs(indice[3] - mejor_similitud_lineal(conn, nombre)) > 1e-9:
+                diferencias += 1
+
+        conn.close()
+    finally:
+        shutil.rmtree(directorio, ignore_errors=True)
+
+    aciertos = sum(1 for r in resultados_indice if r)
+    resultado = {
+        'temas': args.temas,
+        'busquedas': args.busquedas,
+        'aciertos': aciertos,
+        'diferencias': diferencias,
+        'ms_por_busqueda_lineal': round(segundos_lineal / args.busquedas * 1000, 3),
+        'ms_por_busqueda_indice': round(segundos_indice / args.busquedas * 1000, 3),
+        'aceleracion': round(segundos_lineal / segundos_indice, 1) if segundos_indice else None,
+    }
+
+    logging.info(f"Búsquedas: {args.busquedas} ({aciertos} con match)")
+    logging.info(f"  Recorrido completo: {resultado['ms_por_busqueda_lineal']:.3f} ms por búsqueda")
+    logging.info(f"  Índice invertido:   {resultado['ms_por_busqueda_indice']:.3f} ms por búsqueda")
+    logging.info(f"  Aceleración: x{resultado['aceleracion']}")
+    if diferencias:
+        logging.warning(f"⚠️  {diferencias} búsquedas con resultado distinto entre ambos métodos")
+    else:
+        logging.info("✓ Ambos métodos encuentran los mismos temas")
+
+    ARCHIVO_RESULTADOS.parent.mkdir(parents=True, exist_ok=True)
+    with open(ARCHIVO_RESULTADOS, "w", encoding="utf-8") as f:
+        json.dump({'parametros': vars(args), 'resultado': resultado}, f, ensure_ascii=False, indent=2)
+    logging.info(f"📁 Resultados guardados en: {ARCHIVO_RESULTADOS}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Caché persistente del contenido extraído por scraping.
+Guarda el texto de cada noticia en SQLite, indexado por URL canónica,
+para que las corridas sucesivas del día no vuelvan a descargar lo mismo.
+"""
+
+import sqlite3
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+# Rutas
+BASE_DIR = Path(__file__).parent.parent
+CACHE_DIR = BASE_DIR / "data" / "cache"
+DB_PATH = CACHE_DIR / "contenido.db"
+
+# Parámetros de query que no cambian el artículo (tracking)
+PARAMETROS_IGNORADOS = {'fbclid', 'gclid', 'ref', 'ref_src', 'outputtype', 'amp'}
+
+
+def canonicalizar_url(url: str) -> str:
+    """
+    Normaliza una URL para usarla como clave de caché.
+    Ejemplo: "http://WWW.Clarin.com/nota/?utm_source=rss#top" -> "https://www.clarin.com/nota"
+    """
+    partes = urlsplit(url.strip())
+
+    esquema = 'https' if partes.scheme in ('http', 'https', '') else partes.scheme
+    host = partes.netloc.lower()
+
+    # Quitar parámetros de tracking y ordenar el resto
+    query = [
+        (clave, valor) for clave, valor in parse_qsl(partes.query, keep_blank_values=True)
+        if not clave.lower().startswith('utm_') and clave.lower() not in PARAMETROS_IGNORADOS
+    ]
+    query.sort()
+
+    ruta = partes.path or '/'
+    if len(ruta) > 1:
+        ruta = ruta.rstrip('/')
+
+    return urlunsplit((esquema, host, ruta, urlencode(query), ''))
+
+
+def get_connection() -> sqlite3.Connection:
+    """Obtiene una conexión a la caché, creando la tabla si no existe."""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS contenido (
+            url_canonica TEXT PRIMARY KEY,
+            url TEXT NOT NULL,
+            contenido TEXT,
+            metodo TEXT,
+            palabras INTEGER DEFAULT 0,
+            fecha_descarga TEXT NOT NULL,
+            etag TEXT,
+            last_modified TEXT
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_contenido_fecha ON contenido(fecha_descarga)')
+    conn.commit()
+    return conn
+
+
+def obtener(conn: sqlite3.Connection, url_canonica: str) -> Optional[Dict]:
+    """
+    Busca una entrada en la caché.
+
+    Returns:
+        Diccionario con la entrada o None si no existe
+    """
+    fila = conn.execute(
+        'SELECT * FROM contenido WHERE url_canonica = ?', (url_canonica,)
+    ).fetchone()
+    return dict(fila) if fila else None
+
+
+def esta_vigente(entrada: Dict, ttl_horas: float) -> bool:
+    """
+    Indica si una entrada todavía no superó su TTL.
+    """
+    fecha_descarga = datetime.fromisoformat(entrada['fecha_descarga'])
+    return datetime.now() - fecha_descarga < timedelta(hours=ttl_horas)
+
+
+def guardar(conn: sqlite3.Connection, url_canonica: str, url: str, contenido: Optional[str],
+            metodo: Optional[str], etag: Optional[str] = None, last_modified: Optional[str] = None):
+    """
+    Guarda (o reemplaza) el resultado de una extracción.
+    Se guardan también las extracciones fallidas (contenido None) para no reintentarlas en cada corrida.
+    """
+    palabras = len(contenido.split()) if contenido else 0
+    conn.execute('''
+        INSERT OR REPLACE INTO contenido
+            (url_canonica, url, contenido, metodo, palabras, fecha_descarga, etag, last_modified)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ''', (url_canonica, url, contenido, metodo, palabras, datetime.now().isoformat(), etag, last_modified))
+    conn.commit()
+
+
+def renovar(conn: sqlite3.Connection, url_canonica: str):
+    """
+    Renueva la fecha de una entrada revalidada (el servidor respondió 304 Not Modified).
+    """
+    conn.execute(
+        'UPDATE contenido SET fecha_descarga = ? WHERE url_canonica = ?',
+        (datetime.now().isoformat(), url_canonica)
+    )
+    conn.commit()
+
+
+def purgar(conn: sqlite3.Connection, max_dias: int) -> int:
+    """
+    Elimina entradas más antiguas que max_dias.
+
+    Returns:
+        Cantidad de entradas eliminadas
+    """
+    limite = (datetime.now() - timedelta(days=max_dias)).isoformat()
+    cursor = conn.execute('DELETE FROM contenido WHERE fecha_descarga < ?', (limite,))
+    conn.commit()
+    return cursor.rowcount
@@ -0,0 +1,141 @@
+"""
+Caché persistente de respuestas de Gemini, direccionada por contenido.
+La clave es un hash del modelo, la versión del prompt y los ids (en orden) de las
+noticias de entrada: si entre dos corridas las noticias de una categoría o de un
+tema no cambiaron, se reutiliza la respuesta anterior sin llamar a la API.
+"""
+
+import hashlib
+import json
+import sqlite3
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+
+import almacen_contenido
+import planificador_gemini
+
+# Rutas
+BASE_DIR = Path(__file__).parent.parent
+CACHE_DIR = BASE_DIR / "data" / "cache"
+DB_PATH = CACHE_DIR / "llm.db"
+
+# Parámetros
+MAX_DIAS_CACHE_LLM = 7  # Entradas sin usar por más de estos días se eliminan
+
+
+def ids_noticias(noticias: List[Dict]) -> List[str]:
+    """
+    Ids estables de las noticias de entrada (mismo id que el almacén de contenido).
+    Las noticias sin link se identifican por el hash de su título.
+    """
+    ids = []
+    for noticia in noticias:
+        link = noticia.get('link', '')
+        if link:
+            ids.append(almacen_contenido.id_noticia(link))
+        else:
+            ids.append(hashlib.sha1(noticia.get('titulo', '').encode("utf-8")).hexdigest()[:16])
+    return ids
+
+
+def calcular_clave(modelo: str, version_prompt: str, ids: List[str], extra: str = "") -> str:
+    """
+    Clave de caché: sha256 de modelo + versión del prompt + ids ordenados + dato extra
+    (p.ej. la categoría o el tipo de resumen).
+    """
+    material = json.dumps([modelo, version_prompt, extra, ids], ensure_ascii=False)
+    return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+
+def get_connection() -> sqlite3.Connection:
+    """Obtiene una conexión a la caché, creando la tabla si no existe."""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS respuestas (
+            clave TEXT PRIMARY KEY,
+            modelo TEXT NOT NULL,
+            version_prompt TEXT NOT NULL,
+            respuesta TEXT NOT NULL,
+            tokens_estimados INTEGER DEFAULT 0,
+            fecha_creacion TEXT NOT NULL,
+            ultimo_uso TEXT NOT NULL,
+            usos INTEGER DEFAULT 0
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_respuestas_uso ON respuestas(ultimo_uso)')
+    conn.commit()
+    return conn
+
+
+def nuevas_estadisticas() -> Dict:
+    """Contadores de uso de la caché para una corrida."""
+    return {'consultas': 0, 'aciertos': 0, 'tokens_ahorrados': 0}
+
+
+def consultar(conn: sqlite3.Connection, clave: str, estadisticas: Dict) -> Optional[str]:
+    """
+    Busca una respuesta en la caché y registra el acierto o fallo.
+
+    Returns:
+        Texto de la respuesta, o None si no está en caché
+    """
+    estadisticas['consultas'] += 1
+    fila = conn.execute(
+        'SELECT respuesta, tokens_estimados FROM respuestas WHERE clave = ?', (clave,)
+    ).fetchone()
+    if not fila:
+        return None
+
+    estadisticas['aciertos'] += 1
+    estadisticas['tokens_ahorrados'] += fila['tokens_estimados']
+    conn.execute(
+        'UPDATE respuestas SET ultimo_uso = ?, usos = usos + 1 WHERE clave = ?',
+        (datetime.now().isoformat(), clave)
+    )
+    conn.commit()
+    return fila['respuesta']
+
+
+def guardar(conn: sqlite3.Connection, clave: str, modelo: str, version_prompt: str, prompt: Optional[str],
+            respuesta: str, tokens: Optional[int] = None):
+    """
+    Guarda una respuesta exitosa. Los errores de la API no se guardan.
+    Si la respuesta salió de un prompt compartido (p.ej. un lote), se pasa `tokens`
+    con la parte que le corresponde en lugar del prompt.
+    """
+    if tokens is None:
+        tokens = planificador_gemini.estimar_tokens(prompt) + planificador_gemini.estimar_tokens(respuesta)
+    ahora = datetime.now().isoformat()
+    conn.execute('''
+        INSERT OR REPLACE INTO respuestas
+            (clave, modelo, version_prompt, respuesta, tokens_estimados, fecha_creacion, ultimo_uso, usos)
+        VALUES (?, ?, ?, ?, ?, ?, ?, 0)
+    ''', (clave, modelo, version_prompt, respuesta, tokens, ahora, ahora))
+    conn.commit()
+
+
+def purgar(conn: sqlite3.Connection, max_dias: int = MAX_DIAS_CACHE_LLM) -> int:
+    """
+    Elimina respuestas que no se usaron en los últimos max_dias días.
+
+    Returns:
+        Cantidad de entradas eliminadas
+    """
+    limite = (datetime.now() - timedelta(days=max_dias)).isoformat()
+    cursor = conn.execute('DELETE FROM respuestas WHERE ultimo_uso < ?', (limite,))
+    conn.commit()
+    return cursor.rowcount
+
+
+def resumen_estadisticas(estadisticas: Dict) -> str:
+    """Texto de una línea con la tasa de aciertos y los tokens ahorrados."""
+    consultas = estadisticas['consultas']
+    tasa = estadisticas['aciertos'] / consultas * 100 if consultas else 0.0
+    return (
+        f"{estadisticas['aciertos']}/{consultas} aciertos ({tasa:.0f}%), "
+        f"~{estadisticas['tokens_ahorrados']} tokens ahorrados"
+    )
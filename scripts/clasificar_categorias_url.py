@@ -5,12 +5,15 @@ Usa patrones heurísticos para inferir la categoría sin analizar el contenido.
 
 import json
 import re
+from functools import lru_cache
 from pathlib import Path
 import shutil
 from datetime import datetime
 from typing import Dict, List
 import logging
 
+import instrumentacion
+
 # Configuración de logging
 logging.basicConfig(
     level=logging.INFO,
@@ -296,6 +299,17 @@ PATRONES_CATEGORIAS = {
 }
 
 
+# Una expresión por categoría con todos sus patrones, compilada una sola vez
+PATRONES_COMPILADOS = [
+    (categoria, re.compile("|".join(f"(?:{patron})" for patron in patrones), re.IGNORECASE))
+    for categoria, patrones in PATRONES_CATEGORIAS.items()
+]
+
+# Clasificaciones ya hechas (en el modo daemon las mismas noticias vuelven en cada corrida)
+TAMANO_CACHE_CLASIFICACION = 50000
+
+
+@lru_cache(maxsize=TAMANO_CACHE_CLASIFICACION)
 def categorizar_por_url(url: str, url_feed: str = None) -> str:
     """
     Clasifica una noticia por categoría basándose en su URL o URL del feed.
@@ -325,12 +339,11 @@ def categorizar_por_url(url: str, url_feed: str = None) -> str:
         return "otros"
     
     # Verificar cada categoría en orden (determina la jerarquía)
-    for categoria, patrones in PATRONES_CATEGORIAS.items():
-        for patron in patrones:
-            # Buscar el patrón en todas las URLs
-            for url_analizar in urls_a_analizar:
-                if re.search(patron, url_analizar, re.IGNORECASE):
-                    return categoria
+    for categoria, expresion in PATRONES_COMPILADOS:
+        # Buscar los patrones en todas las URLs
+        for url_analizar in urls_a_analizar:
+            if expresion.search(url_analizar):
+                return categoria
     
     # Si no coincide con ningún patrón, retorna "otros"
     return "otros"
@@ -349,8 +362,9 @@ def procesar_json(archivo_entrada: Path, archivo_salida: Path = None):
     
     try:
         # Leer JSON
-        with open(archivo_entrada, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        with instrumentacion.medir("leer", detalle=archivo_entrada.name):
+            with open(archivo_entrada, "r", encoding="utf-8") as f:
+                data = json.load(f)
         
         noticias = data.get("noticias", [])
         if not noticias:
@@ -363,16 +377,19 @@ def procesar_json(archivo_entrada: Path, archivo_salida: Path = None):
         contadores = {cat: 0 for cat in CATEGORIAS}
         
         # Procesar cada noticia
-        for noticia in noticias:
-            link = noticia.get("link", "")
-            url_feed = noticia.get("url_feed", "")
-            categoria_url = categorizar_por_url(link, url_feed)
-            noticia["categoria_url"] = categoria_url
-            contadores[categoria_url] = contadores.get(categoria_url, 0) + 1
+        with instrumentacion.medir("clasificar", detalle=archivo_entrada.name, entrada=len(noticias)) as medicion:
+            for noticia in noticias:
+                link = noticia.get("link", "")
+                url_feed = noticia.get("url_feed", "")
+                categoria_url = categorizar_por_url(link, url_feed)
+                noticia["categoria_url"] = categoria_url
+                contadores[categoria_url] = contadores.get(categoria_url, 0) + 1
+            medicion.salida = len(noticias)
         
         # Guardar JSON actualizado
-        with open(archivo_salida, "w", encoding="utf-8") as f:
-            json.dump(data, f, ensure_ascii=False, indent=2)
+        with instrumentacion.medir("escribir", detalle=archivo_salida.name, entrada=len(noticias)):
+            with open(archivo_salida, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False, indent=2)
         
         logging.info(f"Archivo guardado: {archivo_salida.name}")
         
@@ -0,0 +1,162 @@
+"""
+Compactación de listas de noticias antes de armar los prompts de Gemini.
+- Colapsa titulares casi idénticos (la misma nota publicada por varios medios) en una
+  sola entrada que lista todas las fuentes.
+- Recorta cada resumen a un presupuesto de tokens, cortando en límite de palabra.
+- Estima los tokens antes y después y lo deja en el log.
+
+Cada entrada compactada conserva los índices (1-based) de las noticias originales
+que representa, para poder traducir de vuelta las respuestas del modelo.
+"""
+
+import html
+import re
+import unicodedata
+from typing import Dict, List
+import logging
+
+import planificador_gemini
+
+# Parámetros
+UMBRAL_DUPLICADO = 0.6       # Jaccard mínimo entre palabras de títulos para considerarlos la misma nota
+MIN_PALABRAS_TITULO = 3      # Títulos más cortos no se colapsan (demasiado ambiguos)
+TOKENS_MAX_RESUMEN = 60      # Presupuesto por resumen dentro del prompt
+
+PALABRAS_VACIAS = {
+    "a", "al", "ante", "con", "de", "del", "desde", "el", "en", "es", "la", "las", "lo", "los",
+    "no", "o", "para", "por", "que", "se", "sin", "su", "sus", "tras", "un", "una", "y",
+}
+
+
+def limpiar_texto(texto: str) -> str:
+    """
+    Quita etiquetas HTML, decodifica entidades (&quot;, &#8220;...) y normaliza espacios.
+    """
+    if not texto:
+        return ""
+    texto = re.sub(r'<[^>]+>', ' ', texto)
+    texto = html.unescape(texto)
+    return re.sub(r'\s+', ' ', texto).strip()
+
+
+def palabras_clave(titulo: str) -> frozenset:
+    """
+    Conjunto de palabras significativas de un título (minúsculas, sin acentos ni palabras vacías).
+    """
+    texto = unicodedata.normalize("NFKD", titulo.lower())
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return frozenset(p for p in re.findall(r"\w+", texto) if p not in PALABRAS_VACIAS)
+
+
+def recortar_a_tokens(texto: str, max_tokens: int) -> str:
+    """
+    Recorta un texto a aproximadamente max_tokens, sin cortar palabras.
+    """
+    max_caracteres = max_tokens * planificador_gemini.CARACTERES_POR_TOKEN
+    if len(texto) <= max_caracteres:
+        return texto
+    recortado = texto[:max_caracteres].rsplit(" ", 1)[0]
+    return recortado.rstrip(" ,;:.") + "…"
+
+
+def agrupar_casi_duplicados(noticias: List[Dict], umbral: float = UMBRAL_DUPLICADO) -> List[List[int]]:
+    """
+    Agrupa noticias con títulos casi idénticos. Cada grupo se compara contra su primer
+    título (el de la noticia que aparece primero, que queda como representante).
+
+    Returns:
+        Lista de grupos de índices 0-based, en el orden de la primera aparición
+    """
+    grupos = []
+    claves_grupos = []
+
+    for i, noticia in enumerate(noticias):
+        clave = palabras_clave(noticia.get('titulo', ''))
+        destino = None
+
+        if len(clave) >= MIN_PALABRAS_TITULO:
+            for g, clave_grupo in enumerate(claves_grupos):
+                if len(clave_grupo) < MIN_PALABRAS_TITULO:
+                    continue
+                if len(clave & clave_grupo) / len(clave | clave_grupo) >= umbral:
+                    destino = g
+                    break
+
+        if destino is None:
+            grupos.append([i])
+            claves_grupos.append(clave)
+        else:
+            grupos[destino].append(i)
+
+    return grupos
+
+
+def compactar_noticias(noticias: List[Dict], max_tokens_resumen: int = TOKENS_MAX_RESUMEN,
+                       etiqueta: str = "prompt") -> List[Dict]:
+    """
+    Compacta una lista de noticias para un prompt.
+
+    Args:
+        noticias: Noticias en el orden en que se van a presentar
+        max_tokens_resumen: Presupuesto de tokens por resumen (0 = no incluir resúmenes)
+        etiqueta: Nombre del prompt para el log
+
+    Returns:
+        Lista de entradas {'titulo', 'fuentes', 'fecha', 'categoria', 'resumen', 'indices'}
+        donde 'indices' son las posiciones 1-based de las noticias originales
+    """
+    entradas = []
+    for grupo in agrupar_casi_duplicados(noticias):
+        representante = noticias[grupo[0]]
+
+        fuentes = []
+        for i in grupo:
+            fuente = noticias[i].get('fuente', '')
+            if fuente and fuente not in fuentes:
+                fuentes.append(fuente)
+
+        resumen = ""
+        if max_tokens_resumen:
+            for i in grupo:
+                resumen = limpiar_texto(noticias[i].get('resumen', ''))
+                if resumen:
+                    break
+            resumen = recortar_a_tokens(resumen, max_tokens_resumen)
+
+        entradas.append({
+            'titulo': limpiar_texto(representante.get('titulo', '')) or "Sin título",
+            'fuentes': fuentes,
+            'fecha': representante.get('fecha_local', representante.get('fecha_original', '')),
+            'categoria': representante.get('categoria_url', ''),
+            'resumen': resumen,
+            'indices': [i + 1 for i in grupo],
+        })
+
+    tokens_antes = sum(
+        planificador_gemini.estimar_tokens(
+            f"{n.get('titulo', '')} {n.get('fuente', '')} {limpiar_texto(n.get('resumen', '')) if max_tokens_resumen else ''}"
+        )
+        for n in noticias
+    )
+    tokens_despues = sum(
+        planificador_gemini.estimar_tokens(f"{e['titulo']} {', '.join(e['fuentes'])} {e['resumen']}")
+        for e in entradas
+    )
+    logging.info(
+        f"  Compactación {etiqueta}: {len(noticias)} noticias → {len(entradas)} entradas, "
+        f"~{tokens_antes} → ~{tokens_despues} tokens"
+    )
+
+    return entradas
+
+
+def expandir_indices(indices_entradas: List[int], entradas: List[Dict]) -> List[int]:
+    """
+    Traduce índices de entradas compactadas (1-based, como los devuelve el modelo)
+    a los índices 1-based de las noticias originales. Ignora índices fuera de rango.
+    """
+    originales = []
+    for indice in indices_entradas:
+        if isinstance(indice, int) and 1 <= indice <= len(entradas):
+            originales.extend(entradas[indice - 1]['indices'])
+    return originales
@@ -0,0 +1,135 @@
+"""
+Compara dos reportes de rendimiento del pipeline (data/reportes/) paso por paso.
+
+Muestra tiempo real, CPU, items por segundo y memoria de cada etapa y sub-paso en
+ambas corridas y marca como regresión los pasos que tardaron más de --umbral por
+ciento (ignorando los que duran menos de --minimo segundos, que son ruido).
+
+Uso:
+    python scripts/comparar_reportes.py                       # Los dos reportes más recientes
+    python scripts/comparar_reportes.py ANTERIOR.json ACTUAL.json
+    python scripts/comparar_reportes.py --umbral 10 --fallar   # Código de salida 1 si hay regresiones
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+import logging
+
+from instrumentacion import REPORTES_DIR
+
+# Configuración de logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+UMBRAL_REGRESION = 20.0   # Por ciento de aumento del tiempo real
+MINIMO_SEGUNDOS = 0.05    # Pasos más cortos que esto no se evalúan
+
+
+def cargar_reporte(ruta: Path) -> Dict:
+    with open(ruta, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def reportes_recientes(cantidad: int = 2) -> List[Path]:
+    """Los últimos reportes guardados, del más antiguo al más nuevo."""
+    return sorted(REPORTES_DIR.glob("reporte_*.json"), key=lambda ruta: ruta.stat().st_mtime)[-cantidad:]
+
+
+def variacion(anterior: Optional[float], actual: Optional[float]) -> Optional[float]:
+    """Cambio porcentual, o None si falta alguno de los valores."""
+    if anterior is None or actual is None or anterior <= 0:
+        return None
+    return (actual - anterior) / anterior * 100
+
+
+def comparar(anterior: Dict, actual: Dict, umbral: float = UMBRAL_REGRESION,
+             minimo: float = MINIMO_SEGUNDOS) -> List[Dict]:
+    """
+    Compara los resúmenes por ruta de dos reportes.
+
+    Returns:
+        Una fila por ruta (en el orden del reporte actual, luego las que solo están en el
+        anterior) con los valores de ambos, la variación del tiempo y si es regresión
+    """
+    resumen_anterior = anterior.get('resumen', {})
+    resumen_actual = actual.get('resumen', {})
+    rutas = list(resumen_actual) + [ruta for ruta in resumen_anterior if ruta not in resumen_actual]
+
+    filas = []
+    for ruta in rutas:
+        previo = resumen_anterior.get(ruta, {})
+        nuevo = resumen_actual.get(ruta, {})
+        cambio = variacion(previo.get('segundos'), nuevo.get('segundos'))
+        filas.append({
+            'ruta': ruta,
+            'anterior': previo,
+            'actual': nuevo,
+            'variacion': cambio,
+            'regresion': (cambio is not None and cambio > umbral
+                          and max(previo['segundos'], nuevo['segundos']) >= minimo),
+        })
+    return filas
+
+
+def formatear(valor: Optional[float], formato: str) -> str:
+    """Valor con el formato de su columna, o un guion alineado si falta."""
+    if valor is None:
+        return "-".rjust(int(formato.lstrip("+").split(".")[0]))
+    return format(valor, formato)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Comparar dos reportes de rendimiento del pipeline")
+    parser.add_argument("reportes", nargs="*", type=Path, help="Reporte anterior y actual (por defecto, los dos últimos)")
+    parser.add_argument("--umbral", type=float, default=UMBRAL_REGRESION, help="Por ciento de aumento que cuenta como regresión")
+    parser.add_argument("--minimo", type=float, default=MINIMO_SEGUNDOS, help="Segundos mínimos para evaluar un paso")
+    parser.add_argument("--fallar", action="store_true", help="Salir con código 1 si hay regresiones")
+    args = parser.parse_args()
+
+    rutas = args.reportes or reportes_recientes()
+    if len(rutas) != 2:
+        logging.error(f"Se necesitan dos reportes (encontrados: {len(rutas)} en {REPORTES_DIR})")
+        sys.exit(2)
+
+    anterior, actual = cargar_reporte(rutas[0]), cargar_reporte(rutas[1])
+    filas = comparar(anterior, actual, args.umbral, args.minimo)
+
+    logging.info("=" * 70)
+    logging.info("COMPARACIÓN DE REPORTES DE RENDIMIENTO")
+    logging.info("=" * 70)
+    logging.info(f"Anterior: {rutas[0].name} ({anterior.get('segundos_totales', '?')}s)")
+    logging.info(f"Actual:   {rutas[1].name} ({actual.get('segundos_totales', '?')}s)")
+    if anterior.get('memoria_medida') != actual.get('memoria_medida'):
+        logging.warning("⚠️  Solo una de las corridas midió memoria: los tiempos no son del todo comparables")
+    perfiladas = set(anterior.get('etapas_perfiladas', [])) | set(actual.get('etapas_perfiladas', []))
+    if perfiladas:
+        logging.warning(f"⚠️  Etapas perfiladas (más lentas por el perfilador): {', '.join(sorted(perfiladas))}")
+
+    logging.info(f"{'paso':<42} {'seg ant':>8} {'seg act':>8} {'var %':>7} {'cpu act':>8} {'items/s':>9} {'MB act':>7}")
+    for fila in filas:
+        previo, nuevo = fila['anterior'], fila['actual']
+        marca = "  ✗ regresión" if fila['regresion'] else ""
+        logging.info(
+            f"{fila['ruta'][:42]:<42} {formatear(previo.get('segundos'), '8.3f')} "
+            f"{formatear(nuevo.get('segundos'), '8.3f')} {formatear(fila['variacion'], '+7.1f')} "
+            f"{formatear(nuevo.get('cpu_segundos'), '8.3f')} {formatear(nuevo.get('items_por_segundo'), '9.1f')} "
+            f"{formatear(nuevo.get('memoria_pico_mb'), '7.1f')}{marca}"
+        )
+
+    regresiones = [fila['ruta'] for fila in filas if fila['regresion']]
+    logging.info("=" * 70)
+    if regresiones:
+        logging.warning(f"⚠️  {len(regresiones)} pasos más lentos que el umbral ({args.umbral:.0f}%): {', '.join(regresiones)}")
+        if args.fallar:
+            sys.exit(1)
+    else:
+        logging.info(f"✓ Sin regresiones por encima del {args.umbral:.0f}%")
+
+
+if __name__ == "__main__":
+    main()
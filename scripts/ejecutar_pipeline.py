@@ -5,14 +5,43 @@ Ejecuta los scripts en el siguiente orden:
 2. normalizar_fechas.py - Normaliza fechas a UTC-3 y calcula horas_atras
 3. integrar_fuentes.py - Consolida todas las noticias en un dataset diario
 4. clasificar_categorias_url.py - Clasifica noticias y copia a frontend
+   + resumen_extractivo.py - Resúmenes por categoría sin IA (local, milisegundos)
 5. extraer_contenido.py - Extrae contenido completo (opcional, lento)
 6. generar_resumenes_gemini.py - Genera resúmenes por categoría con IA
 7. agrupar_temas.py - Detecta temas relevantes y mantiene histórico
+
+Las etapas se ejecutan con orquestador.py: cada una declara sus entradas y salidas,
+y se saltea si su huella (código + configuración + contenido de las entradas) no
+cambió desde la última vez. La extracción de feeds siempre se ejecuta en una corrida
+nueva.
+
+Uso:
+    python scripts/ejecutar_pipeline.py              # Corrida normal
+    python scripts/ejecutar_pipeline.py --reanudar   # Continuar una corrida que falló
+    python scripts/ejecutar_pipeline.py --forzar     # Ejecutar todas las etapas
+    python scripts/ejecutar_pipeline.py --sin-memoria  # Sin medir memoria (tracemalloc)
+    python scripts/ejecutar_pipeline.py --daemon --intervalo 10  # Residente, una corrida cada 10 min
+    python scripts/ejecutar_pipeline.py --perfilar normalizar_fechas,clasificar_categorias_url
+
+Cada corrida deja un reporte de tiempos, items y memoria por etapa y sub-paso en
+data/reportes/ (comparar dos corridas con scripts/comparar_reportes.py).
+
+En modo daemon el proceso queda residente y repite el pipeline cada --intervalo
+minutos. Entre corridas se mantienen los módulos importados, la sesión HTTP y las
+noticias de cada feed (descargas condicionales con ETag), y las cachés de fechas y de
+clasificación. SIGTERM termina el daemon después de la corrida en curso.
+
+--perfilar (o la variable PIPELINE_PERFILAR) guarda perfiles .pstats y pilas
+colapsadas de las etapas indicadas en data/perfiles/ (ver perfilado.py).
 """
 
+import argparse
+import signal
 import sys
+import threading
+import time
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timezone, timedelta
 import logging
 
 # Agregar el directorio actual al path para importar los módulos
@@ -24,6 +53,10 @@ import extraer_feeds
 import normalizar_fechas
 import integrar_fuentes
 import clasificar_categorias_url
+import resumen_extractivo
+import seleccion_noticias
+import orquestador
+import perfilado
 # NOTA: Estos módulos quedan disponibles pero
 # se han desactivado del pipeline principal
 # import extraer_contenido
@@ -36,10 +69,96 @@ logging.basicConfig(
     format="%(asctime)s - %(levelname)s - %(message)s"
 )
 
+INTERVALO_DAEMON_MINUTOS = 15
+
+
+def fecha_argentina() -> str:
+    """Fecha del dataset del día (UTC-3), la misma que usa integrar_fuentes."""
+    return datetime.now(timezone(timedelta(hours=-3))).strftime("%Y-%m-%d")
+
+
+def archivos_json(directorio: Path) -> list:
+    return sorted(directorio.glob("*.json"))
+
+
+def existentes(*rutas: Path) -> list:
+    return [ruta for ruta in rutas if ruta.exists()]
+
+
+def archivo_dataset() -> Path:
+    return integrar_fuentes.OUTPUT_DIR / f"noticias_{fecha_argentina()}.json"
 
-def ejecutar_pipeline_completo():
+
+def archivo_resumenes() -> Path:
+    return resumen_extractivo.OUTPUT_DIR / f"resumenes_{fecha_argentina()}.json"
+
+
+# Etapas del pipeline (ver orquestador.py). La clasificación reescribe el dataset
+# integrado, así que su huella usa las mismas entradas que la integración.
+ETAPAS = [
+    {
+        'nombre': 'extraer_feeds',
+        'titulo': 'EXTRACCIÓN DE NOTICIAS RSS',
+        'funcion': extraer_feeds.main,
+        'modulos': [extraer_feeds],
+        'entradas': lambda: [extraer_feeds.CONFIG_FILE],
+        'salidas': lambda: archivos_json(extraer_feeds.OUTPUT_DIR),
+        'externa': True,
+    },
+    {
+        'nombre': 'normalizar_fechas',
+        'titulo': 'NORMALIZACIÓN DE FECHAS',
+        'funcion': normalizar_fechas.main,
+        'modulos': [normalizar_fechas],
+        'entradas': lambda: archivos_json(normalizar_fechas.RAW_DIR),
+        'salidas': lambda: archivos_json(normalizar_fechas.NORMALIZED_DIR),
+        # horas_atras depende de la hora actual: se recalcula al menos una vez por hora
+        'config': lambda: datetime.now(normalizar_fechas.ARG_TIMEZONE).strftime("%Y-%m-%d %H"),
+        'depende_de': ['extraer_feeds'],
+    },
+    {
+        'nombre': 'integrar_fuentes',
+        'titulo': 'INTEGRACIÓN DE FUENTES',
+        'funcion': integrar_fuentes.main,
+        'modulos': [integrar_fuentes],
+        'entradas': lambda: archivos_json(integrar_fuentes.NORMALIZED_DIR),
+        'salidas': lambda: existentes(archivo_dataset(), integrar_fuentes.FRONTEND_DIR / archivo_dataset().name),
+        'config': fecha_argentina,
+        'depende_de': ['normalizar_fechas'],
+    },
+    {
+        'nombre': 'clasificar_categorias_url',
+        'titulo': 'CLASIFICACIÓN POR URL',
+        'funcion': clasificar_categorias_url.main,
+        'modulos': [integrar_fuentes, clasificar_categorias_url],
+        'entradas': lambda: archivos_json(integrar_fuentes.NORMALIZED_DIR),
+        'salidas': lambda: existentes(archivo_dataset(), clasificar_categorias_url.FRONTEND_DIR / archivo_dataset().name),
+        'config': fecha_argentina,
+        'depende_de': ['integrar_fuentes'],
+    },
+    {
+        # Reemplazan a los de Gemini mientras los módulos de IA estén desactivados.
+        # Un error acá no detiene el pipeline (las noticias ya están publicadas).
+        'nombre': 'resumen_extractivo',
+        'titulo': 'RESÚMENES POR CATEGORÍA (EXTRACTIVOS, SIN IA)',
+        'funcion': resumen_extractivo.main,
+        'modulos': [resumen_extractivo, seleccion_noticias],
+        'entradas': lambda: existentes(archivo_dataset()),
+        'salidas': lambda: existentes(archivo_resumenes(), resumen_extractivo.FRONTEND_DIR / archivo_resumenes().name),
+        'depende_de': ['clasificar_categorias_url'],
+        'critica': False,
+    },
+]
+
+
+def ejecutar_pipeline_completo(reanudar: bool = False, forzar: bool = False, medir_memoria: bool = True):
     """
     Ejecuta el pipeline completo de extracción, normalización, integración y clasificación de noticias.
+
+    Args:
+        reanudar: Continuar la última corrida desde la etapa que falló
+        forzar: Ejecutar todas las etapas aunque no hayan cambiado sus entradas
+        medir_memoria: Registrar el pico de memoria de cada paso en el reporte de rendimiento
     """
     inicio = datetime.now()
     
@@ -48,52 +167,10 @@ def ejecutar_pipeline_completo():
     logging.info(f"Inicio: {inicio.strftime('%Y-%m-%d %H:%M:%S')}")
     logging.info("=" * 70)
     
-    # PASO 1: Extraer feeds
-    logging.info("\n" + "=" * 70)
-    logging.info("PASO 1/7: EXTRACCIÓN DE NOTICIAS RSS")
-    logging.info("=" * 70)
-    try:
-        extraer_feeds.main()
-        logging.info("✓ Extracción completada exitosamente")
-    except Exception as e:
-        logging.error(f"✗ Error en la extracción: {str(e)}")
-        logging.error("Pipeline detenido por error en extracción")
-        return
-    
-    # PASO 2: Normalizar fechas
-    logging.info("\n" + "=" * 70)
-    logging.info("PASO 2/7: NORMALIZACIÓN DE FECHAS")
-    logging.info("=" * 70)
-    try:
-        normalizar_fechas.main()
-        logging.info("✓ Normalización completada exitosamente")
-    except Exception as e:
-        logging.error(f"✗ Error en la normalización: {str(e)}")
-        logging.error("Pipeline detenido por error en normalización")
-        return
-    
-    # PASO 3: Integrar fuentes
-    logging.info("\n" + "=" * 70)
-    logging.info("PASO 3/7: INTEGRACIÓN DE FUENTES")
-    logging.info("=" * 70)
-    try:
-        integrar_fuentes.main()
-        logging.info("✓ Integración completada exitosamente")
-    except Exception as e:
-        logging.error(f"✗ Error en la integración: {str(e)}")
-        logging.error("Pipeline detenido por error en integración")
-        return
-    
-    # PASO 4: Clasificar por URL
-    logging.info("\n" + "=" * 70)
-    logging.info("PASO 4/7: CLASIFICACIÓN POR URL")
-    logging.info("=" * 70)
-    try:
-        clasificar_categorias_url.main()
-        logging.info("✓ Clasificación completada exitosamente")
-    except Exception as e:
-        logging.error(f"✗ Error en la clasificación: {str(e)}")
-        logging.error("Pipeline detenido por error en clasificación")
+    resultados = orquestador.ejecutar_etapas(ETAPAS, reanudar=reanudar, forzar=forzar,
+                                             medir_memoria=medir_memoria)
+    if any(etapa.get('critica', True) and resultados.get(etapa['nombre']) not in ("ok", "sin_cambios")
+           for etapa in ETAPAS):
         return
 
     # PASO 5-7: Funcionalidades avanzadas (scraping + IA) DESACTIVADAS
@@ -119,6 +196,9 @@ def ejecutar_pipeline_completo():
     logging.info(f"Inicio: {inicio.strftime('%Y-%m-%d %H:%M:%S')}")
     logging.info(f"Fin: {fin.strftime('%Y-%m-%d %H:%M:%S')}")
     logging.info(f"Duración total: {duracion.total_seconds():.2f} segundos")
+    salteadas = [nombre for nombre, resultado in resultados.items() if resultado == "sin_cambios"]
+    if salteadas:
+        logging.info(f"Etapas sin cambios (salteadas): {', '.join(salteadas)}")
     logging.info("=" * 70)
     
     logging.info("\nArchivos generados:")
@@ -127,20 +207,78 @@ def ejecutar_pipeline_completo():
     logging.info("    • data/normalized/ - Noticias con fechas normalizadas")
     logging.info("    • data/noticias_YYYY-MM-DD.json - Dataset consolidado")
     logging.info("    • data/noticias_contenido_YYYY-MM-DD.json - Noticias con contenido completo")
-    logging.info("    • data/resumenes_YYYY-MM-DD.json - Resúmenes por categoría")
+    logging.info("    • data/resumenes_YYYY-MM-DD.json - Resúmenes por categoría (extractivos o de Gemini)")
     logging.info("    • data/temas/temas_YYYY-MM-DD.json - Temas detectados del día")
-    logging.info("    • data/temas/historico_temas.json - Histórico completo de temas")
+    logging.info("    • data/temas/historico_temas.db - Histórico completo de temas (SQLite)")
+    logging.info("    • data/pipeline_estado.json - Huellas de las etapas (para saltear o reanudar)")
+    logging.info("    • data/reportes/ - Reportes de rendimiento por corrida")
+    if perfilado.etapas_seleccionadas():
+        logging.info("    • data/perfiles/ - Perfiles de las etapas seleccionadas (.pstats y .collapsed)")
     logging.info("\n  Frontend (frontend/data/):")
     logging.info("    • noticias_YYYY-MM-DD.json - Noticias clasificadas (por fecha)")
+    logging.info("    • resumenes_YYYY-MM-DD.json - Resúmenes por categoría")
     logging.info("\n  Nota: módulos de IA y temas están desactivados en este modo")
 
 
+def ejecutar_daemon(intervalo_minutos: float = INTERVALO_DAEMON_MINUTOS, medir_memoria: bool = True):
+    """
+    Repite el pipeline cada `intervalo_minutos` (contados desde el inicio de cada corrida;
+    si una corrida tarda más, la siguiente empieza enseguida) hasta recibir SIGTERM.
+
+    Args:
+        intervalo_minutos: Minutos entre el inicio de dos corridas
+        medir_memoria: Registrar el pico de memoria de cada paso en el reporte de rendimiento
+    """
+    detener = threading.Event()
+
+    def al_recibir_sigterm(numero, frame):
+        logging.info("SIGTERM recibido: el daemon termina después de la corrida en curso")
+        detener.set()
+
+    signal.signal(signal.SIGTERM, al_recibir_sigterm)
+    logging.info(f"🔁 Modo daemon: una corrida cada {intervalo_minutos:g} minutos")
+
+    ciclo = 0
+    while not detener.is_set():
+        ciclo += 1
+        inicio = time.monotonic()
+        logging.info(f"🔁 Corrida {ciclo} del daemon")
+        try:
+            ejecutar_pipeline_completo(medir_memoria=medir_memoria)
+        except Exception as e:
+            # Un error no detiene el daemon: la próxima corrida vuelve a intentar
+            logging.error(f"✗ Error en la corrida {ciclo}: {str(e)}")
+
+        espera = max(0.0, intervalo_minutos * 60 - (time.monotonic() - inicio))
+        if not detener.is_set():
+            logging.info(f"⏳ Próxima corrida en {espera:.0f} segundos")
+        detener.wait(espera)
+
+    logging.info("Daemon detenido")
+
+
 def main():
     """
     Función principal que ejecuta el pipeline completo.
     """
+    parser = argparse.ArgumentParser(description="Pipeline completo de noticias")
+    parser.add_argument("--reanudar", action="store_true", help="Continuar la última corrida desde la etapa que falló")
+    parser.add_argument("--forzar", action="store_true", help="Ejecutar todas las etapas aunque no hayan cambiado")
+    parser.add_argument("--sin-memoria", action="store_true", help="No medir memoria en el reporte de rendimiento")
+    parser.add_argument("--daemon", action="store_true", help="Quedar residente y repetir el pipeline periódicamente")
+    parser.add_argument("--intervalo", type=float, default=INTERVALO_DAEMON_MINUTOS,
+                        help=f"Minutos entre corridas en modo daemon (default: {INTERVALO_DAEMON_MINUTOS})")
+    parser.add_argument("--perfilar", metavar="ETAPAS",
+                        help=f"Etapas a perfilar, separadas por coma o '{perfilado.TODAS}' (reemplaza a {perfilado.VARIABLE_ENTORNO})")
+    args = parser.parse_args()
+    if args.perfilar is not None:
+        perfilado.configurar(args.perfilar)
+
     try:
-        ejecutar_pipeline_completo()
+        if args.daemon:
+            ejecutar_daemon(args.intervalo, medir_memoria=not args.sin_memoria)
+        else:
+            ejecutar_pipeline_completo(reanudar=args.reanudar, forzar=args.forzar, medir_memoria=not args.sin_memoria)
     except KeyboardInterrupt:
         logging.warning("\nPipeline interrumpido por el usuario")
     except Exception as e:
@@ -0,0 +1,126 @@
+"""
+Historial de rendimiento de los extractores de contenido por dominio.
+Registra éxito y latencia de cada par (dominio, extractor) para que el scraper
+pruebe primero el extractor que mejor funciona en cada medio.
+
+Para que las tasas sean comparables, solo se registran intentos sobre páginas
+elegidas sin sesgo: en las rondas de exploración se prueban y registran todos los
+extractores; en las demás, solo el que fue primero (los de respaldo solo ven las
+páginas en las que falló el anterior, que son las más difíciles).
+"""
+
+import json
+import random
+import logging
+from pathlib import Path
+from typing import Dict, List, Tuple
+from urllib.parse import urlsplit
+
+# Rutas
+BASE_DIR = Path(__file__).parent.parent
+ARCHIVO_ESTADISTICAS = BASE_DIR / "data" / "cache" / "estadisticas_extractores.json"
+
+# Parámetros
+EPSILON_EXPLORACION = 0.1  # Probabilidad de probar un orden al azar (re-exploración)
+MIN_INTENTOS = 5           # Por debajo de esto el extractor se sigue explorando
+MAX_INTENTOS = 200         # Al superarlo se reducen los contadores a la mitad (olvida lo viejo)
+PESO_LATENCIA = 0.05       # Puntos de tasa de éxito que se resignan por cada segundo de latencia
+
+
+def obtener_dominio(url: str) -> str:
+    """
+    Dominio de una URL sin el prefijo www.
+    Ejemplo: "https://www.clarin.com/politica/nota.html" -> "clarin.com"
+    """
+    dominio = urlsplit(url).netloc.lower()
+    return dominio[4:] if dominio.startswith("www.") else dominio
+
+
+def cargar_estadisticas() -> Dict:
+    """
+    Carga el historial. Si no existe o está dañado, empieza vacío.
+
+    Returns:
+        Diccionario dominio -> extractor -> {'intentos', 'exitos', 'segundos'}
+    """
+    if not ARCHIVO_ESTADISTICAS.exists():
+        return {}
+
+    try:
+        with open(ARCHIVO_ESTADISTICAS, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception as e:
+        logging.warning(f"No se pudo leer {ARCHIVO_ESTADISTICAS.name}: {str(e)}")
+        return {}
+
+
+def guardar_estadisticas(estadisticas: Dict):
+    """
+    Guarda el historial en data/cache/.
+    """
+    ARCHIVO_ESTADISTICAS.parent.mkdir(parents=True, exist_ok=True)
+    with open(ARCHIVO_ESTADISTICAS, "w", encoding="utf-8") as f:
+        json.dump(estadisticas, f, ensure_ascii=False, indent=2)
+
+
+def registrar_intento(estadisticas: Dict, dominio: str, extractor: str, exito: bool, segundos: float):
+    """
+    Suma un intento de extracción al historial.
+    """
+    registro = estadisticas.setdefault(dominio, {}).setdefault(
+        extractor, {'intentos': 0, 'exitos': 0, 'segundos': 0.0}
+    )
+    registro['intentos'] += 1
+    registro['exitos'] += 1 if exito else 0
+    registro['segundos'] += segundos
+
+    # Decaimiento: si un medio cambia su HTML, el historial viejo no debe pesar para siempre
+    if registro['intentos'] > MAX_INTENTOS:
+        registro['intentos'] /= 2
+        registro['exitos'] /= 2
+        registro['segundos'] /= 2
+
+
+def calcular_puntaje(registro: Dict) -> float:
+    """
+    Puntaje de un extractor en un dominio: tasa de éxito suavizada menos una penalización por latencia.
+    """
+    intentos = registro['intentos']
+    tasa_exito = (registro['exitos'] + 1) / (intentos + 2)  # Suavizado de Laplace
+    latencia_media = registro['segundos'] / intentos if intentos else 0.0
+    return tasa_exito - PESO_LATENCIA * latencia_media
+
+
+def ordenar_extractores(estadisticas: Dict, dominio: str, nombres: List[str]) -> Tuple[List[str], bool]:
+    """
+    Decide en qué orden probar los extractores para un dominio y si la ronda es de exploración.
+    - Si algún extractor tiene pocos intentos, se explora (hay que conocerlos).
+    - Con probabilidad EPSILON_EXPLORACION se explora con un orden al azar.
+    - El resto de las veces, el de mejor puntaje va primero.
+
+    Returns:
+        Tupla (lista de nombres ordenada, explorar). En una ronda de exploración se
+        prueban todos los extractores y se registran todos los intentos.
+    """
+    registros = estadisticas.get(dominio, {})
+
+    sin_datos = [n for n in nombres if registros.get(n, {}).get('intentos', 0) < MIN_INTENTOS]
+    if sin_datos:
+        return sin_datos + [n for n in nombres if n not in sin_datos], True
+
+    if random.random() < EPSILON_EXPLORACION:
+        orden = list(nombres)
+        random.shuffle(orden)
+        return orden, True
+
+    return sorted(nombres, key=lambda n: calcular_puntaje(registros[n]), reverse=True), False
+
+
+def mejor_extractor(estadisticas: Dict, dominio: str) -> str:
+    """
+    Extractor con mejor puntaje para un dominio (para mostrar en el resumen).
+    """
+    registros = estadisticas.get(dominio, {})
+    if not registros:
+        return ""
+    return max(registros, key=lambda n: calcular_puntaje(registros[n]))
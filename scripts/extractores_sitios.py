@@ -0,0 +1,280 @@
+"""
+Extractores de contenido livianos, específicos para cada medio.
+Cada medio define con reglas simples dónde está el cuerpo de la nota, qué párrafos
+tomar y qué bloques descartar. Usa solo html.parser (biblioteca estándar) y deja de
+parsear apenas encuentra el cuerpo, por lo que es mucho más rápido que los
+extractores genéricos. Si las reglas no encuentran nada, devuelve None y el
+scraper sigue con newspaper3k / trafilatura.
+
+Sintaxis de selectores (subconjunto mínimo de CSS):
+    "div.body-nota"             etiqueta + clase
+    "section#cuerpo"            etiqueta + id
+    ".article-body"             solo clase
+    "[itemprop=articleBody]"    atributo = valor
+    "article"                   solo etiqueta
+"""
+
+import re
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Set
+
+# Mínimo de caracteres para considerar válido el cuerpo extraído
+MIN_CARACTERES = 200
+
+# Tamaño de los bloques con que se alimenta el parser (permite cortar temprano)
+TAMANO_BLOQUE = 32 * 1024
+
+# Reglas comunes a todos los medios
+CONTENEDORES_COMUNES = ["[itemprop=articleBody]"]
+ETIQUETAS_DESCARTAR = {"script", "style", "noscript", "aside", "figure", "figcaption", "form", "iframe", "button", "nav"}
+# Clases completas (se comparan con cada clase del elemento, no como subcadena:
+# "share" descarta class="share" pero no class="article-body-shared")
+CLASES_DESCARTAR = {
+    "newsletter", "newsletter-box", "relacionadas", "notas-relacionadas", "related", "related-news",
+    "related-articles", "publicidad", "banner", "ad-banner", "share", "share-buttons", "social-share",
+    "compartir", "suscripcion", "suscribite", "ad-slot", "tags", "article-tags", "nota-tags",
+}
+TEXTOS_DESCARTAR = [
+    r"^(mir[aá] tambi[eé]n|le[eé] tambi[eé]n|lea m[aá]s|segu[ií] leyendo|te puede interesar)\b",
+    r"^(suscribite|suscr[ií]base|recib[ií] las noticias)\b",
+    r"^(fuente|foto|video)\s*:",
+]
+
+# Reglas por medio (clave = dominio sin "www.")
+REGLAS_SITIOS = {
+    "clarin.com": {
+        "contenedores": ["div.body-nota", "div.StoryTextContainer", "article"],
+        "parrafos": ["p"],
+    },
+    "lanacion.com.ar": {
+        "contenedores": ["section.cuerpo__nota", "div.cuerpo__nota", "article"],
+        "parrafos": ["p.com-paragraph", "p"],
+    },
+    "infobae.com": {
+        "contenedores": ["div.body-article", "article"],
+        "parrafos": ["p.paragraph", "p"],
+    },
+    "pagina12.com.ar": {
+        "contenedores": ["div.article-main-content", "div.article-text", "article"],
+        "parrafos": ["p"],
+    },
+    "ambito.com": {
+        "contenedores": ["div.news-body", "div.article-body", "article"],
+        "parrafos": ["p"],
+        "descartar_clases": ["mas-noticias"],
+    },
+    "perfil.com": {
+        "contenedores": ["div.article__content", "div.news__body", "article"],
+        "parrafos": ["p"],
+    },
+    "minutouno.com": {
+        "contenedores": ["div.article-body", "div.news-body", "article"],
+        "parrafos": ["p"],
+    },
+    "iprofesional.com": {
+        "contenedores": ["div.article-body", "div.news-body", "article"],
+        "parrafos": ["p"],
+    },
+}
+
+ETIQUETAS_VACIAS = {"br", "img", "hr", "meta", "link", "input", "source", "wbr", "area", "base", "col", "embed", "param", "track"}
+
+
+def parsear_selector(selector: str) -> Dict:
+    """
+    Convierte un selector de texto en un diccionario {'tag', 'clase', 'id', 'atributo', 'valor'}.
+    """
+    resultado = {'tag': None, 'clase': None, 'id': None, 'atributo': None, 'valor': None}
+
+    coincidencia = re.fullmatch(r"\[([\w-]+)=([^\]]+)\]", selector)
+    if coincidencia:
+        resultado['atributo'], resultado['valor'] = coincidencia.group(1), coincidencia.group(2)
+        return resultado
+
+    coincidencia = re.fullmatch(r"([\w-]*)(?:\.([\w-]+))?(?:#([\w-]+))?", selector)
+    if not coincidencia:
+        raise ValueError(f"Selector no soportado: {selector}")
+
+    resultado['tag'] = coincidencia.group(1) or None
+    resultado['clase'] = coincidencia.group(2)
+    resultado['id'] = coincidencia.group(3)
+    return resultado
+
+
+def coincide(selector: Dict, tag: str, atributos: Dict[str, str]) -> bool:
+    """
+    Indica si un elemento (tag + atributos) cumple un selector parseado.
+    """
+    if selector['tag'] and selector['tag'] != tag:
+        return False
+    if selector['clase'] and selector['clase'] not in atributos.get('class', '').split():
+        return False
+    if selector['id'] and selector['id'] != atributos.get('id'):
+        return False
+    if selector['atributo'] and atributos.get(selector['atributo']) != selector['valor']:
+        return False
+    return True
+
+
+class ParserCuerpoNota(HTMLParser):
+    """
+    Recorre el HTML una sola vez y junta, para cada selector de contenedor,
+    los párrafos que aparecen dentro de él (sin los bloques descartados).
+    """
+
+    def __init__(self, contenedores: List[Dict], parrafos: List[Dict], clases_descartar: Set[str]):
+        super().__init__(convert_charrefs=True)
+        self.contenedores = contenedores
+        self.parrafos = parrafos
+        self.clases_descartar = clases_descartar
+        # Los contenedores de solo etiqueta ("article") son el último recurso: en una portada
+        # o en una nota con relacionadas también coinciden con bloques que no son el cuerpo
+        self.especificos = [bool(s['clase'] or s['id'] or s['atributo']) for s in contenedores]
+
+        # Pila de elementos abiertos: (tag, indices_contenedor, descarta, es_parrafo)
+        self.pila = []
+        self.profundidad_descarte = 0
+        self.contenedores_abiertos = [0] * len(contenedores)
+        self.contenedores_cerrados = [False] * len(contenedores)
+        self.textos = [[] for _ in contenedores]
+        self.parrafo_actual = None
+
+    def _es_descartable(self, tag: str, atributos: Dict[str, str]) -> bool:
+        if tag in ETIQUETAS_DESCARTAR:
+            return True
+        return any(clase in self.clases_descartar for clase in atributos.get('class', '').lower().split())
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ETIQUETAS_VACIAS:
+            if tag == "br" and self.parrafo_actual is not None:
+                self.parrafo_actual.append(" ")
+            return
+
+        atributos = {clave: valor or '' for clave, valor in attrs}
+        indices = [
+            i for i, selector in enumerate(self.contenedores)
+            if not self.contenedores_cerrados[i] and coincide(selector, tag, atributos)
+        ]
+        descarta = self._es_descartable(tag, atributos)
+        es_parrafo = (
+            self.parrafo_actual is None
+            and any(self.contenedores_abiertos)
+            and any(coincide(selector, tag, atributos) for selector in self.parrafos)
+        )
+
+        for i in indices:
+            self.contenedores_abiertos[i] += 1
+        if descarta:
+            self.profundidad_descarte += 1
+        if es_parrafo:
+            self.parrafo_actual = []
+
+        self.pila.append((tag, indices, descarta, es_parrafo))
+
+    def handle_endtag(self, tag):
+        # HTML mal cerrado: cerrar todo lo abierto hasta encontrar la etiqueta
+        if not any(elemento[0] == tag for elemento in self.pila):
+            return
+        while self.pila:
+            tag_abierto, indices, descarta, es_parrafo = self.pila.pop()
+            if es_parrafo:
+                self._cerrar_parrafo()
+            if descarta:
+                self.profundidad_descarte -= 1
+            for i in indices:
+                self.contenedores_abiertos[i] -= 1
+                if self.contenedores_abiertos[i] == 0:
+                    if self._largo(i) >= MIN_CARACTERES:
+                        self.contenedores_cerrados[i] = True
+                    else:
+                        # Coincidencia sin cuerpo (p.ej. un <article> de "notas relacionadas"): seguir buscando
+                        self.textos[i] = []
+            if tag_abierto == tag:
+                break
+
+    def handle_data(self, data):
+        if self.parrafo_actual is not None and self.profundidad_descarte == 0:
+            self.parrafo_actual.append(data)
+
+    def _cerrar_parrafo(self):
+        texto = re.sub(r"\s+", " ", "".join(self.parrafo_actual)).strip()
+        self.parrafo_actual = None
+
+        if not texto or any(re.search(patron, texto, re.IGNORECASE) for patron in TEXTOS_DESCARTAR):
+            return
+
+        for i, abiertos in enumerate(self.contenedores_abiertos):
+            if abiertos:
+                self.textos[i].append(texto)
+
+    def _largo(self, i: int) -> int:
+        return sum(len(parrafo) for parrafo in self.textos[i])
+
+    def mejor_texto(self) -> Optional[str]:
+        """
+        Texto del primer contenedor (en orden de prioridad) con contenido suficiente.
+        """
+        for i, parrafos in enumerate(self.textos):
+            if self._largo(i) >= MIN_CARACTERES:
+                return "\n\n".join(parrafos)
+        return None
+
+    def cuerpo_completo(self) -> bool:
+        """
+        Indica si algún contenedor específico (con clase, id o atributo) ya se cerró con
+        contenido suficiente (no hace falta seguir parseando el resto de la página).
+        Un contenedor de solo etiqueta no corta el parseo: más adelante puede estar el
+        contenedor específico del cuerpo, que tiene prioridad.
+        """
+        return any(cerrado and especifico
+                   for cerrado, especifico in zip(self.contenedores_cerrados, self.especificos))
+
+
+def _compilar_reglas(reglas: Dict) -> Dict:
+    return {
+        'contenedores': [parsear_selector(s) for s in CONTENEDORES_COMUNES + reglas['contenedores']],
+        'parrafos': [parsear_selector(s) for s in reglas.get('parrafos', ["p"])],
+        'descartar_clases': CLASES_DESCARTAR | set(reglas.get('descartar_clases', [])),
+    }
+
+
+REGLAS_COMPILADAS = {dominio: _compilar_reglas(reglas) for dominio, reglas in REGLAS_SITIOS.items()}
+
+
+def obtener_reglas(dominio: str) -> Optional[Dict]:
+    """
+    Reglas compiladas de un dominio (acepta subdominios, p.ej. "buenosaires.perfil.com").
+    """
+    while dominio:
+        if dominio in REGLAS_COMPILADAS:
+            return REGLAS_COMPILADAS[dominio]
+        if "." not in dominio:
+            break
+        dominio = dominio.split(".", 1)[1]
+    return None
+
+
+def tiene_reglas(dominio: str) -> bool:
+    """Indica si el medio tiene un extractor específico."""
+    return obtener_reglas(dominio) is not None
+
+
+def extraer_con_reglas(dominio: str, html: str) -> Optional[str]:
+    """
+    Extrae el cuerpo de la nota con las reglas del medio.
+
+    Returns:
+        Texto de la nota, o None si el medio no tiene reglas o los selectores no encontraron nada
+    """
+    reglas = obtener_reglas(dominio)
+    if not reglas:
+        return None
+
+    parser = ParserCuerpoNota(reglas['contenedores'], reglas['parrafos'], reglas['descartar_clases'])
+
+    for inicio in range(0, len(html), TAMANO_BLOQUE):
+        parser.feed(html[inicio:inicio + TAMANO_BLOQUE])
+        if parser.cuerpo_completo():
+            break
+
+    return parser.mejor_texto()
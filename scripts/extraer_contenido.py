@@ -4,24 +4,35 @@ Lee noticias desde frontend/data/ y genera un nuevo JSON con contenido completo.
 """
 
 import json
+import os
+import importlib.util
 import time
+import queue
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, Future, wait, as_completed, FIRST_COMPLETED
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Optional, List
+from typing import Dict, Optional, List, Tuple, TextIO
+from urllib.parse import urlsplit
 import logging
 
-try:
-    from newspaper import Article
-    NEWSPAPER_DISPONIBLE = True
-except ImportError:
-    NEWSPAPER_DISPONIBLE = False
+import requests
+
+import almacen_contenido
+import cache_contenido
+import estadisticas_extractores
+
+import extractores_sitios
+
+# newspaper3k y trafilatura son pesados de importar: se verifica que estén
+# instalados, pero se importan recién cuando un proceso de extracción los necesita
+NEWSPAPER_DISPONIBLE = importlib.util.find_spec("newspaper") is not None
+if not NEWSPAPER_DISPONIBLE:
     logging.warning("newspaper3k no está instalado")
 
-try:
-    import trafilatura
-    TRAFILATURA_DISPONIBLE = True
-except ImportError:
-    TRAFILATURA_DISPONIBLE = False
+TRAFILATURA_DISPONIBLE = importlib.util.find_spec("trafilatura") is not None
+if not TRAFILATURA_DISPONIBLE:
     logging.warning("trafilatura no está instalado")
 
 # Configuración de logging
@@ -34,24 +45,90 @@ logging.basicConfig(
 BASE_DIR = Path(__file__).parent.parent
 FRONTEND_DIR = BASE_DIR / "frontend" / "data"  # Para leer noticias
 DATA_DIR = BASE_DIR / "data"  # Para guardar contenido
+PROGRESO_DIR = DATA_DIR / "progreso"  # Logs NDJSON para retomar corridas interrumpidas
 
 # Parámetros
 CATEGORIAS_PROCESAR = ['internacional', 'politica', 'economia']  # Solo estas categorías
 MAX_NOTICIAS_EXTRAER = 150  # Límite total después de filtrar
-DELAY_ENTRE_REQUESTS = 1.5  # Segundos entre cada extracción
+DELAY_ENTRE_REQUESTS = 1.5  # Segundos entre descargas al mismo dominio
+NUM_DESCARGADORES = 8  # Hilos de descarga (I/O)
+NUM_PROCESOS_EXTRACCION = os.cpu_count() or 2  # Procesos para HTML -> texto (CPU)
+TAMANO_COLA_HTML = 16  # Páginas descargadas esperando extracción (backpressure)
+MAX_EXTRACCIONES_EN_CURSO = NUM_PROCESOS_EXTRACCION * 2  # Tareas en vuelo en el pool de procesos
 TIMEOUT = 10  # Segundos para timeout
+TTL_CACHE_HORAS = 24  # Vigencia del contenido cacheado antes de revalidar
+TTL_CACHE_FALLIDAS_HORAS = 6  # Vigencia de extracciones fallidas (se reintentan antes)
+MAX_DIAS_CACHE = 7  # Entradas más antiguas se eliminan de la caché
+USER_AGENT = "Mozilla/5.0 (compatible; Noticias360/1.0; +https://github.com/joaquin385/Noticias360)"
+
+
+def crear_sesion_http() -> requests.Session:
+    """
+    Crea una sesión HTTP reutilizable (mantiene conexiones abiertas por dominio).
+    """
+    sesion = requests.Session()
+    sesion.headers.update({
+        'User-Agent': USER_AGENT,
+        'Accept-Language': 'es-AR,es;q=0.9',
+    })
+    return sesion
+
+
+def descargar_html(url: str, sesion: requests.Session, entrada_cache: Optional[Dict] = None) -> Dict:
+    """
+    Descarga el HTML de la noticia una única vez.
+    El resultado se comparte entre todos los extractores.
+    
+    Si se pasa una entrada de caché vencida, hace un GET condicional
+    (If-None-Match / If-Modified-Since) para revalidarla.
+    
+    Returns:
+        Diccionario con 'html', 'no_modificado', 'etag' y 'last_modified'
+    """
+    resultado = {'html': None, 'no_modificado': False, 'etag': None, 'last_modified': None}
+    
+    cabeceras = {}
+    if entrada_cache and entrada_cache.get('contenido'):
+        if entrada_cache.get('etag'):
+            cabeceras['If-None-Match'] = entrada_cache['etag']
+        if entrada_cache.get('last_modified'):
+            cabeceras['If-Modified-Since'] = entrada_cache['last_modified']
+    
+    try:
+        respuesta = sesion.get(url, timeout=TIMEOUT, headers=cabeceras)
+        
+        if respuesta.status_code == 304:
+            resultado['no_modificado'] = True
+            return resultado
+        
+        respuesta.raise_for_status()
+        
+        # Los medios a veces no declaran charset: dejar que requests lo infiera
+        if not respuesta.encoding or respuesta.encoding.lower() == 'iso-8859-1':
+            respuesta.encoding = respuesta.apparent_encoding
+        
+        resultado['html'] = respuesta.text or None
+        resultado['etag'] = respuesta.headers.get('ETag')
+        resultado['last_modified'] = respuesta.headers.get('Last-Modified')
+        
+    except Exception as e:
+        logging.debug(f"Descarga falló para {url}: {str(e)}")
+    
+    return resultado
 
 
-def extraer_con_newspaper(url: str, idioma: str = 'es') -> Optional[str]:
+def extraer_con_newspaper(url: str, html: str, idioma: str = 'es') -> Optional[str]:
     """
-    Extrae contenido usando Newspaper3k.
+    Extrae contenido usando Newspaper3k a partir del HTML ya descargado.
     """
     if not NEWSPAPER_DISPONIBLE:
         return None
     
     try:
+        from newspaper import Article
+        
         article = Article(url, language=idioma)
-        article.download()
+        article.download(input_html=html)
         article.parse()
         
         if article.text and len(article.text) > 100:
@@ -63,19 +140,17 @@ def extraer_con_newspaper(url: str, idioma: str = 'es') -> Optional[str]:
         return None
 
 
-def extraer_con_trafilatura(url: str) -> Optional[str]:
+def extraer_con_trafilatura(url: str, html: str) -> Optional[str]:
     """
-    Extrae contenido usando Trafilatura.
+    Extrae contenido usando Trafilatura a partir del HTML ya descargado.
     """
     if not TRAFILATURA_DISPONIBLE:
         return None
     
     try:
-        downloaded = trafilatura.fetch_url(url)
-        if not downloaded:
-            return None
+        import trafilatura
         
-        contenido = trafilatura.extract(downloaded, include_comments=False)
+        contenido = trafilatura.extract(html, url=url, include_comments=False)
         
         if contenido and len(contenido) > 100:
             return contenido
@@ -86,10 +161,125 @@ def extraer_con_trafilatura(url: str) -> Optional[str]:
         return None
 
 
-def extraer_contenido_noticia(noticia: Dict) -> Dict:
+def extraer_con_reglas_sitio(url: str, html: str) -> Optional[str]:
     """
-    Extrae el contenido completo de una noticia.
-    Retorna una COPIA de la noticia con campos adicionales.
+    Extrae contenido con las reglas específicas del medio (ver extractores_sitios).
+    Devuelve None si el medio no tiene reglas o los selectores no encuentran el cuerpo.
+    """
+    try:
+        dominio = estadisticas_extractores.obtener_dominio(url)
+        return extractores_sitios.extraer_con_reglas(dominio, html)
+    except Exception as e:
+        logging.debug(f"Extractor del sitio falló para {url}: {str(e)}")
+        return None
+
+
+# Cadena de extractores: se prueban en orden sobre el mismo HTML
+EXTRACTORES = [
+    ("sitio", extraer_con_reglas_sitio),
+    ("newspaper3k", extraer_con_newspaper),
+    ("trafilatura", extraer_con_trafilatura),
+]
+
+
+def aplicar_contenido(noticia_con_contenido: Dict, contenido: Optional[str], metodo: Optional[str]):
+    """
+    Agrega a la noticia los campos de contenido extraído.
+    """
+    if contenido:
+        noticia_con_contenido['contenido_completo'] = contenido
+        noticia_con_contenido['contenido_extraido'] = True
+        noticia_con_contenido['metodo_extraccion'] = metodo
+        noticia_con_contenido['palabras_contenido'] = len(contenido.split())
+    else:
+        noticia_con_contenido['contenido_extraido'] = False
+        noticia_con_contenido['metodo_extraccion'] = metodo or "rss_only"
+
+
+def extraer_texto_html(url: str, html: str, orden: Optional[List[str]] = None,
+                       probar_todos: bool = False) -> Tuple[Optional[str], Optional[str], List[Tuple[str, bool, float]]]:
+    """
+    Convierte HTML en texto recorriendo la cadena de EXTRACTORES.
+    Se ejecuta dentro del pool de procesos (trabajo de CPU).
+    
+    Args:
+        url: URL de la noticia
+        html: HTML ya descargado
+        orden: Nombres de extractores en el orden a probar (por defecto, el de EXTRACTORES)
+        probar_todos: Seguir probando después del primer éxito (rondas de exploración);
+            el contenido devuelto sigue siendo el del primero que tuvo éxito
+    
+    Returns:
+        Tupla (contenido, metodo, intentos). contenido y metodo son None si ningún
+        extractor tuvo éxito; intentos es una lista de (extractor, exito, segundos)
+    """
+    extractores = dict(EXTRACTORES)
+    intentos = []
+    resultado, metodo = None, None
+    
+    for nombre_extractor in orden or list(extractores):
+        inicio = time.perf_counter()
+        contenido = extractores[nombre_extractor](url, html)
+        intentos.append((nombre_extractor, bool(contenido), time.perf_counter() - inicio))
+        if contenido and resultado is None:
+            resultado, metodo = contenido, nombre_extractor
+            if not probar_todos:
+                break
+    return resultado, metodo, intentos
+
+
+# Estado compartido por los hilos descargadores
+_hilos = threading.local()
+_lock_dominios = threading.Lock()
+_proximo_turno_por_dominio: Dict[str, float] = {}
+
+
+def obtener_sesion_hilo() -> requests.Session:
+    """
+    Devuelve la sesión HTTP del hilo actual (requests.Session no es thread-safe).
+    """
+    if not hasattr(_hilos, 'sesion'):
+        _hilos.sesion = crear_sesion_http()
+    return _hilos.sesion
+
+
+def esperar_turno_dominio(url: str):
+    """
+    Respeta DELAY_ENTRE_REQUESTS entre descargas al mismo dominio.
+    Dominios distintos se descargan en paralelo.
+    """
+    dominio = urlsplit(url).netloc.lower()
+    
+    with _lock_dominios:
+        ahora = time.monotonic()
+        turno = max(ahora, _proximo_turno_por_dominio.get(dominio, 0.0))
+        _proximo_turno_por_dominio[dominio] = turno + DELAY_ENTRE_REQUESTS
+    
+    if turno > ahora:
+        time.sleep(turno - ahora)
+
+
+def descargar_a_cola(tarea: Dict, cola_html: queue.Queue):
+    """
+    Trabajo de un hilo descargador: baja el HTML y lo deja en la cola acotada.
+    Si la cola está llena, put() bloquea hasta que la extracción libere lugar (backpressure).
+    """
+    try:
+        esperar_turno_dominio(tarea['url'])
+        tarea['descarga'] = descargar_html(tarea['url'], obtener_sesion_hilo(), entrada_cache=tarea['entrada'])
+    except Exception as e:
+        logging.debug(f"Descargador falló para {tarea['url']}: {str(e)}")
+        tarea['descarga'] = {'html': None, 'no_modificado': False, 'etag': None, 'last_modified': None}
+    finally:
+        cola_html.put(tarea)
+
+
+def resolver_desde_cache(noticia: Dict, conn_cache, estadisticas_cache: Dict) -> Tuple[Optional[Dict], Optional[Dict]]:
+    """
+    Intenta resolver una noticia sin tocar la red.
+    
+    Returns:
+        Tupla (noticia_resuelta, tarea_descarga). Exactamente uno de los dos es None.
     """
     # Crear copia para no modificar original
     noticia_con_contenido = noticia.copy()
@@ -99,37 +289,290 @@ def extraer_contenido_noticia(noticia: Dict) -> Dict:
     if not url:
         noticia_con_contenido['contenido_extraido'] = False
         noticia_con_contenido['metodo_extraccion'] = "sin_link"
-        return noticia_con_contenido
+        return noticia_con_contenido, None
     
-    contenido = None
-    metodo = None
+    url_canonica = cache_contenido.canonicalizar_url(url)
+    entrada = cache_contenido.obtener(conn_cache, url_canonica)
+    estadisticas_cache['consultas'] += 1
     
-    # Intentar con Newspaper3k
-    contenido = extraer_con_newspaper(url)
-    if contenido:
-        metodo = "newspaper3k"
+    # Acierto de caché vigente: no se toca la red
+    if entrada:
+        ttl = TTL_CACHE_HORAS if entrada.get('contenido') else TTL_CACHE_FALLIDAS_HORAS
+        if cache_contenido.esta_vigente(entrada, ttl):
+            estadisticas_cache['aciertos'] += 1
+            noticia_con_contenido['desde_cache'] = True
+            aplicar_contenido(noticia_con_contenido, entrada.get('contenido'), entrada.get('metodo'))
+            return noticia_con_contenido, None
     
-    # Si falla, intentar con Trafilatura
-    if not contenido:
-        contenido = extraer_con_trafilatura(url)
-        if contenido:
-            metodo = "trafilatura"
+    # Hay que descargar (condicional si hay entrada vencida)
+    tarea = {
+        'noticia': noticia_con_contenido,
+        'url': url,
+        'url_canonica': url_canonica,
+        'entrada': entrada,
+    }
+    return None, tarea
+
+
+def registrar_extraccion(tarea: Dict, contenido: Optional[str], metodo: Optional[str], conn_cache) -> Dict:
+    """
+    Guarda en caché el resultado de una extracción y completa la noticia.
+    """
+    noticia_con_contenido = tarea['noticia']
+    descarga = tarea['descarga']
+    
+    cache_contenido.guardar(
+        conn_cache, tarea['url_canonica'], tarea['url'], contenido, metodo,
+        etag=descarga['etag'], last_modified=descarga['last_modified']
+    )
+    aplicar_contenido(noticia_con_contenido, contenido, metodo)
     
-    # Agregar campos
+    titulo = noticia_con_contenido.get('titulo', '')[:50]
     if contenido:
-        noticia_con_contenido['contenido_completo'] = contenido
-        noticia_con_contenido['contenido_extraido'] = True
-        noticia_con_contenido['metodo_extraccion'] = metodo
-        noticia_con_contenido['palabras_contenido'] = len(contenido.split())
-        logging.info(f"  ✓ {metodo}: {noticia.get('titulo', '')[:50]}... ({noticia_con_contenido['palabras_contenido']} palabras)")
+        logging.info(f"  ✓ {metodo}: {titulo}... ({noticia_con_contenido['palabras_contenido']} palabras)")
     else:
-        noticia_con_contenido['contenido_extraido'] = False
-        noticia_con_contenido['metodo_extraccion'] = "rss_only"
-        logging.debug(f"  ✗ No extraído: {noticia.get('titulo', '')[:50]}...")
+        logging.debug(f"  ✗ No extraído: {titulo}...")
     
     return noticia_con_contenido
 
 
+def obtener_archivo_progreso(fecha_consolidacion: str) -> Path:
+    """
+    Ruta del log de progreso (NDJSON, append-only) de un día.
+    """
+    return PROGRESO_DIR / f"noticias_contenido_{fecha_consolidacion}.ndjson"
+
+
+def cargar_progreso(archivo_progreso: Path) -> Dict[str, Dict]:
+    """
+    Lee el log de progreso y devuelve las noticias completadas indexadas por link.
+    Si un link aparece varias veces gana la última línea. Las descargas fallidas
+    no cuentan como completadas (se reintentan) y una línea truncada por un
+    corte abrupto se ignora.
+    
+    Returns:
+        Diccionario link -> noticia con contenido
+    """
+    completadas = {}
+    
+    if not archivo_progreso.exists():
+        return completadas
+    
+    with open(archivo_progreso, "r", encoding="utf-8") as f:
+        for linea in f:
+            try:
+                noticia = json.loads(linea)
+            except json.JSONDecodeError:
+                logging.warning(f"Línea inválida en {archivo_progreso.name}, se ignora")
+                continue
+            
+            link = noticia.get('link')
+            if not link:
+                continue
+            if noticia.get('metodo_extraccion') == "descarga_fallida":
+                completadas.pop(link, None)
+            else:
+                completadas[link] = noticia
+    
+    return completadas
+
+
+def reparar_progreso(archivo_progreso: Path) -> bool:
+    """
+    Recorta el log de progreso hasta el último salto de línea, descartando la línea
+    que un corte abrupto pudo dejar a medias. Así la primera línea que se agregue al
+    retomar no queda pegada al fragmento.
+    
+    Returns:
+        True si había una línea incompleta y se descartó
+    """
+    if not archivo_progreso.exists():
+        return False
+    
+    with open(archivo_progreso, "rb+") as f:
+        tamano = f.seek(0, os.SEEK_END)
+        if tamano == 0:
+            return False
+        f.seek(-1, os.SEEK_END)
+        if f.read(1) == b"\n":
+            return False
+        
+        # Buscar el último salto de línea desde el final, por bloques
+        fin = tamano
+        while fin > 0:
+            inicio = max(0, fin - 65536)
+            f.seek(inicio)
+            posicion = f.read(fin - inicio).rfind(b"\n")
+            if posicion != -1:
+                f.truncate(inicio + posicion + 1)
+                break
+            fin = inicio
+        else:
+            f.truncate(0)
+    
+    logging.warning(f"Línea incompleta al final de {archivo_progreso.name}, se descarta")
+    return True
+
+
+def escribir_progreso(archivo: TextIO, noticia: Dict):
+    """
+    Agrega una noticia terminada al log de progreso y vacía el buffer,
+    así la línea sobrevive a un corte del proceso.
+    """
+    archivo.write(json.dumps(noticia, ensure_ascii=False) + "\n")
+    archivo.flush()
+
+
+def limpiar_progreso_antiguo(fecha_consolidacion: str):
+    """
+    Elimina los logs de progreso de otros días.
+    """
+    for archivo in PROGRESO_DIR.glob("noticias_contenido_*.ndjson"):
+        if archivo != obtener_archivo_progreso(fecha_consolidacion):
+            try:
+                archivo.unlink()
+                logging.info(f"Log de progreso antiguo eliminado: {archivo.name}")
+            except Exception as e:
+                logging.warning(f"No se pudo eliminar {archivo.name}: {str(e)}")
+
+
+def extraer_contenido_noticias(noticias: List[Dict], conn_cache, estadisticas_cache: Dict,
+                               archivo_progreso: Optional[TextIO] = None,
+                               rendimiento: Optional[Dict] = None) -> List[Dict]:
+    """
+    Extrae el contenido completo de una lista de noticias.
+    
+    Arquitectura:
+    - Caché: se resuelve en el hilo principal, sin tocar la red.
+    - Descarga (I/O): NUM_DESCARGADORES hilos bajan cada página una sola vez
+      y la dejan en una cola acotada (TAMANO_COLA_HTML).
+    - Extracción (CPU): el hilo principal toma HTML de la cola y lo envía a un
+      pool de procesos, con a lo sumo MAX_EXTRACCIONES_EN_CURSO tareas en vuelo.
+    Si el parseo va más lento que la descarga, la cola se llena y los descargadores
+    se bloquean, así la memoria queda acotada sin frenar el uso de todos los núcleos.
+    
+    Cada noticia terminada se agrega de inmediato al log de progreso (NDJSON),
+    así una interrupción no pierde lo ya extraído.
+    
+    El orden de los extractores se elige por dominio según el historial de
+    rendimiento (ver estadisticas_extractores): en las rondas de exploración se prueban
+    y registran todos los extractores, en las demás solo el primero.
+    
+    Args:
+        noticias: Noticias a procesar
+        conn_cache: Conexión a la caché de contenido
+        estadisticas_cache: Contadores de la corrida (se actualizan in-place)
+        archivo_progreso: Log NDJSON abierto en modo append (opcional)
+        rendimiento: Historial de rendimiento por (dominio, extractor); se actualiza in-place
+        
+    Returns:
+        Lista de noticias con contenido, en el mismo orden de entrada
+    """
+    total = len(noticias)
+    resultados: List[Optional[Dict]] = [None] * total
+    if rendimiento is None:
+        rendimiento = {}
+    nombres_extractores = [nombre for nombre, _ in EXTRACTORES]
+    tareas = []
+    
+    def completar(idx: int, noticia_con_contenido: Dict):
+        resultados[idx] = noticia_con_contenido
+        if archivo_progreso is not None:
+            escribir_progreso(archivo_progreso, noticia_con_contenido)
+    
+    # 1. Resolver todo lo posible desde la caché
+    for idx, noticia in enumerate(noticias):
+        resuelta, tarea = resolver_desde_cache(noticia, conn_cache, estadisticas_cache)
+        if resuelta is not None:
+            completar(idx, resuelta)
+        else:
+            tarea['idx'] = idx
+            tareas.append(tarea)
+    
+    logging.info(f"Resueltas desde caché: {total - len(tareas)}/{total}")
+    if not tareas:
+        return resultados
+    
+    logging.info(f"Descargando {len(tareas)} noticias ({NUM_DESCARGADORES} descargadores, {NUM_PROCESOS_EXTRACCION} procesos de extracción)")
+    
+    cola_html: queue.Queue = queue.Queue(maxsize=TAMANO_COLA_HTML)
+    en_curso: Dict[Future, Dict] = {}
+    completadas = 0
+    
+    def cerrar_extraccion(futuro: Future):
+        nonlocal completadas
+        tarea = en_curso.pop(futuro)
+        try:
+            contenido, metodo, intentos = futuro.result()
+        except Exception as e:
+            logging.debug(f"Extracción falló para {tarea['url']}: {str(e)}")
+            contenido, metodo, intentos = None, None, []
+        
+        # Fuera de la exploración solo el primer intento es una muestra sin sesgo
+        if not tarea['explorar']:
+            intentos = intentos[:1]
+        for nombre_extractor, exito, segundos in intentos:
+            estadisticas_extractores.registrar_intento(rendimiento, tarea['dominio'], nombre_extractor, exito, segundos)
+        completar(tarea['idx'], registrar_extraccion(tarea, contenido, metodo, conn_cache))
+        completadas += 1
+        if completadas % 20 == 0:
+            logging.info(f"Progreso: {completadas}/{len(tareas)} descargas procesadas")
+    
+    # spawn: los procesos no heredan los hilos descargadores ni la conexión a la caché
+    contexto = multiprocessing.get_context("spawn")
+    
+    with ProcessPoolExecutor(max_workers=NUM_PROCESOS_EXTRACCION, mp_context=contexto) as pool_extraccion, \
+         ThreadPoolExecutor(max_workers=NUM_DESCARGADORES, thread_name_prefix="descarga") as pool_descarga:
+        
+        # 2. Los descargadores alimentan la cola
+        for tarea in tareas:
+            pool_descarga.submit(descargar_a_cola, tarea, cola_html)
+        
+        # 3. El hilo principal consume la cola y despacha al pool de procesos
+        for _ in range(len(tareas)):
+            tarea = cola_html.get()
+            descarga = tarea['descarga']
+            
+            if descarga['no_modificado']:
+                estadisticas_cache['revalidadas'] += 1
+                cache_contenido.renovar(conn_cache, tarea['url_canonica'])
+                tarea['noticia']['desde_cache'] = True
+                aplicar_contenido(tarea['noticia'], tarea['entrada']['contenido'], tarea['entrada']['metodo'])
+                completar(tarea['idx'], tarea['noticia'])
+                continue
+            
+            estadisticas_cache['descargas'] += 1
+            tarea['noticia']['desde_cache'] = False
+            html = descarga.pop('html')
+            
+            if not html:
+                # Sin HTML no hay segundo intento de red; no se cachea (puede ser un error transitorio)
+                aplicar_contenido(tarea['noticia'], None, "descarga_fallida")
+                completar(tarea['idx'], tarea['noticia'])
+                continue
+            
+            # Backpressure: mientras el pool esté saturado no se sacan más páginas de la cola
+            while len(en_curso) >= MAX_EXTRACCIONES_EN_CURSO:
+                listos, _ = wait(list(en_curso), return_when=FIRST_COMPLETED)
+                for futuro in listos:
+                    cerrar_extraccion(futuro)
+            
+            tarea['dominio'] = estadisticas_extractores.obtener_dominio(tarea['url'])
+            # El extractor del sitio solo aplica a medios con reglas definidas
+            candidatos = [
+                nombre for nombre in nombres_extractores
+                if nombre != "sitio" or extractores_sitios.tiene_reglas(tarea['dominio'])
+            ]
+            orden, tarea['explorar'] = estadisticas_extractores.ordenar_extractores(rendimiento, tarea['dominio'], candidatos)
+            en_curso[pool_extraccion.submit(extraer_texto_html, tarea['url'], html, orden, tarea['explorar'])] = tarea
+        
+        # 4. Esperar las extracciones que quedan
+        for futuro in as_completed(list(en_curso)):
+            cerrar_extraccion(futuro)
+    
+    return resultados
+
+
 def main():
     logging.info("=" * 70)
     logging.info("EXTRACCIÓN DE CONTENIDO COMPLETO")
@@ -165,30 +608,73 @@ def main():
     
     logging.info(f"Noticias a procesar con scraping: {total}")
     logging.info(f"Categorías: {', '.join(CATEGORIAS_PROCESAR)}")
-    logging.info(f"Delay entre requests: {DELAY_ENTRE_REQUESTS}s")
-    logging.info(f"Tiempo estimado: ~{int(total * DELAY_ENTRE_REQUESTS / 60)} minutos\n")
+    logging.info(f"Delay entre requests al mismo dominio: {DELAY_ENTRE_REQUESTS}s\n")
     
-    # 4. Extraer contenido de cada noticia
-    noticias_con_contenido = []
-    exitosas = 0
-    fallidas = 0
+    # 4. Retomar lo que ya se completó en una corrida anterior del día
+    PROGRESO_DIR.mkdir(parents=True, exist_ok=True)
+    limpiar_progreso_antiguo(fecha_consolidacion)
+    archivo_progreso = obtener_archivo_progreso(fecha_consolidacion)
     
-    for idx, noticia in enumerate(noticias_a_procesar, 1):
-        if idx % 20 == 0:
-            logging.info(f"Progreso: {idx}/{total} ({int(idx/total*100)}%) - Exitosas: {exitosas}, Fallidas: {fallidas}")
-        
-        noticia_procesada = extraer_contenido_noticia(noticia)
-        noticias_con_contenido.append(noticia_procesada)
-        
-        if noticia_procesada.get('contenido_extraido'):
-            exitosas += 1
+    reparar_progreso(archivo_progreso)
+    completadas = cargar_progreso(archivo_progreso)
+    noticias_pendientes = [n for n in noticias_a_procesar if n.get('link', '') not in completadas]
+    if completadas:
+        logging.info(f"Retomando: {total - len(noticias_pendientes)}/{total} noticias ya completadas en {archivo_progreso.name}")
+    
+    # 5. Extraer contenido de las pendientes (cada resultado se agrega al log)
+    conn_cache = cache_contenido.get_connection()
+    eliminadas = cache_contenido.purgar(conn_cache, MAX_DIAS_CACHE)
+    if eliminadas:
+        logging.info(f"Caché: {eliminadas} entradas antiguas eliminadas")
+    estadisticas_cache = {'consultas': 0, 'aciertos': 0, 'revalidadas': 0, 'descargas': 0}
+    
+    rendimiento = estadisticas_extractores.cargar_estadisticas()
+    
+    try:
+        with open(archivo_progreso, "a", encoding="utf-8") as f_progreso:
+            pendientes_procesadas = extraer_contenido_noticias(
+                noticias_pendientes, conn_cache, estadisticas_cache, f_progreso, rendimiento
+            )
+    finally:
+        # Lo aprendido se conserva aunque la corrida se interrumpa
+        estadisticas_extractores.guardar_estadisticas(rendimiento)
+    
+    # 6. Armar el resultado final desde el log (respetando el orden original)
+    completadas = cargar_progreso(archivo_progreso)
+    sin_link = iter(n for n in pendientes_procesadas if not n.get('link'))
+    noticias_con_contenido = []
+    for noticia in noticias_a_procesar:
+        link = noticia.get('link', '')
+        if link in completadas:
+            noticias_con_contenido.append(completadas[link])
+        elif not link:
+            noticias_con_contenido.append(next(sin_link))
         else:
-            fallidas += 1
-        
-        # Delay entre requests para no sobrecargar servidores
-        time.sleep(DELAY_ENTRE_REQUESTS)
+            # Descarga fallida: queda solo con los datos del RSS
+            noticia_fallida = noticia.copy()
+            aplicar_contenido(noticia_fallida, None, "descarga_fallida")
+            noticias_con_contenido.append(noticia_fallida)
+    
+    exitosas = sum(1 for n in noticias_con_contenido if n.get('contenido_extraido'))
+    fallidas = total - exitosas
     
-    # 5. Crear nuevo archivo con contenido completo
+    conn_cache.close()
+    consultas_cache = estadisticas_cache['consultas']
+    aciertos_totales = estadisticas_cache['aciertos'] + estadisticas_cache['revalidadas']
+    estadisticas_cache['tasa_aciertos'] = round(aciertos_totales / consultas_cache * 100, 2) if consultas_cache > 0 else 0
+    
+    # 7. Separar los textos completos en el almacén comprimido (el JSON solo guarda el id)
+    contenidos = {}
+    for noticia in noticias_con_contenido:
+        texto = noticia.pop('contenido_completo', None)
+        if texto:
+            noticia['contenido_id'] = almacen_contenido.id_noticia(noticia['link'])
+            contenidos[noticia['contenido_id']] = texto
+    
+    almacen_contenido.escribir_almacen(fecha_consolidacion, contenidos)
+    almacen_contenido.limpiar_almacenes_antiguos()
+    
+    # 8. Crear nuevo archivo con contenido completo
     nombre_archivo = f"noticias_contenido_{fecha_consolidacion}.json"
     archivo_salida = DATA_DIR / nombre_archivo
     
@@ -200,6 +686,9 @@ def main():
         'noticias_con_contenido': exitosas,
         'noticias_sin_contenido': fallidas,
         'tasa_exito': round(exitosas / total * 100, 2) if total > 0 else 0,
+        'retomadas_de_progreso': total - len(noticias_pendientes),
+        'cache': estadisticas_cache,
+        'almacen_contenido': fecha_consolidacion,
         'noticias': noticias_con_contenido
     }
     
@@ -215,14 +704,17 @@ def main():
     archivo_latest = DATA_DIR / "noticias_contenido_latest.json"
     shutil.copy2(archivo_salida, archivo_latest)
     
-    # 6. Resumen final
+    # 9. Resumen final
     logging.info("\n" + "=" * 70)
     logging.info("EXTRACCIÓN COMPLETADA")
     logging.info("=" * 70)
     logging.info(f"✓ Contenido extraído: {exitosas}/{total} ({resultado['tasa_exito']}%)")
     logging.info(f"✗ Fallidas: {fallidas}")
+    logging.info(f"💾 Caché: {aciertos_totales}/{consultas_cache} aciertos ({estadisticas_cache['tasa_aciertos']}%) - "
+                 f"{estadisticas_cache['revalidadas']} revalidadas, {estadisticas_cache['descargas']} descargas")
     logging.info(f"📁 Archivo guardado en: data/{nombre_archivo}")
     logging.info(f"📁 Archivo latest: data/noticias_contenido_latest.json")
+    logging.info(f"📁 Textos completos: data/contenido/contenido_{fecha_consolidacion}.bin")
     
     # Estadísticas por método
     metodos = {}
@@ -234,6 +726,14 @@ def main():
     for metodo, cantidad in metodos.items():
         logging.info(f"  {metodo}: {cantidad}")
     
+    logging.info("\nExtractor preferido por dominio:")
+    for dominio in sorted(rendimiento):
+        mejor = estadisticas_extractores.mejor_extractor(rendimiento, dominio)
+        registro = rendimiento[dominio][mejor]
+        latencia_ms = registro['segundos'] / registro['intentos'] * 1000
+        tasa = registro['exitos'] / registro['intentos'] * 100
+        logging.info(f"  {dominio}: {mejor} ({tasa:.0f}% éxito, {latencia_ms:.0f} ms)")
+    
     logging.info("=" * 70)
 
 
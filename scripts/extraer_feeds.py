@@ -1,15 +1,24 @@
 """
 Script para extraer noticias de todas las fuentes RSS configuradas.
 Descarga los datos crudos y los guarda en archivos JSON separados por fuente.
+
+Las descargas usan una sesión HTTP compartida (conexiones abiertas por dominio) y
+recuerdan, mientras el proceso siga vivo, el ETag/Last-Modified y las noticias de
+cada feed: en el modo daemon de ejecutar_pipeline.py, un feed sin cambios responde
+304 (o el mismo contenido) y no se vuelve a parsear.
 """
 
 import feedparser
+import hashlib
 import json
 import os
+import requests
 from pathlib import Path
 from datetime import datetime
 import logging
 
+import instrumentacion
+
 # Configuración de logging
 logging.basicConfig(
     level=logging.INFO,
@@ -21,6 +30,24 @@ BASE_DIR = Path(__file__).parent.parent
 CONFIG_FILE = BASE_DIR / "feeds_config.json"
 OUTPUT_DIR = BASE_DIR / "data" / "raw"
 
+TIMEOUT = 20  # Segundos para descargar un feed
+USER_AGENT = "Mozilla/5.0 (compatible; Noticias360/1.0; +https://github.com/joaquin385/Noticias360)"
+
+# Estado que se mantiene entre extracciones del mismo proceso
+_sesion = None
+_cache_feeds = {}  # url -> {'etag', 'last_modified', 'hash', 'noticias'}
+
+
+def obtener_sesion() -> requests.Session:
+    """
+    Devuelve la sesión HTTP del proceso (la crea la primera vez).
+    """
+    global _sesion
+    if _sesion is None:
+        _sesion = requests.Session()
+        _sesion.headers.update({'User-Agent': USER_AGENT})
+    return _sesion
+
 
 def generar_nombre_archivo(fuente: str, categoria: str) -> str:
     """
@@ -56,8 +83,33 @@ def extraer_noticias_feed(feed_config: dict) -> list:
         logging.info(f"Descargando feed: {fuente} - {categoria}")
         logging.info(f"URL: {url}")
         
-        # Descargar y parsear el feed
-        feed = feedparser.parse(url)
+        # Descargar y parsear el feed (por separado, para medir cada parte).
+        # Si ya se descargó en este proceso, la descarga es condicional.
+        etiqueta = f"{fuente} - {categoria}"
+        anterior = _cache_feeds.get(url)
+        encabezados = {}
+        if anterior and anterior.get('etag'):
+            encabezados['If-None-Match'] = anterior['etag']
+        if anterior and anterior.get('last_modified'):
+            encabezados['If-Modified-Since'] = anterior['last_modified']
+
+        with instrumentacion.medir("descargar", detalle=etiqueta) as medicion:
+            respuesta = obtener_sesion().get(url, timeout=TIMEOUT, headers=encabezados)
+            if respuesta.status_code != 304:
+                respuesta.raise_for_status()
+            medicion.bytes = len(respuesta.content)
+
+        hash_contenido = hashlib.sha1(respuesta.content).hexdigest()
+        if anterior and (respuesta.status_code == 304 or anterior['hash'] == hash_contenido):
+            logging.info(f"Feed sin cambios desde la última descarga ({len(anterior['noticias'])} noticias)")
+            return anterior['noticias']
+
+        with instrumentacion.medir("parsear", detalle=etiqueta) as medicion:
+            feed = feedparser.parse(respuesta.content, response_headers={
+                'content-type': respuesta.headers.get('Content-Type', ''),
+                'content-location': respuesta.url,
+            })
+            medicion.salida = len(feed.entries)
         
         if feed.bozo:
             logging.warning(f"Feed puede tener errores de parsing: {feed.bozo_exception}")
@@ -117,6 +169,12 @@ def extraer_noticias_feed(feed_config: dict) -> list:
             
             noticias.append(noticia)
         
+        _cache_feeds[url] = {
+            'etag': respuesta.headers.get('ETag'),
+            'last_modified': respuesta.headers.get('Last-Modified'),
+            'hash': hash_contenido,
+            'noticias': noticias,
+        }
         return noticias
         
     except Exception as e:
@@ -155,8 +213,9 @@ def guardar_noticias(noticias: list, nombre_archivo: str):
     
     try:
         # Abrir en modo 'w' que sobrescribe automáticamente
-        with open(archivo_completo, "w", encoding="utf-8") as f:
-            json.dump(noticias, f, ensure_ascii=False, indent=2)
+        with instrumentacion.medir("escribir", detalle=nombre_archivo, entrada=len(noticias)):
+            with open(archivo_completo, "w", encoding="utf-8") as f:
+                json.dump(noticias, f, ensure_ascii=False, indent=2)
         
         logging.info(f"Archivo guardado: {archivo_completo.name} ({len(noticias)} noticias)")
             
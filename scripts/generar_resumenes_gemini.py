@@ -6,18 +6,17 @@ y genera un resumen consolidado usando la API de Gemini.
 
 import json
 import os
+from concurrent.futures import Future
 from pathlib import Path
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional, Tuple
 import logging
 
-try:
-    # Nuevo SDK oficial
-    from google import genai
-except ImportError:
-    logging.error("Error: google-genai no está instalado.")
-    logging.error("Instálalo con: pip install google-genai")
-    exit(1)
+import cache_llm
+import compactar_prompt
+import planificador_gemini
+import resumen_extractivo
+from seleccion_noticias import CATEGORIAS, filtrar_y_ordenar_noticias
 
 # Configuración de logging
 logging.basicConfig(
@@ -31,11 +30,18 @@ DATA_DIR = BASE_DIR / "data"
 FRONTEND_DIR = BASE_DIR / "frontend" / "data"
 OUTPUT_DIR = BASE_DIR / "data"
 
-# Categorías a procesar (en el mismo orden que el frontend)
-CATEGORIAS = ["internacional", "politica", "economia", "sociedad"]
+# Versión de crear_prompt_resumen: cambiarla invalida las respuestas cacheadas
+VERSION_PROMPT_RESUMEN = "categoria-v2"
 
-# Número de noticias por categoría
-NUM_NOTICIAS = 30
+# Resúmenes incrementales: se envían solo las noticias nuevas + el resumen anterior
+ARCHIVO_ESTADO = DATA_DIR / "cache" / "estado_resumenes.json"
+MAX_CORRIDAS_INCREMENTALES = 4   # Después de estas corridas incrementales se rehace completo
+MAX_PROPORCION_NUEVAS = 0.5      # Si cambió más de esta proporción de noticias, se rehace completo
+
+# Modo lote: una sola solicitud con respuesta JSON para todas las categorías (RESUMENES_EN_LOTE=0 lo desactiva)
+RESUMENES_EN_LOTE = os.getenv("RESUMENES_EN_LOTE", "1") != "0"
+CONFIG_RESPUESTA_JSON = {'response_mime_type': 'application/json'}
+MIN_CARACTERES_RESUMEN = 100     # Un resumen del lote más corto que esto se considera inválido
 
 
 def obtener_api_key() -> str:
@@ -79,113 +85,38 @@ def obtener_api_key() -> str:
     return api_key
 
 
-def intercalar_por_fuente(noticias: List[Dict]) -> List[Dict]:
-    """
-    Intercala noticias por fuente para evitar noticias consecutivas de la misma fuente.
-    Replica la lógica del frontend.
-    
-    Args:
-        noticias: Lista de noticias ya ordenadas por fecha
-        
-    Returns:
-        Lista de noticias intercaladas por fuente
-    """
-    # 1. Agrupar noticias por fuente
-    noticias_por_fuente = {}
-    for noticia in noticias:
-        fuente = noticia.get("fuente", "Sin fuente")
-        if fuente not in noticias_por_fuente:
-            noticias_por_fuente[fuente] = []
-        noticias_por_fuente[fuente].append(noticia)
-    
-    # 2. Cada grupo ya está ordenado por fecha (más recientes primero)
-    # 3. Intercalar usando algoritmo round-robin
-    resultado = []
-    fuentes = list(noticias_por_fuente.keys())
-    indices = {fuente: 0 for fuente in fuentes}
-    
-    hay_mas_noticias = True
-    while hay_mas_noticias:
-        hay_mas_noticias = False
-        
-        # Agregar una noticia de cada fuente en orden
-        for fuente in fuentes:
-            cola_fuente = noticias_por_fuente[fuente]
-            if indices[fuente] < len(cola_fuente):
-                resultado.append(cola_fuente[indices[fuente]])
-                indices[fuente] += 1
-                hay_mas_noticias = True
-    
-    return resultado
+NOMBRES_CATEGORIA = {
+    "internacional": "Internacional",
+    "politica": "Política",
+    "economia": "Economía",
+    "sociedad": "Sociedad"
+}
 
 
-def filtrar_y_ordenar_noticias(noticias: List[Dict], categoria: str, excluir_infobae: bool = False) -> List[Dict]:
+def formatear_noticias(noticias: List[Dict], etiqueta: str = "prompt") -> Tuple[str, int]:
     """
-    Filtra noticias por categoría y las ordena como en el frontend.
+    Lista numerada de noticias (título, fuentes, fecha y resumen) para los prompts.
+    Las notas casi idénticas de varios medios van en una sola entrada y los resúmenes
+    se recortan a un presupuesto de tokens (ver compactar_prompt).
     
-    Args:
-        noticias: Lista completa de noticias
-        categoria: Categoría a filtrar
-        excluir_infobae: Si True, excluye Infobae de la categoría internacional
-        
     Returns:
-        Lista de noticias filtradas y ordenadas
+        (texto, cantidad de entradas): la cantidad es la que ve el modelo, no len(noticias)
     """
-    # Filtrar por categoría
-    noticias_filtradas = []
-    for noticia in noticias:
-        categoria_noticia = noticia.get("categoria_url", "").lower().strip()
-        
-        # Si no tiene categoria_url, usar categoria como fallback
-        if not categoria_noticia or categoria_noticia == "":
-            categoria_noticia = noticia.get("categoria", "").lower().strip()
-            if categoria_noticia == "no categorizada" or categoria_noticia == "":
-                categoria_noticia = "otros"
-        
-        # Verificar si cumple la categoría
-        cumple_categoria = categoria_noticia == categoria.lower()
-        
-        # Excluir Infobae de internacional
-        if categoria.lower() == "internacional" and excluir_infobae:
-            if noticia.get("fuente") == "Infobae":
-                cumple_categoria = False
-        
-        if cumple_categoria:
-            noticias_filtradas.append(noticia)
-    
-    # Ordenar por fecha descendente
-    def obtener_fecha_sort(noticia: Dict) -> str:
-        fecha_local = noticia.get("fecha_local", "")
-        if fecha_local:
-            return fecha_local
-        return noticia.get("fecha_original", "")
+    texto_noticias = ""
+    entradas = compactar_prompt.compactar_noticias(noticias, etiqueta=etiqueta)
     
-    noticias_ordenadas = sorted(
-        noticias_filtradas,
-        key=obtener_fecha_sort,
-        reverse=True
-    )
-    
-    # Intercalar por fuente
-    noticias_intercaladas = intercalar_por_fuente(noticias_ordenadas)
-    
-    # Tomar solo las primeras NUM_NOTICIAS
-    return noticias_intercaladas[:NUM_NOTICIAS]
-
-
-def limpiar_html(texto: str) -> str:
-    """
-    Limpia HTML del texto.
-    """
-    if not texto:
-        return ""
+    for idx, entrada in enumerate(entradas, 1):
+        fuentes = ", ".join(entrada['fuentes']) or "Sin fuente"
+        
+        texto_noticias += f"{idx}. {entrada['titulo']}\n"
+        texto_noticias += f"   {'Fuentes' if len(entrada['fuentes']) > 1 else 'Fuente'}: {fuentes}\n"
+        if entrada['fecha']:
+            texto_noticias += f"   Fecha: {entrada['fecha']}\n"
+        if entrada['resumen']:
+            texto_noticias += f"   Resumen: {entrada['resumen']}\n"
+        texto_noticias += "\n"
     
-    # Remover etiquetas HTML básicas
-    import re
-    texto = re.sub(r'<[^>]+>', '', texto)
-    # Limpiar espacios múltiples
-    texto = re.sub(r'\s+', ' ', texto)
-    return texto.strip()
+    return texto_noticias, len(entradas)
 
 
 def crear_prompt_resumen(noticias: List[Dict], categoria: str) -> str:
@@ -199,34 +130,13 @@ def crear_prompt_resumen(noticias: List[Dict], categoria: str) -> str:
     Returns:
         Prompt completo para Gemini
     """
-    # Mapear nombres de categorías para el prompt
-    nombres_categoria = {
-        "internacional": "Internacional",
-        "politica": "Política",
-        "economia": "Economía",
-        "sociedad": "Sociedad"
-    }
-    
-    nombre_cat = nombres_categoria.get(categoria.lower(), categoria.capitalize())
+    nombre_cat = NOMBRES_CATEGORIA.get(categoria.lower(), categoria.capitalize())
     
-    # Construir el texto con todas las noticias
-    texto_noticias = f"Noticias de la categoría '{nombre_cat}':\n\n"
+    # Construir el texto con todas las noticias (la cantidad es la de entradas tras fusionar duplicadas)
+    listado, cantidad = formatear_noticias(noticias, etiqueta=categoria)
+    texto_noticias = f"Noticias de la categoría '{nombre_cat}':\n\n" + listado
     
-    for idx, noticia in enumerate(noticias, 1):
-        titulo = noticia.get("titulo", "Sin título")
-        resumen = limpiar_html(noticia.get("resumen", "Sin descripción"))
-        fuente = noticia.get("fuente", "Sin fuente")
-        fecha = noticia.get("fecha_local", noticia.get("fecha_original", ""))
-        
-        texto_noticias += f"{idx}. {titulo}\n"
-        texto_noticias += f"   Fuente: {fuente}\n"
-        if fecha:
-            texto_noticias += f"   Fecha: {fecha}\n"
-        if resumen:
-            texto_noticias += f"   Resumen: {resumen}\n"
-        texto_noticias += "\n"
-    
-    prompt = f"""Analiza las siguientes {len(noticias)} noticias de la categoría '{nombre_cat}' y crea un resumen ejecutivo consolidado.
+    prompt = f"""Analiza las siguientes {cantidad} noticias de la categoría '{nombre_cat}' y crea un resumen ejecutivo consolidado.
 
 El resumen debe:
 1. COMENZAR DIRECTAMENTE con el contenido, sin introducciones ni saludos.
@@ -249,31 +159,184 @@ Resumen ejecutivo:"""
     return prompt
 
 
-def generar_resumen_gemini(texto: str, api_key: str) -> str:
+def crear_prompt_resumen_incremental(resumen_anterior: str, noticias_nuevas: List[Dict], categoria: str,
+                                     cantidad_total: int) -> str:
     """
-    Genera un resumen usando Gemini AI.
+    Crea el prompt para actualizar el resumen de una categoría con las noticias nuevas
+    desde la corrida anterior (sin reenviar las que ya estaban resumidas).
     
     Args:
-        texto: Prompt con las noticias a resumir
-        api_key: API key de Gemini
+        resumen_anterior: Resumen ejecutivo de la corrida anterior
+        noticias_nuevas: Noticias que entraron al top de la categoría desde entonces
+        categoria: Nombre de la categoría
+        cantidad_total: Cantidad de noticias que cubre el resumen actualizado
         
     Returns:
-        Resumen generado por Gemini
+        Prompt completo para Gemini
     """
+    nombre_cat = NOMBRES_CATEGORIA.get(categoria.lower(), categoria.capitalize())
+    listado, cantidad = formatear_noticias(noticias_nuevas, etiqueta=f"{categoria} (incremental)")
+    
+    prompt = f"""Actualizá el resumen ejecutivo de la categoría '{nombre_cat}' integrando las {cantidad} noticias nuevas. El resumen debe seguir representando las {cantidad_total} noticias principales de la categoría.
+
+RESUMEN ANTERIOR:
+{resumen_anterior}
+
+NOTICIAS NUEVAS:
+{listado}
+El resumen actualizado debe:
+1. COMENZAR DIRECTAMENTE con el contenido, sin introducciones ni saludos.
+2. INTEGRAR las novedades en los párrafos de cada tema (no agregarlas como anexo al final).
+3. Actualizar cifras o hechos que hayan cambiado y quitar lo que perdió relevancia.
+4. Mantener párrafos separados por tema/área, cada uno con un punto clave al inicio cuando sea relevante.
+5. Máximo 300 palabras.
+6. Tono profesional, objetivo y periodístico. Sin lenguaje coloquial ni expresiones informales.
+
+Resumen ejecutivo actualizado:"""
+    
+    return prompt
+
+
+def cargar_estado_resumenes() -> Dict:
+    """
+    Carga el estado de la última corrida por categoría (ids resumidos, resumen y corridas incrementales).
+    """
+    if not ARCHIVO_ESTADO.exists():
+        return {}
+    
     try:
-        # Cliente del nuevo SDK
-        client = genai.Client(api_key=api_key)
-        # Modelo recomendado para resúmenes rápidos y baratos
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=[texto]
-        )
-        # El SDK expone .text con el texto agregado
-        return getattr(response, "text", "") or ""
-        
+        with open(ARCHIVO_ESTADO, "r", encoding="utf-8") as f:
+            return json.load(f)
     except Exception as e:
-        logging.error(f"Error al generar resumen con Gemini: {str(e)}")
-        raise
+        logging.warning(f"No se pudo leer {ARCHIVO_ESTADO.name}: {str(e)}")
+        return {}
+
+
+def guardar_estado_resumenes(estado: Dict):
+    """
+    Guarda el estado de los resúmenes en data/cache/.
+    """
+    ARCHIVO_ESTADO.parent.mkdir(parents=True, exist_ok=True)
+    with open(ARCHIVO_ESTADO, "w", encoding="utf-8") as f:
+        json.dump(estado, f, ensure_ascii=False, indent=2)
+
+
+def noticias_nuevas_para_incremental(estado_categoria: Dict, noticias_categoria: List[Dict],
+                                     ids_actuales: List[str], fecha_consolidacion: str) -> List[Dict]:
+    """
+    Decide si el resumen de la categoría puede actualizarse en modo incremental.
+    
+    Returns:
+        Lista de noticias nuevas (puede estar vacía si no cambió nada),
+        o None si corresponde rehacer el resumen completo
+    """
+    if not estado_categoria or not estado_categoria.get('resumen'):
+        return None
+    
+    # Refresco completo al cambiar de día o después de varias corridas incrementales
+    if estado_categoria.get('fecha') != fecha_consolidacion:
+        return None
+    if estado_categoria.get('corridas_incrementales', 0) >= MAX_CORRIDAS_INCREMENTALES:
+        return None
+    
+    ids_anteriores = set(estado_categoria.get('ids', []))
+    nuevas = [
+        noticia for noticia, id_noticia in zip(noticias_categoria, ids_actuales)
+        if id_noticia not in ids_anteriores
+    ]
+    
+    if len(nuevas) > MAX_PROPORCION_NUEVAS * len(noticias_categoria):
+        return None
+    
+    return nuevas
+
+
+def crear_prompt_resumen_lote(noticias_por_categoria: Dict[str, List[Dict]]) -> str:
+    """
+    Crea un único prompt que pide el resumen de varias categorías a la vez,
+    con las instrucciones una sola vez y la respuesta en JSON por categoría.
+    
+    Args:
+        noticias_por_categoria: Diccionario categoria -> noticias a resumir
+        
+    Returns:
+        Prompt completo para Gemini
+    """
+    secciones = ""
+    for categoria, noticias in noticias_por_categoria.items():
+        nombre_cat = NOMBRES_CATEGORIA.get(categoria.lower(), categoria.capitalize())
+        listado, cantidad = formatear_noticias(noticias, etiqueta=f"{categoria} (lote)")
+        secciones += f"### {categoria}\n"
+        secciones += f"Noticias de la categoría '{nombre_cat}' ({cantidad}):\n\n"
+        secciones += listado
+    
+    claves = ", ".join(noticias_por_categoria)
+    ejemplo = ",\n".join(f'  "{categoria}": "Resumen ejecutivo de {categoria}..."' for categoria in noticias_por_categoria)
+    
+    prompt = f"""Analiza las siguientes noticias, separadas por categoría, y crea un resumen ejecutivo consolidado PARA CADA CATEGORÍA.
+
+Cada resumen debe:
+1. COMENZAR DIRECTAMENTE con el contenido, sin introducciones ni saludos.
+2. Identificar los temas principales y agrupar noticias relacionadas.
+3. ESTRUCTURAR el contenido en párrafos separados por tema/área, cada uno con un punto clave al inicio cuando sea relevante.
+4. Destacar los eventos más importantes de forma concisa.
+5. Máximo 300 palabras.
+6. Tono profesional, objetivo y periodístico. Sin lenguaje coloquial ni expresiones informales.
+7. Usar saltos de línea (\\n) para separar temas distintos y mejorar la legibilidad.
+8. Usar solo las noticias de su propia categoría.
+
+FORMATO DE RESPUESTA (JSON únicamente, sin texto adicional), con exactamente estas claves: {claves}
+{{
+{ejemplo}
+}}
+
+{secciones}
+Respondé SOLO con el JSON:"""
+    
+    return prompt
+
+
+def validar_respuesta_lote(texto: str, categorias: List[str]) -> Optional[Dict[str, str]]:
+    """
+    Valida la respuesta del lote: JSON con un resumen no vacío para cada categoría pedida.
+    
+    Returns:
+        Diccionario categoria -> resumen, o None si la respuesta no es válida
+    """
+    if "```json" in texto:
+        texto = texto.split("```json")[1].split("```")[0]
+    elif "```" in texto:
+        texto = texto.split("```")[1].split("```")[0]
+    
+    try:
+        datos = json.loads(texto.strip())
+    except json.JSONDecodeError as e:
+        logging.warning(f"Lote: la respuesta no es JSON válido ({str(e)})")
+        return None
+    
+    if not isinstance(datos, dict):
+        logging.warning("Lote: la respuesta no es un objeto JSON")
+        return None
+    
+    resumenes = {}
+    for categoria in categorias:
+        resumen = datos.get(categoria)
+        if not isinstance(resumen, str) or len(resumen.strip()) < MIN_CARACTERES_RESUMEN:
+            logging.warning(f"Lote: falta el resumen de '{categoria}' o es demasiado corto")
+            return None
+        resumenes[categoria] = resumen.strip()
+    
+    return resumenes
+
+
+def enviar_resumen_individual(categoria: str, pendiente: Dict, planificador: planificador_gemini.PlanificadorGemini):
+    """
+    Encola el resumen de una sola categoría (armando el prompt completo si todavía no existe).
+    """
+    if pendiente['prompt'] is None:
+        pendiente['prompt'] = crear_prompt_resumen(pendiente['noticias'], categoria)
+    logging.info(f"  {categoria}: prompt de ~{planificador_gemini.estimar_tokens(pendiente['prompt'])} tokens")
+    pendiente['futuro'] = planificador.enviar(pendiente['prompt'])
 
 
 def cargar_json_noticias(fecha: str = None) -> Dict:
@@ -315,9 +378,12 @@ def main():
     # 1. Obtener API key
     try:
         api_key = obtener_api_key()
+        planificador_gemini.verificar_sdk()
         logging.info("✓ API key de Gemini configurada")
-    except ValueError as e:
+    except (ValueError, ImportError) as e:
         logging.error(str(e))
+        logging.warning("⚠️  Sin API key o sin google-genai: se generan resúmenes extractivos locales")
+        resumen_extractivo.main()
         return
     
     # 2. Cargar noticias
@@ -331,7 +397,14 @@ def main():
         return
     
     # 3. Generar resúmenes por categoría
+    # Las categorías son independientes: se encolan todas y el planificador
+    # las atiende en paralelo hasta donde lo permita la cuota.
+    planificador = planificador_gemini.PlanificadorGemini(api_key)
+    conn_cache = cache_llm.get_connection()
+    estadisticas_cache = cache_llm.nuevas_estadisticas()
+    estado = cargar_estado_resumenes()
     resumenes = {}
+    pendientes = {}
     
     for categoria in CATEGORIAS:
         logging.info("\n" + "=" * 70)
@@ -356,32 +429,136 @@ def main():
             continue
         
         logging.info(f"Filtradas {len(noticias_categoria)} noticias de {categoria}")
+        ids_actuales = cache_llm.ids_noticias(noticias_categoria)
+        estado_categoria = estado.get(categoria, {})
+        
+        # Si las noticias de la categoría no cambiaron desde la última corrida, reutilizar el resumen
+        clave = cache_llm.calcular_clave(
+            planificador.modelo, VERSION_PROMPT_RESUMEN, ids_actuales, extra=categoria
+        )
+        resumen_cacheado = cache_llm.consultar(conn_cache, clave, estadisticas_cache)
+        if resumen_cacheado:
+            logging.info(f"✓ Resumen de {categoria} tomado de la caché (noticias sin cambios)")
+            resumenes[categoria] = {
+                "resumen": resumen_cacheado,
+                "cantidad_noticias": len(noticias_categoria),
+                "fecha_generacion": datetime.now().isoformat(),
+                "categoria": categoria,
+                "modo": "cache"
+            }
+            estado[categoria] = dict(estado_categoria, ids=ids_actuales, resumen=resumen_cacheado,
+                                     fecha=fecha_consolidacion)
+            continue
         
-        # Crear prompt
-        prompt = crear_prompt_resumen(noticias_categoria, categoria)
+        # Modo incremental: solo las noticias nuevas + el resumen anterior
+        nuevas = noticias_nuevas_para_incremental(estado_categoria, noticias_categoria, ids_actuales, fecha_consolidacion)
         
-        # Generar resumen con Gemini
-        try:
+        if nuevas == []:
+            logging.info(f"✓ Sin noticias nuevas en {categoria}: se mantiene el resumen anterior")
+            resumenes[categoria] = {
+                "resumen": estado_categoria['resumen'],
+                "cantidad_noticias": len(noticias_categoria),
+                "fecha_generacion": datetime.now().isoformat(),
+                "categoria": categoria,
+                "modo": "sin_cambios"
+            }
+            estado[categoria] = dict(estado_categoria, ids=ids_actuales)
+            continue
+        
+        if nuevas:
+            modo = "incremental"
+            prompt = crear_prompt_resumen_incremental(estado_categoria['resumen'], nuevas, categoria, len(noticias_categoria))
+            logging.info(f"Actualizando resumen con {len(nuevas)} noticias nuevas (modo incremental)...")
+        else:
+            modo = "completo"
+            prompt = None  # Se arma más abajo: puede ir en el lote con las demás categorías
             logging.info("Generando resumen con Gemini AI...")
-            resumen_texto = generar_resumen_gemini(prompt, api_key)
+        
+        pendientes[categoria] = {
+            'noticias': noticias_categoria,
+            'cantidad_noticias': len(noticias_categoria),
+            'clave': clave,
+            'prompt': prompt,
+            'ids': ids_actuales,
+            'modo': modo,
+        }
+    
+    # Modo lote: todas las categorías que se resumen completas van en una sola solicitud
+    completas = [categoria for categoria, pendiente in pendientes.items() if pendiente['modo'] == "completo"]
+    futuro_lote = None
+    if RESUMENES_EN_LOTE and len(completas) > 1:
+        prompt_lote = crear_prompt_resumen_lote({categoria: pendientes[categoria]['noticias'] for categoria in completas})
+        logging.info(f"\nModo lote: {len(completas)} categorías en una sola solicitud (~{planificador_gemini.estimar_tokens(prompt_lote)} tokens)")
+        futuro_lote = planificador.enviar(prompt_lote, config=CONFIG_RESPUESTA_JSON)
+    
+    for categoria, pendiente in pendientes.items():
+        if futuro_lote and categoria in completas:
+            continue
+        enviar_resumen_individual(categoria, pendiente, planificador)
+    
+    if futuro_lote:
+        textos = None
+        try:
+            textos = validar_respuesta_lote(futuro_lote.result(), completas)
+        except Exception as e:
+            logging.error(f"Error en la solicitud del lote: {str(e)}")
+        
+        if textos:
+            logging.info(f"✓ Lote válido: {len(textos)} resúmenes en una sola respuesta")
+            tokens_por_categoria = planificador_gemini.estimar_tokens(prompt_lote) // len(completas)
+            for categoria in completas:
+                pendiente = pendientes[categoria]
+                pendiente['futuro'] = Future()
+                pendiente['futuro'].set_result(textos[categoria])
+                pendiente['tokens'] = tokens_por_categoria + planificador_gemini.estimar_tokens(textos[categoria])
+        else:
+            logging.warning("⚠️  Respuesta del lote inválida: se generan los resúmenes por categoría")
+            for categoria in completas:
+                enviar_resumen_individual(categoria, pendientes[categoria], planificador)
+    
+    for categoria, pendiente in pendientes.items():
+        cantidad_noticias = pendiente['cantidad_noticias']
+        try:
+            resumen_texto = pendiente['futuro'].result()
+            if resumen_texto:
+                cache_llm.guardar(conn_cache, pendiente['clave'], planificador.modelo, VERSION_PROMPT_RESUMEN,
+                                  pendiente['prompt'], resumen_texto, tokens=pendiente.get('tokens'))
+                
+                corridas_incrementales = 0
+                if pendiente['modo'] == "incremental":
+                    corridas_incrementales = estado.get(categoria, {}).get('corridas_incrementales', 0) + 1
+                estado[categoria] = {
+                    'fecha': fecha_consolidacion,
+                    'ids': pendiente['ids'],
+                    'resumen': resumen_texto,
+                    'corridas_incrementales': corridas_incrementales
+                }
             
             resumenes[categoria] = {
                 "resumen": resumen_texto,
-                "cantidad_noticias": len(noticias_categoria),
+                "cantidad_noticias": cantidad_noticias,
                 "fecha_generacion": datetime.now().isoformat(),
-                "categoria": categoria
+                "categoria": categoria,
+                "modo": pendiente['modo']
             }
             
-            logging.info(f"✓ Resumen generado para {categoria} ({len(resumen_texto)} caracteres)")
+            logging.info(f"✓ Resumen generado para {categoria} ({len(resumen_texto)} caracteres, {pendiente['modo']})")
             
         except Exception as e:
+            # Respaldo local: resumen extractivo (no se guarda en caché ni en el estado incremental)
             logging.error(f"Error al generar resumen para {categoria}: {str(e)}")
-            resumenes[categoria] = {
-                "resumen": f"Error al generar resumen: {str(e)}",
-                "cantidad_noticias": len(noticias_categoria),
-                "fecha_generacion": datetime.now().isoformat(),
-                "categoria": categoria
-            }
+            logging.warning(f"⚠️  Se usa el resumen extractivo local para {categoria}")
+            resumenes[categoria] = resumen_extractivo.resumir_categoria(pendiente['noticias'], categoria)
+    
+    guardar_estado_resumenes(estado)
+    planificador.cerrar()
+    logging.info(f"Gemini: {planificador.resumen_estadisticas()}")
+    logging.info(f"Caché LLM: {cache_llm.resumen_estadisticas(estadisticas_cache)}")
+    cache_llm.purgar(conn_cache)
+    conn_cache.close()
+    
+    # Mantener el orden de CATEGORIAS en el JSON
+    resumenes = {categoria: resumenes[categoria] for categoria in CATEGORIAS}
     
     # 4. Guardar resúmenes
     nombre_archivo = f"resumenes_{fecha_consolidacion}.json"
@@ -390,6 +567,7 @@ def main():
     resultado = {
         "fecha_consolidacion": fecha_consolidacion,
         "fecha_generacion": datetime.now().isoformat(),
+        "cache_llm": estadisticas_cache,
         "resumenes": resumenes
     }
     
@@ -0,0 +1,779 @@
+"""
+Histórico de temas en SQLite (reemplaza a data/temas/historico_temas.json).
+En lugar de cargar y reescribir todo el histórico en cada corrida:
+- Tabla `temas`: una fila por tema (estado, fechas, hash del resumen actual, tendencia, métricas;
+  estas dos las calcula metricas_temas.py para todos los temas a la vez).
+- Tabla `apariciones`: una fila por tema y día, con el hash del resumen y la máscara de
+  bits de las fuentes de ese día.
+- Tablas `resumenes` (cada texto una sola vez, por hash de contenido) y `fuentes` (cada
+  medio con su número de bit): el tamaño crece con los resúmenes distintos, no con días x temas.
+- Tabla `alias`: nombres normalizados alternativos de cada tema.
+- Tabla `tokens_tema`: índice invertido palabra -> temas, para buscar temas parecidos
+  sin comparar contra todo el histórico.
+- Tabla `noticias_tema`: noticias de cada tema de los últimos DIAS_INDICE_NOTICIAS días,
+  por tema (clave primaria) y por noticia (índice), para ver una historia completa
+  sin releer los temas_*.json de cada día.
+Índices por estado, fecha de última aparición y nombre normalizado. Cada tema procesado
+se escribe con su propia transacción y el cambio de estado de los temas es un UPDATE
+indexado. Si existe el JSON anterior, se migra automáticamente la primera vez.
+
+Uso (exportar el histórico al formato JSON anterior, para inspección; ver una historia):
+    python scripts/historico_temas_db.py --exportar historico.json
+    python scripts/historico_temas_db.py --historia TEMA_ID
+    python scripts/historico_temas_db.py --noticia https://...
+"""
+
+import argparse
+import hashlib
+import json
+import math
+import sqlite3
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+import logging
+
+import almacen_contenido
+
+# Rutas
+BASE_DIR = Path(__file__).parent.parent
+TEMAS_DIR = BASE_DIR / "data" / "temas"
+DB_PATH = TEMAS_DIR / "historico_temas.db"
+ARCHIVO_JSON_ANTERIOR = TEMAS_DIR / "historico_temas.json"
+
+# Parámetros
+DIAS_PARA_INACTIVO = 3       # Días sin aparecer para pasar a inactivo
+MAX_APARICIONES = 30         # Apariciones que se conservan por tema
+UMBRAL_SIMILITUD = 0.75      # Jaccard mínimo entre nombres normalizados para considerar el mismo tema
+TOPE_FRECUENCIA_TOKEN = 500   # Al ordenar palabras por frecuencia, más allá de este tope se consideran igual de comunes
+MAX_FUENTES = 63             # Bits de la máscara de fuentes (INTEGER de SQLite con signo)
+
+DIAS_INDICE_NOTICIAS = 30    # Días que se conservan en el índice noticia -> tema
+
+VERSION_ESQUEMA = 2          # PRAGMA user_version: 1 = resúmenes por hash y fuentes como máscara,
+                             # 2 = índice de noticias por tema
+
+
+ESQUEMA = '''
+    CREATE TABLE IF NOT EXISTS temas (
+        tema_id TEXT PRIMARY KEY,
+        tema TEXT NOT NULL,
+        tema_normalizado TEXT NOT NULL,
+        fecha_primer_deteccion TEXT NOT NULL,
+        fecha_ultima_aparicion TEXT NOT NULL,
+        dias_activo INTEGER DEFAULT 1,
+        dias_consecutivos INTEGER DEFAULT 1,
+        dias_inactivo INTEGER DEFAULT 0,
+        resumen_hash TEXT REFERENCES resumenes(hash),
+        categoria_principal TEXT,
+        total_noticias_acumuladas INTEGER DEFAULT 0,
+        estado TEXT NOT NULL DEFAULT 'activo',
+        tendencia TEXT DEFAULT 'nuevo',
+        metricas TEXT
+    );
+    CREATE INDEX IF NOT EXISTS idx_temas_estado ON temas(estado, fecha_ultima_aparicion);
+    CREATE INDEX IF NOT EXISTS idx_temas_ultima ON temas(fecha_ultima_aparicion);
+    CREATE INDEX IF NOT EXISTS idx_temas_normalizado ON temas(tema_normalizado);
+
+    CREATE TABLE IF NOT EXISTS apariciones (
+        tema_id TEXT NOT NULL REFERENCES temas(tema_id) ON DELETE CASCADE,
+        fecha TEXT NOT NULL,
+        cantidad_noticias INTEGER DEFAULT 0,
+        resumen_hash TEXT REFERENCES resumenes(hash),
+        fuentes_mascara INTEGER DEFAULT 0,
+        categoria_principal TEXT,
+        PRIMARY KEY (tema_id, fecha)
+    );
+    CREATE INDEX IF NOT EXISTS idx_apariciones_fecha ON apariciones(fecha);
+
+    CREATE TABLE IF NOT EXISTS resumenes (
+        hash TEXT PRIMARY KEY,
+        texto TEXT NOT NULL
+    ) WITHOUT ROWID;
+
+    CREATE TABLE IF NOT EXISTS fuentes (
+        fuente_id INTEGER PRIMARY KEY,
+        nombre TEXT NOT NULL UNIQUE
+    );
+
+    CREATE TABLE IF NOT EXISTS alias (
+        alias TEXT PRIMARY KEY,
+        tema_id TEXT NOT NULL REFERENCES temas(tema_id) ON DELETE CASCADE
+    );
+    CREATE INDEX IF NOT EXISTS idx_alias_tema ON alias(tema_id);
+
+    CREATE TABLE IF NOT EXISTS tokens_tema (
+        token TEXT NOT NULL,
+        tema_id TEXT NOT NULL REFERENCES temas(tema_id) ON DELETE CASCADE,
+        PRIMARY KEY (token, tema_id)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_tokens_tema ON tokens_tema(tema_id);
+
+    CREATE TABLE IF NOT EXISTS noticias_tema (
+        tema_id TEXT NOT NULL REFERENCES temas(tema_id) ON DELETE CASCADE,
+        noticia_id TEXT NOT NULL,
+        fecha TEXT NOT NULL,
+        titulo TEXT,
+        link TEXT,
+        fuente_id INTEGER REFERENCES fuentes(fuente_id),
+        fecha_publicacion TEXT,
+        PRIMARY KEY (tema_id, noticia_id)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_noticias_tema_noticia ON noticias_tema(noticia_id);
+    CREATE INDEX IF NOT EXISTS idx_noticias_tema_fecha ON noticias_tema(fecha)
+'''
+
+
+def get_connection() -> sqlite3.Connection:
+    """
+    Obtiene una conexión al histórico, creando las tablas si no existen,
+    actualizando el esquema de bases anteriores (PRAGMA user_version) y
+    migrando el historico_temas.json anterior si la base está vacía.
+    """
+    TEMAS_DIR.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(DB_PATH)
+    conn.row_factory = sqlite3.Row
+
+    version = conn.execute('PRAGMA user_version').fetchone()[0]
+    existente = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'temas'").fetchone()
+    if existente and version < 1:
+        migrar_esquema_compacto(conn)
+    conn.executescript(ESQUEMA)
+
+    vacia = conn.execute('SELECT COUNT(*) FROM temas').fetchone()[0] == 0
+    if vacia and ARCHIVO_JSON_ANTERIOR.exists():
+        migrar_desde_json(conn, ARCHIVO_JSON_ANTERIOR)
+    elif not vacia and conn.execute('SELECT 1 FROM tokens_tema LIMIT 1').fetchone() is None:
+        reconstruir_indice(conn)  # Bases creadas antes del índice invertido
+
+    if version < 2:
+        indexar_archivos_temas(conn)  # Noticias de los temas_*.json de los últimos días
+
+    conn.execute(f'PRAGMA user_version = {VERSION_ESQUEMA}')
+    conn.commit()
+    return conn
+
+
+def migrar_esquema_compacto(conn: sqlite3.Connection):
+    """
+    Pasa una base de la versión 0 (resumen y lista de fuentes en JSON repetidos en cada
+    aparición) a la versión 1: resúmenes guardados una sola vez por hash y fuentes como
+    máscara de bits. Se hace en una sola transacción.
+    """
+    with conn:
+        conn.execute('BEGIN')
+        temas = conn.execute('SELECT * FROM temas').fetchall()
+        apariciones = conn.execute('SELECT * FROM apariciones').fetchall()
+        conn.execute('DROP TABLE apariciones')
+        conn.execute('DROP TABLE temas')
+        for sentencia in ESQUEMA.split(';'):
+            conn.execute(sentencia)
+
+        for fila in temas:
+            datos = dict(fila)
+            datos['resumen_hash'] = guardar_resumen(conn, datos.pop('resumen_actual', ''))
+            columnas = ", ".join(datos)
+            conn.execute(
+                f'INSERT INTO temas ({columnas}) VALUES ({", ".join("?" * len(datos))})', tuple(datos.values())
+            )
+        for fila in apariciones:
+            aparicion = dict(fila)
+            aparicion['fuentes'] = json.loads(aparicion['fuentes']) if aparicion['fuentes'] else []
+            guardar_aparicion(conn, fila['tema_id'], aparicion)
+
+    logging.info(f"✓ Histórico compactado: {len(temas)} temas, {len(apariciones)} apariciones, "
+                 f"{conn.execute('SELECT COUNT(*) FROM resumenes').fetchone()[0]} resúmenes distintos")
+
+
+def migrar_desde_json(conn: sqlite3.Connection, archivo: Path) -> int:
+    """
+    Importa el historico_temas.json anterior y lo renombra a .migrado.
+
+    Returns:
+        Cantidad de temas migrados
+    """
+    try:
+        with open(archivo, "r", encoding="utf-8") as f:
+            historico = json.load(f)
+    except Exception as e:
+        logging.error(f"No se pudo leer {archivo.name} para migrarlo: {str(e)}")
+        return 0
+
+    temas = historico.get('temas', {})
+    with conn:
+        for tema_id, datos in temas.items():
+            conn.execute('''
+                INSERT OR REPLACE INTO temas
+                    (tema_id, tema, tema_normalizado, fecha_primer_deteccion, fecha_ultima_aparicion,
+                     dias_activo, dias_consecutivos, dias_inactivo, resumen_hash, categoria_principal,
+                     total_noticias_acumuladas, estado, tendencia, metricas)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                tema_id, datos.get('tema', ''), datos.get('tema_normalizado', ''),
+                datos.get('fecha_primer_deteccion', ''), datos.get('fecha_ultima_aparicion', ''),
+                datos.get('dias_activo', 1), datos.get('dias_consecutivos', 1), datos.get('dias_inactivo', 0),
+                guardar_resumen(conn, datos.get('resumen_actual', '')), datos.get('categoria_principal', 'otros'),
+                datos.get('total_noticias_acumuladas', 0), datos.get('estado', 'activo'),
+                datos.get('tendencia', 'nuevo'), json.dumps(datos.get('metricas', {}), ensure_ascii=False)
+            ))
+            # Las corridas repetidas del mismo día agregaban apariciones duplicadas: queda la última
+            for aparicion in datos.get('apariciones', []):
+                guardar_aparicion(conn, tema_id, aparicion)
+            indexar_tema(conn, tema_id, datos.get('tema_normalizado', ''))
+            for alias in datos.get('alias', []):
+                conn.execute('INSERT OR REPLACE INTO alias (alias, tema_id) VALUES (?, ?)', (alias, tema_id))
+
+    archivo.rename(archivo.with_suffix(".json.migrado"))
+    logging.info(f"✓ Histórico migrado a SQLite: {len(temas)} temas ({archivo.name} → {archivo.name}.migrado)")
+    return len(temas)
+
+
+def tokens_nombre(nombre_normalizado: str) -> List[str]:
+    """Palabras distintas de un nombre normalizado (las mismas que compara la similitud)."""
+    return sorted(set(nombre_normalizado.split()))
+
+
+def indexar_tema(conn: sqlite3.Connection, tema_id: str, nombre_normalizado: str):
+    """
+    Agrega (o rehace) las entradas del índice invertido de un tema.
+    No hace commit: se llama dentro de la transacción que crea el tema.
+    """
+    conn.execute('DELETE FROM tokens_tema WHERE tema_id = ?', (tema_id,))
+    conn.executemany(
+        'INSERT OR IGNORE INTO tokens_tema (token, tema_id) VALUES (?, ?)',
+        [(token, tema_id) for token in tokens_nombre(nombre_normalizado)]
+    )
+
+
+def reconstruir_indice(conn: sqlite3.Connection):
+    """Rehace el índice invertido completo a partir de la tabla de temas."""
+    with conn:
+        conn.execute('DELETE FROM tokens_tema')
+        for fila in conn.execute('SELECT tema_id, tema_normalizado FROM temas').fetchall():
+            indexar_tema(conn, fila['tema_id'], fila['tema_normalizado'])
+    logging.info("✓ Índice invertido de temas reconstruido")
+
+
+def hash_resumen(texto: str) -> str:
+    """Clave de contenido de un resumen."""
+    return hashlib.sha1(texto.encode("utf-8")).hexdigest()[:16]
+
+
+def guardar_resumen(conn: sqlite3.Connection, texto: Optional[str]) -> Optional[str]:
+    """
+    Guarda un resumen una sola vez (direccionado por contenido).
+
+    Returns:
+        Hash del resumen, o None si el texto está vacío
+    """
+    if not texto:
+        return None
+    clave = hash_resumen(texto)
+    conn.execute('INSERT OR IGNORE INTO resumenes (hash, texto) VALUES (?, ?)', (clave, texto))
+    return clave
+
+
+def id_fuente(conn: sqlite3.Connection, nombre: str) -> int:
+    """
+    Número (bit) de una fuente; cada medio nuevo recibe el siguiente.
+
+    Raises:
+        ValueError: si se supera MAX_FUENTES medios distintos
+    """
+    fila = conn.execute('SELECT fuente_id FROM fuentes WHERE nombre = ?', (nombre,)).fetchone()
+    if fila:
+        return fila['fuente_id']
+    fuente_id = conn.execute('SELECT COUNT(*) FROM fuentes').fetchone()[0]
+    if fuente_id >= MAX_FUENTES:
+        raise ValueError(f"El histórico admite hasta {MAX_FUENTES} fuentes distintas ('{nombre}' no entra)")
+    conn.execute('INSERT INTO fuentes (fuente_id, nombre) VALUES (?, ?)', (fuente_id, nombre))
+    return fuente_id
+
+
+def mascara_fuentes(conn: sqlite3.Connection, fuentes: List[str]) -> int:
+    """Máscara de bits de una lista de fuentes."""
+    mascara = 0
+    for nombre in set(fuentes):
+        mascara |= 1 << id_fuente(conn, nombre)
+    return mascara
+
+
+def nombres_fuentes(conn: sqlite3.Connection) -> Dict[int, str]:
+    """Bit -> nombre de cada fuente registrada."""
+    return {fila['fuente_id']: fila['nombre'] for fila in conn.execute('SELECT fuente_id, nombre FROM fuentes')}
+
+
+def fuentes_de_mascara(mascara: int, nombres: Dict[int, str]) -> List[str]:
+    """Lista ordenada de fuentes a partir de su máscara de bits."""
+    return sorted(nombre for bit, nombre in nombres.items() if mascara >> bit & 1)
+
+
+def guardar_aparicion(conn: sqlite3.Connection, tema_id: str, aparicion: Dict):
+    """Inserta (o reemplaza, si ya hay una del mismo día) una aparición de un tema."""
+    conn.execute('''
+        INSERT OR REPLACE INTO apariciones
+            (tema_id, fecha, cantidad_noticias, resumen_hash, fuentes_mascara, categoria_principal)
+        VALUES (?, ?, ?, ?, ?, ?)
+    ''', (
+        tema_id, aparicion.get('fecha', ''), aparicion.get('cantidad_noticias', 0),
+        guardar_resumen(conn, aparicion.get('resumen', '')),
+        mascara_fuentes(conn, aparicion.get('fuentes', [])), aparicion.get('categoria_principal', 'otros')
+    ))
+
+
+def id_noticia(noticia: Dict) -> str:
+    """Id de una noticia: el mismo del almacén de contenido (hash del título si no tiene link)."""
+    link = noticia.get('link', '')
+    if link:
+        return almacen_contenido.id_noticia(link)
+    return hashlib.sha1(noticia.get('titulo', '').encode("utf-8")).hexdigest()[:16]
+
+
+def indexar_noticias(conn: sqlite3.Connection, tema_id: str, fecha: str, noticias: List[Dict]):
+    """
+    Registra las noticias de un tema en el índice noticia -> tema. Una noticia ya
+    vista en el tema conserva la fecha en que apareció por primera vez; las del mismo
+    día se reemplazan (corridas repetidas). No hace commit.
+    """
+    conn.execute('DELETE FROM noticias_tema WHERE tema_id = ? AND fecha = ?', (tema_id, fecha))
+    for noticia in noticias:
+        fuente = noticia.get('fuente', '')
+        conn.execute('''
+            INSERT OR IGNORE INTO noticias_tema
+                (tema_id, noticia_id, fecha, titulo, link, fuente_id, fecha_publicacion)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        ''', (
+            tema_id, id_noticia(noticia), fecha, noticia.get('titulo', ''), noticia.get('link', ''),
+            id_fuente(conn, fuente) if fuente else None, noticia.get('fecha', '')
+        ))
+
+
+def indexar_archivos_temas(conn: sqlite3.Connection, dias: int = DIAS_INDICE_NOTICIAS) -> int:
+    """
+    Carga en el índice las noticias de los temas_YYYY-MM-DD.json de los últimos días
+    (bases anteriores al índice de noticias).
+
+    Returns:
+        Cantidad de archivos indexados
+    """
+    limite = (datetime.now() - timedelta(days=dias)).strftime("%Y-%m-%d")
+    archivos = [a for a in sorted(TEMAS_DIR.glob("temas_*.json")) if a.stem[len("temas_"):] >= limite]
+    if not archivos:
+        return 0
+
+    with conn:
+        for archivo in archivos:
+            try:
+                with open(archivo, "r", encoding="utf-8") as f:
+                    datos = json.load(f)
+            except Exception as e:
+                logging.warning(f"⚠️  No se pudo leer {archivo.name}: {str(e)}")
+                continue
+            fecha = datos.get('fecha', archivo.stem[len("temas_"):])
+            for tema in datos.get('temas', []):
+                if conn.execute('SELECT 1 FROM temas WHERE tema_id = ?', (tema.get('tema_id'),)).fetchone():
+                    indexar_noticias(conn, tema['tema_id'], fecha, tema.get('noticias', []))
+    logging.info(f"✓ Índice de noticias cargado desde {len(archivos)} archivos de temas")
+    return len(archivos)
+
+
+def fila_a_tema(fila: sqlite3.Row) -> Dict:
+    """Convierte una fila de `temas` en diccionario (con las métricas ya decodificadas)."""
+    tema = dict(fila)
+    tema.pop('resumen_hash', None)
+    tema['metricas'] = json.loads(tema['metricas']) if tema.get('metricas') else {}
+    return tema
+
+
+# Fila de `temas` con el texto del resumen actual resuelto
+SELECT_TEMA = '''
+    SELECT t.*, COALESCE(r.texto, '') AS resumen_actual
+    FROM temas t LEFT JOIN resumenes r ON r.hash = t.resumen_hash
+'''
+
+
+def obtener_tema(conn: sqlite3.Connection, tema_id: str) -> Optional[Dict]:
+    """
+    Busca un tema por id.
+
+    Returns:
+        Diccionario con la fila del tema o None si no existe
+    """
+    fila = conn.execute(SELECT_TEMA + ' WHERE t.tema_id = ?', (tema_id,)).fetchone()
+    return fila_a_tema(fila) if fila else None
+
+
+def obtener_apariciones(conn: sqlite3.Connection, tema_id: str, nombres: Optional[Dict[int, str]] = None) -> List[Dict]:
+    """Apariciones de un tema en orden cronológico (`nombres`: ver nombres_fuentes)."""
+    if nombres is None:
+        nombres = nombres_fuentes(conn)
+    filas = conn.execute('''
+        SELECT a.fecha, a.cantidad_noticias, COALESCE(r.texto, '') AS resumen, a.fuentes_mascara, a.categoria_principal
+        FROM apariciones a LEFT JOIN resumenes r ON r.hash = a.resumen_hash
+        WHERE a.tema_id = ? ORDER BY a.fecha
+    ''', (tema_id,)).fetchall()
+    apariciones = []
+    for fila in filas:
+        aparicion = dict(fila)
+        aparicion['fuentes'] = fuentes_de_mascara(aparicion.pop('fuentes_mascara') or 0, nombres)
+        apariciones.append(aparicion)
+    return apariciones
+
+
+def calcular_similitud_simple(texto1: str, texto2: str) -> float:
+    """
+    Calcula similitud básica entre dos textos (0.0 a 1.0).
+    Usa comparación de palabras en común (Jaccard similarity).
+
+    Args:
+        texto1: Primer texto normalizado
+        texto2: Segundo texto normalizado
+
+    Returns:
+        Valor de 0.0 (nada similar) a 1.0 (idéntico)
+    """
+    palabras1 = set(texto1.split())
+    palabras2 = set(texto2.split())
+
+    if not palabras1 or not palabras2:
+        return 0.0
+
+    comunes = palabras1.intersection(palabras2)
+    union = palabras1.union(palabras2)
+
+    return len(comunes) / len(union) if union else 0.0
+
+
+def buscar_tema(conn: sqlite3.Connection, nombre_normalizado: str,
+                umbral: float = UMBRAL_SIMILITUD) -> Optional[Tuple[str, str, str, float]]:
+    """
+    Busca un tema existente: primero por nombre normalizado exacto y por alias (búsquedas
+    indexadas), después por similitud de palabras solo contra los temas que comparten
+    palabras con el nombre (índice invertido `tokens_tema`).
+
+    Returns:
+        (tema_id, nombre del tema, tipo de match, similitud) o None si es un tema nuevo
+    """
+    fila = conn.execute(
+        'SELECT tema_id, tema FROM temas WHERE tema_normalizado = ? LIMIT 1', (nombre_normalizado,)
+    ).fetchone()
+    if fila:
+        return fila['tema_id'], fila['tema'], "exacto", 1.0
+
+    fila = conn.execute(
+        'SELECT t.tema_id, t.tema FROM alias a JOIN temas t ON t.tema_id = a.tema_id WHERE a.alias = ?',
+        (nombre_normalizado,)
+    ).fetchone()
+    if fila:
+        return fila['tema_id'], fila['tema'], "alias", 1.0
+
+    tokens = tokens_nombre(nombre_normalizado)
+    if not tokens:
+        return None
+
+    # Jaccard >= umbral exige compartir al menos umbral * |tokens| palabras, así que todo
+    # candidato tiene alguna de las |tokens| - minimo + 1 palabras menos frecuentes (filtro
+    # por prefijo): las palabras comunes no generan candidatos, solo se cuentan
+    minimo_comunes = max(1, math.ceil(umbral * len(tokens) - 1e-9))
+    marcadores = ",".join("?" * len(tokens))
+    # El orden no afecta el resultado, solo cuántos candidatos hay: alcanza con contar hasta un tope
+    frecuencias = {}
+    for token in tokens:
+        cantidad = conn.execute(
+            'SELECT COUNT(*) FROM (SELECT 1 FROM tokens_tema WHERE token = ? LIMIT ?)',
+            (token, TOPE_FRECUENCIA_TOKEN)
+        ).fetchone()[0]
+        if cantidad:
+            frecuencias[token] = cantidad
+    prefijo = sorted(tokens, key=lambda t: (frecuencias.get(t, 0), t))[:len(tokens) - minimo_comunes + 1]
+    prefijo = [t for t in prefijo if t in frecuencias]
+    if not prefijo:
+        return None
+
+    candidatos = conn.execute(f'''
+        SELECT t.tema_id, t.tema, c.comunes, c.cantidad
+        FROM (
+            SELECT p.tema_id,
+                   (SELECT COUNT(*) FROM tokens_tema x
+                    WHERE x.tema_id = p.tema_id AND x.token IN ({marcadores})) AS comunes,
+                   (SELECT COUNT(*) FROM tokens_tema x WHERE x.tema_id = p.tema_id) AS cantidad
+            FROM (SELECT DISTINCT tema_id FROM tokens_tema WHERE token IN ({",".join("?" * len(prefijo))})) p
+        ) c
+        JOIN temas t ON t.tema_id = c.tema_id
+        WHERE c.comunes >= ?
+        ORDER BY t.rowid
+    ''', (*tokens, *prefijo, minimo_comunes)).fetchall()
+
+    mejor = None
+    for fila in candidatos:
+        similitud = fila['comunes'] / (len(tokens) + fila['cantidad'] - fila['comunes'])
+        if similitud >= umbral and (mejor is None or similitud > mejor[3]):
+            mejor = (fila['tema_id'], fila['tema'], "similitud", similitud)
+    return mejor
+
+
+def actualizar_estados(conn: sqlite3.Connection, fecha_actual: str, dias_para_inactivo: int = DIAS_PARA_INACTIVO):
+    """
+    Marca como inactivos los temas activos que no aparecieron en los últimos días y
+    reactiva los inactivos que aparecen hoy. Solo toca las filas afectadas (índice por estado).
+
+    Args:
+        conn: Conexión al histórico
+        fecha_actual: Fecha de hoy en formato YYYY-MM-DD
+        dias_para_inactivo: Días sin aparecer para pasar a inactivo
+    """
+    limite = (datetime.strptime(fecha_actual, "%Y-%m-%d") - timedelta(days=dias_para_inactivo)).strftime("%Y-%m-%d")
+
+    with conn:
+        inactivos = conn.execute('''
+            SELECT tema_id, tema, CAST(julianday(?) - julianday(fecha_ultima_aparicion) AS INTEGER) AS dias_inactivo
+            FROM temas WHERE estado = 'activo' AND fecha_ultima_aparicion <= ?
+        ''', (fecha_actual, limite)).fetchall()
+        conn.executemany(
+            "UPDATE temas SET estado = 'inactivo', dias_inactivo = ? WHERE tema_id = ?",
+            [(fila['dias_inactivo'], fila['tema_id']) for fila in inactivos]
+        )
+
+        reactivados = conn.execute(
+            "SELECT tema_id, tema FROM temas WHERE estado = 'inactivo' AND fecha_ultima_aparicion = ?",
+            (fecha_actual,)
+        ).fetchall()
+        conn.executemany(
+            "UPDATE temas SET estado = 'reactivado', dias_inactivo = 0 WHERE tema_id = ?",
+            [(fila['tema_id'],) for fila in reactivados]
+        )
+
+    for fila in inactivos:
+        logging.info(f"  ⏸️  Tema inactivo: '{fila['tema']}' ({fila['dias_inactivo']} días sin aparecer)")
+    for fila in reactivados:
+        logging.info(f"  ▶️  Tema reactivado: '{fila['tema']}'")
+
+
+def registrar_aparicion(conn: sqlite3.Connection, tema_id: str, nombre_tema: str, nombre_normalizado: str,
+                        fecha: str, cantidad_noticias: int, resumen: str, fuentes: List[str],
+                        categoria_principal: str, noticias: Optional[List[Dict]] = None) -> Dict:
+    """
+    Registra la aparición de hoy de un tema (nuevo o recurrente) y sus noticias en el
+    índice noticia -> tema. Una nueva corrida del mismo día reemplaza la aparición del
+    día en lugar de sumar otra. La tendencia y las métricas se recalculan para todos los
+    temas juntos con metricas_temas.actualizar_metricas.
+
+    Returns:
+        Diccionario con la fila actualizada del tema
+    """
+    aparicion = {
+        'fecha': fecha,
+        'cantidad_noticias': cantidad_noticias,
+        'resumen': resumen,
+        'fuentes': fuentes,
+        'categoria_principal': categoria_principal
+    }
+    existente = obtener_tema(conn, tema_id)
+
+    with conn:
+        if existente is None:
+            conn.execute('''
+                INSERT INTO temas
+                    (tema_id, tema, tema_normalizado, fecha_primer_deteccion, fecha_ultima_aparicion,
+                     dias_activo, dias_consecutivos, dias_inactivo, resumen_hash, categoria_principal,
+                     total_noticias_acumuladas, estado, tendencia, metricas)
+                VALUES (?, ?, ?, ?, ?, 1, 1, 0, ?, ?, 0, 'activo', 'nuevo', NULL)
+            ''', (tema_id, nombre_tema, nombre_normalizado, fecha, fecha, guardar_resumen(conn, resumen), categoria_principal))
+            indexar_tema(conn, tema_id, nombre_normalizado)
+            dias_activo, dias_consecutivos = 1, 1
+        else:
+            ultima = existente['fecha_ultima_aparicion']
+            dias_activo = existente['dias_activo']
+            dias_consecutivos = existente['dias_consecutivos']
+            if ultima < fecha:
+                dias_activo += 1
+                ayer = (datetime.strptime(fecha, "%Y-%m-%d") - timedelta(days=1)).strftime("%Y-%m-%d")
+                dias_consecutivos = dias_consecutivos + 1 if ultima == ayer else 1
+
+        guardar_aparicion(conn, tema_id, aparicion)
+        if noticias is not None:
+            indexar_noticias(conn, tema_id, fecha, noticias)
+        total = conn.execute(
+            'SELECT SUM(cantidad_noticias) FROM apariciones WHERE tema_id = ?', (tema_id,)
+        ).fetchone()[0]
+
+        conn.execute('''
+            UPDATE temas
+            SET fecha_ultima_aparicion = ?, dias_activo = ?, dias_consecutivos = ?, dias_inactivo = 0,
+                resumen_hash = ?, categoria_principal = ?, estado = 'activo', total_noticias_acumuladas = ?
+            WHERE tema_id = ?
+        ''', (
+            max(fecha, existente['fecha_ultima_aparicion']) if existente else fecha,
+            dias_activo, dias_consecutivos, hash_resumen(resumen) if resumen else None, categoria_principal,
+            total or 0, tema_id
+        ))
+
+    return obtener_tema(conn, tema_id)
+
+
+def limpiar_apariciones_antiguas(conn: sqlite3.Connection, max_apariciones: int = MAX_APARICIONES) -> int:
+    """
+    Conserva solo las últimas max_apariciones apariciones de cada tema.
+
+    Returns:
+        Cantidad de apariciones eliminadas
+    """
+    with conn:
+        cursor = conn.execute('''
+            DELETE FROM apariciones WHERE rowid IN (
+                SELECT rowid FROM (
+                    SELECT rowid, ROW_NUMBER() OVER (PARTITION BY tema_id ORDER BY fecha DESC) AS orden
+                    FROM apariciones
+                ) WHERE orden > ?
+            )
+        ''', (max_apariciones,))
+        # Resúmenes que ya no usa ninguna aparición ni ningún tema
+        huerfanos = conn.execute('''
+            DELETE FROM resumenes WHERE hash NOT IN (
+                SELECT resumen_hash FROM apariciones WHERE resumen_hash IS NOT NULL
+                UNION SELECT resumen_hash FROM temas WHERE resumen_hash IS NOT NULL
+            )
+        ''').rowcount
+    if cursor.rowcount:
+        logging.info(f"  🗑️  Limpiadas {cursor.rowcount} apariciones antiguas (se conservan las últimas {max_apariciones} por tema) "
+                     f"y {huerfanos} resúmenes sin uso")
+    return cursor.rowcount
+
+
+def limpiar_noticias_antiguas(conn: sqlite3.Connection, fecha_actual: str, dias: int = DIAS_INDICE_NOTICIAS) -> int:
+    """
+    Quita del índice las noticias registradas hace más de `dias` días (la fecha de cada
+    noticia en el índice, es decir el día en que apareció por primera vez en su tema),
+    sin importar desde cuándo existe el tema.
+
+    Returns:
+        Cantidad de noticias eliminadas del índice
+    """
+    limite = (datetime.strptime(fecha_actual, "%Y-%m-%d") - timedelta(days=dias)).strftime("%Y-%m-%d")
+    with conn:
+        cursor = conn.execute('DELETE FROM noticias_tema WHERE fecha < ?', (limite,))
+    if cursor.rowcount:
+        logging.info(f"  🗑️  {cursor.rowcount} noticias de más de {dias} días quitadas del índice")
+    return cursor.rowcount
+
+
+def obtener_historia(conn: sqlite3.Connection, tema_id: str) -> Optional[Dict]:
+    """
+    Todo lo registrado sobre una historia: el tema, su línea de tiempo (noticias y
+    fuentes por día, primera y última aparición) y sus noticias de los últimos
+    DIAS_INDICE_NOTICIAS días. Son búsquedas por clave primaria, sin leer los
+    temas_*.json de cada día.
+
+    Returns:
+        Diccionario con el tema, 'linea_tiempo' y 'noticias', o None si el tema no existe
+    """
+    tema = obtener_tema(conn, tema_id)
+    if tema is None:
+        return None
+
+    nombres = nombres_fuentes(conn)
+    tema['linea_tiempo'] = [
+        {'fecha': a['fecha'], 'cantidad_noticias': a['cantidad_noticias'], 'fuentes': a['fuentes']}
+        for a in obtener_apariciones(conn, tema_id, nombres)
+    ]
+    tema['noticias'] = [
+        {
+            'titulo': fila['titulo'],
+            'link': fila['link'],
+            'fuente': nombres.get(fila['fuente_id'], ''),
+            'fecha': fila['fecha_publicacion'],
+            'fecha_tema': fila['fecha']
+        }
+        for fila in conn.execute(
+            'SELECT * FROM noticias_tema WHERE tema_id = ? ORDER BY fecha, fecha_publicacion', (tema_id,)
+        )
+    ]
+    return tema
+
+
+def temas_de_noticia(conn: sqlite3.Connection, noticia: Dict) -> List[Dict]:
+    """
+    Temas en los que apareció una noticia (por link, o por título si no tiene).
+
+    Returns:
+        Lista de {'tema_id', 'tema', 'fecha'}, de la aparición más antigua a la más reciente
+    """
+    filas = conn.execute('''
+        SELECT n.tema_id, t.tema, n.fecha
+        FROM noticias_tema n JOIN temas t ON t.tema_id = n.tema_id
+        WHERE n.noticia_id = ? ORDER BY n.fecha
+    ''', (id_noticia(noticia),)).fetchall()
+    return [dict(fila) for fila in filas]
+
+
+def contar_temas(conn: sqlite3.Connection) -> Dict:
+    """Totales de temas por estado."""
+    totales = {'total_temas_activos': 0, 'total_temas_inactivos': 0, 'total_temas_historicos': 0}
+    for fila in conn.execute('SELECT estado, COUNT(*) AS cantidad FROM temas GROUP BY estado'):
+        totales['total_temas_historicos'] += fila['cantidad']
+        if fila['estado'] == 'activo':
+            totales['total_temas_activos'] = fila['cantidad']
+        elif fila['estado'] == 'inactivo':
+            totales['total_temas_inactivos'] = fila['cantidad']
+    return totales
+
+
+def exportar_historico(conn: sqlite3.Connection) -> Dict:
+    """
+    Reconstruye el histórico completo con el formato del historico_temas.json anterior.
+    """
+    alias_por_tema = {}
+    for fila in conn.execute('SELECT alias, tema_id FROM alias'):
+        alias_por_tema.setdefault(fila['tema_id'], []).append(fila['alias'])
+
+    nombres = nombres_fuentes(conn)
+    temas = {}
+    for fila in conn.execute(SELECT_TEMA + ' ORDER BY t.fecha_primer_deteccion').fetchall():
+        tema = fila_a_tema(fila)
+        tema['alias'] = alias_por_tema.get(tema['tema_id'], [])
+        tema['apariciones'] = obtener_apariciones(conn, tema['tema_id'], nombres)
+        temas[tema['tema_id']] = tema
+
+    historico = {'temas': temas, 'ultima_actualizacion': datetime.now().isoformat()}
+    historico.update(contar_temas(conn))
+    return historico
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    parser = argparse.ArgumentParser(description="Histórico de temas en SQLite")
+    parser.add_argument("--exportar", help="Exportar el histórico al formato JSON anterior en este archivo")
+    parser.add_argument("--historia", metavar="TEMA_ID", help="Mostrar la línea de tiempo y las noticias de un tema")
+    parser.add_argument("--noticia", metavar="LINK", help="Mostrar en qué temas apareció una noticia")
+    args = parser.parse_args()
+
+    conn = get_connection()
+    totales = contar_temas(conn)
+    logging.info(f"Histórico: {totales['total_temas_historicos']} temas "
+                 f"({totales['total_temas_activos']} activos, {totales['total_temas_inactivos']} inactivos)")
+
+    if args.exportar:
+        with open(args.exportar, "w", encoding="utf-8") as f:
+            json.dump(exportar_historico(conn), f, ensure_ascii=False, indent=2)
+        logging.info(f"📁 Exportado a: {args.exportar}")
+
+    if args.historia:
+        historia = obtener_historia(conn, args.historia)
+        if historia is None:
+            logging.error(f"✗ No existe el tema {args.historia}")
+        else:
+            logging.info(f"{historia['tema']} ({historia['fecha_primer_deteccion']} → {historia['fecha_ultima_aparicion']})")
+            for dia in historia['linea_tiempo']:
+                logging.info(f"  {dia['fecha']}: {dia['cantidad_noticias']} noticias ({', '.join(dia['fuentes'])})")
+            for noticia in historia['noticias']:
+                logging.info(f"  • [{noticia['fecha_tema']}] {noticia['fuente']}: {noticia['titulo']}")
+
+    if args.noticia:
+        for aparicion in temas_de_noticia(conn, {'link': args.noticia}):
+            logging.info(f"  {aparicion['fecha']}: {aparicion['tema']} ({aparicion['tema_id']})")
+
+    conn.close()
+
+
+if __name__ == "__main__":
+    main()
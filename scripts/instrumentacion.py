@@ -0,0 +1,213 @@
+"""
+Mediciones de rendimiento por etapa y sub-paso del pipeline, con reporte por corrida.
+
+Cada paso se mide con un context manager:
+
+    with instrumentacion.medir("deduplicar", entrada=len(noticias)) as medicion:
+        unicas = eliminar_duplicados(noticias)
+        medicion.salida = len(unicas)
+
+y registra tiempo real, tiempo de CPU, items de entrada/salida y pico de memoria
+(tracemalloc, por encima de la memoria al empezar el paso). Los pasos anidados se
+identifican por su ruta ("integrar_fuentes/deduplicar").
+
+Solo se mide entre iniciar_reporte() y guardar_reporte() (el orquestador lo hace en
+cada corrida): si los scripts se ejecutan sueltos, medir() no hace nada. El reporte se
+guarda en data/reportes/ y se compara con comparar_reportes.py.
+
+Las mediciones se guardan en variables del módulo: usar solo desde el hilo principal.
+"""
+
+import json
+import platform
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+import logging
+
+# Rutas
+BASE_DIR = Path(__file__).parent.parent
+REPORTES_DIR = BASE_DIR / "data" / "reportes"
+
+MB = 1024 * 1024
+MAX_REPORTES = 500  # Se borran los más antiguos (el modo daemon genera uno por corrida)
+
+# Estado de la corrida actual (None si no se está midiendo)
+_reporte: Optional[Dict] = None
+_pila: List["Medicion"] = []
+
+
+class Medicion:
+    """Un paso en curso. El código medido completa entrada, salida y bytes si los conoce."""
+
+    def __init__(self, nombre: str, detalle: Optional[str] = None, entrada: Optional[int] = None):
+        self.nombre = nombre
+        self.detalle = detalle
+        self.entrada = entrada
+        self.salida: Optional[int] = None
+        self.bytes: Optional[int] = None
+        self.memoria_inicial = 0
+        self.memoria_pico = 0
+
+
+# Se devuelve cuando no hay reporte activo: acepta las asignaciones y no registra nada
+_MEDICION_INACTIVA = Medicion("inactiva")
+
+
+def iniciar_reporte(id_corrida: str, medir_memoria: bool = True):
+    """
+    Empieza a registrar las mediciones de una corrida.
+
+    Args:
+        id_corrida: Identificador de la corrida (se usa en el nombre del reporte)
+        medir_memoria: Activar tracemalloc (hace más lento el código que crea muchos objetos)
+    """
+    global _reporte
+    _pila.clear()
+    _reporte = {
+        'id_corrida': id_corrida,
+        'inicio': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'memoria_medida': medir_memoria,
+        'mediciones': [],
+        '_reloj': time.perf_counter(),
+        '_inicio_tracemalloc': False,
+    }
+    if medir_memoria and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _reporte['_inicio_tracemalloc'] = True
+
+
+def _actualizar_picos():
+    """Lleva el pico de tracemalloc a todos los pasos abiertos y lo reinicia."""
+    if tracemalloc.is_tracing():
+        pico = tracemalloc.get_traced_memory()[1]
+        for abierta in _pila:
+            abierta.memoria_pico = max(abierta.memoria_pico, pico)
+        tracemalloc.reset_peak()
+
+
+@contextmanager
+def medir(nombre: str, detalle: Optional[str] = None, entrada: Optional[int] = None):
+    """
+    Mide un paso. Los pasos con el mismo nombre (p.ej. la descarga de cada feed) se
+    distinguen por `detalle` y se suman en el resumen del reporte.
+
+    Args:
+        nombre: Nombre del paso (se anida bajo el paso que lo contiene)
+        detalle: Texto opcional que identifica la repetición (feed, archivo)
+        entrada: Cantidad de items que recibe el paso
+
+    Yields:
+        Medicion sobre la que se puede asignar salida, entrada o bytes
+    """
+    if _reporte is None:
+        yield _MEDICION_INACTIVA
+        return
+
+    medicion = Medicion(nombre, detalle, entrada)
+    _actualizar_picos()
+    if tracemalloc.is_tracing():
+        medicion.memoria_inicial = medicion.memoria_pico = tracemalloc.get_traced_memory()[0]
+    # El registro se agrega al empezar, para que cada paso quede antes que sus sub-pasos
+    registro = {'ruta': "/".join([abierta.nombre for abierta in _pila] + [nombre])}
+    _reporte['mediciones'].append(registro)
+    _pila.append(medicion)
+
+    error = None
+    inicio, inicio_cpu = time.perf_counter(), time.process_time()
+    try:
+        yield medicion
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        segundos = time.perf_counter() - inicio
+        cpu_segundos = time.process_time() - inicio_cpu
+        _actualizar_picos()
+        _pila.pop()
+
+        registro['segundos'] = round(segundos, 4)
+        registro['cpu_segundos'] = round(cpu_segundos, 4)
+        if detalle is not None:
+            registro['detalle'] = detalle
+        for campo in ('entrada', 'salida', 'bytes'):
+            if getattr(medicion, campo) is not None:
+                registro[campo] = getattr(medicion, campo)
+        if tracemalloc.is_tracing():
+            registro['memoria_pico_mb'] = round((medicion.memoria_pico - medicion.memoria_inicial) / MB, 2)
+        if error:
+            registro['error'] = error
+
+
+def resumir(mediciones: List[Dict]) -> Dict[str, Dict]:
+    """
+    Suma las mediciones con la misma ruta (en orden de aparición).
+
+    Returns:
+        ruta -> {veces, segundos, cpu_segundos, entrada, salida, items_por_segundo, memoria_pico_mb}
+        (memoria_pico_mb es el máximo entre las repeticiones)
+    """
+    resumen = {}
+    for registro in mediciones:
+        total = resumen.setdefault(registro['ruta'], {'veces': 0, 'segundos': 0.0, 'cpu_segundos': 0.0})
+        total['veces'] += 1
+        total['segundos'] += registro['segundos']
+        total['cpu_segundos'] += registro['cpu_segundos']
+        for campo in ('entrada', 'salida', 'bytes'):
+            if campo in registro:
+                total[campo] = total.get(campo, 0) + registro[campo]
+        if 'memoria_pico_mb' in registro:
+            total['memoria_pico_mb'] = max(total.get('memoria_pico_mb', 0.0), registro['memoria_pico_mb'])
+        if 'error' in registro:
+            total['errores'] = total.get('errores', 0) + 1
+
+    for total in resumen.values():
+        total['segundos'] = round(total['segundos'], 4)
+        total['cpu_segundos'] = round(total['cpu_segundos'], 4)
+        items = total.get('salida', total.get('entrada'))
+        if items is not None and total['segundos'] > 0:
+            total['items_por_segundo'] = round(items / total['segundos'], 1)
+    return resumen
+
+
+def guardar_reporte(extra: Optional[Dict] = None) -> Optional[Path]:
+    """
+    Cierra la corrida y escribe el reporte en data/reportes/.
+
+    Args:
+        extra: Datos adicionales para el reporte (p.ej. el resultado de cada etapa)
+
+    Returns:
+        Ruta del reporte, o None si no había una corrida en curso
+    """
+    global _reporte
+    if _reporte is None:
+        return None
+    reporte, _reporte = _reporte, None
+    _pila.clear()
+    if reporte.pop('_inicio_tracemalloc'):
+        tracemalloc.stop()
+
+    reporte['fin'] = datetime.now().isoformat()
+    reporte['segundos_totales'] = round(time.perf_counter() - reporte.pop('_reloj'), 3)
+    reporte.update(extra or {})
+    reporte['resumen'] = resumir(reporte['mediciones'])
+
+    REPORTES_DIR.mkdir(parents=True, exist_ok=True)
+    archivo = REPORTES_DIR / f"reporte_{datetime.now().strftime('%Y-%m-%d_%H%M%S')}_{reporte['id_corrida']}.json"
+    try:
+        with open(archivo, "w", encoding="utf-8") as f:
+            json.dump(reporte, f, ensure_ascii=False, indent=2)
+    except Exception as e:
+        logging.error(f"Error al guardar el reporte de rendimiento: {str(e)}")
+        return None
+    logging.info(f"📁 Reporte de rendimiento: {archivo}")
+
+    anteriores = sorted(REPORTES_DIR.glob("reporte_*.json"), key=lambda ruta: ruta.stat().st_mtime)
+    for viejo in anteriores[:-MAX_REPORTES]:
+        viejo.unlink(missing_ok=True)
+    return archivo
@@ -9,6 +9,8 @@ from datetime import datetime
 import logging
 from typing import List, Dict
 
+import instrumentacion
+
 # Configuración de logging
 logging.basicConfig(
     level=logging.INFO,
@@ -160,7 +162,7 @@ def guardar_dataset(noticias: List[Dict], fecha_str: str):
 def limpiar_frontend_data():
     """
     Limpia archivos JSON antiguos de noticias y resúmenes en frontend/data/.
-    NO borra archivos de temas (temas_*.json, historico_temas.json) ya que se generan después.
+    NO borra archivos de temas (temas_*.json, temas_latest.json) ya que se generan después.
     """
     if not FRONTEND_DIR.exists():
         return
@@ -246,7 +248,9 @@ def main():
     logging.info("=" * 60)
     
     # 1. Leer todas las noticias de archivos normalizados
-    todas_las_noticias = leer_todas_las_noticias()
+    with instrumentacion.medir("leer") as medicion:
+        todas_las_noticias = leer_todas_las_noticias()
+        medicion.salida = len(todas_las_noticias)
     
     if not todas_las_noticias:
         logging.warning("No se encontraron noticias para procesar")
@@ -255,20 +259,25 @@ def main():
     logging.info(f"Total de noticias leídas: {len(todas_las_noticias)}")
     
     # 2. Eliminar duplicados
-    noticias_unicas = eliminar_duplicados(todas_las_noticias)
+    with instrumentacion.medir("deduplicar", entrada=len(todas_las_noticias)) as medicion:
+        noticias_unicas = eliminar_duplicados(todas_las_noticias)
+        medicion.salida = len(noticias_unicas)
     
     # 3. Ordenar por fecha descendente
-    noticias_ordenadas = ordenar_por_fecha(noticias_unicas)
+    with instrumentacion.medir("ordenar", entrada=len(noticias_unicas)) as medicion:
+        noticias_ordenadas = ordenar_por_fecha(noticias_unicas)
+        medicion.salida = len(noticias_ordenadas)
     
     # 4. Guardar dataset
     nombre_archivo = f"noticias_{fecha_actual}.json"
-    guardar_dataset(noticias_ordenadas, fecha_actual)
-    
-    # 5. Limpiar frontend/data/ antes de copiar
-    limpiar_frontend_data()
-    
-    # 6. Copiar a frontend
-    copiar_a_frontend(nombre_archivo, fecha_actual)
+    with instrumentacion.medir("escribir", entrada=len(noticias_ordenadas)):
+        guardar_dataset(noticias_ordenadas, fecha_actual)
+        
+        # 5. Limpiar frontend/data/ antes de copiar
+        limpiar_frontend_data()
+        
+        # 6. Copiar a frontend
+        copiar_a_frontend(nombre_archivo, fecha_actual)
     
     # 6. Mostrar resumen por categoría
     resumen = generar_resumen_por_categoria(noticias_ordenadas)
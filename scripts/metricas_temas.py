@@ -0,0 +1,213 @@
+"""
+Métricas de ciclo de vida de los temas, calculadas para todo el histórico a la vez.
+
+Las apariciones de los últimos VENTANA_DIAS días se cargan con una sola consulta
+(índice por fecha) en una matriz densa temas x días de cantidad de noticias (0 los
+días en que el tema no apareció). Sobre esa matriz, con operaciones de numpy:
+- EWMA corta y larga de la cobertura y su diferencia (momentum).
+- Tendencia a partir del momentum relativo ("nuevo", "creciente", "estable", "decreciente").
+- Pico de cobertura (cantidad y fecha) y si el tema está hoy en un pico.
+- Días desde la última aparición, días con cobertura, mínimo y promedio por día con cobertura.
+
+Uso (recalcular y ver los temas con más momentum):
+    python scripts/metricas_temas.py
+    python scripts/metricas_temas.py --fecha 2026-10-18
+"""
+
+import argparse
+import json
+import sqlite3
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List, Tuple
+import logging
+
+import numpy as np
+
+import historico_temas_db
+
+# Parámetros
+VENTANA_DIAS = 60            # Días de historia que entran en la matriz
+ALFA_CORTA = 0.5             # EWMA corta (~2 días de memoria)
+ALFA_LARGA = 0.15            # EWMA larga (~1 semana de memoria)
+UMBRAL_MOMENTUM = 0.2        # Momentum relativo a la EWMA larga para creciente/decreciente
+DESVIOS_PICO = 2.0           # Hoy es pico si supera la media previa en estos desvíos estándar
+
+
+def fechas_ventana(fecha_fin: str, dias: int = VENTANA_DIAS) -> List[str]:
+    """Fechas YYYY-MM-DD de la ventana, de la más antigua a fecha_fin inclusive."""
+    fin = datetime.strptime(fecha_fin, "%Y-%m-%d")
+    return [(fin - timedelta(days=d)).strftime("%Y-%m-%d") for d in range(dias - 1, -1, -1)]
+
+
+def cargar_matriz(conn: sqlite3.Connection, fecha_fin: str,
+                  dias: int = VENTANA_DIAS) -> Tuple[List[str], List[str], np.ndarray, Dict[str, List[str]]]:
+    """
+    Arma la serie diaria densa de cantidad de noticias de cada tema con apariciones en la ventana.
+
+    Returns:
+        (tema_ids, fechas, matriz temas x días, fuentes por tema)
+    """
+    fechas = fechas_ventana(fecha_fin, dias)
+    columna_fecha = {fecha: i for i, fecha in enumerate(fechas)}
+
+    cursor = conn.cursor()
+    cursor.row_factory = None  # Tuplas: miles de filas, sin el costo de sqlite3.Row
+    filas = cursor.execute(
+        'SELECT tema_id, fecha, cantidad_noticias, fuentes_mascara FROM apariciones WHERE fecha >= ? AND fecha <= ?',
+        (fechas[0], fechas[-1])
+    ).fetchall()
+
+    fila_tema = {}
+    mascaras = {}
+    posiciones = np.empty(len(filas), dtype=np.intp)
+    columnas = np.empty(len(filas), dtype=np.intp)
+    for k, (tema_id, fecha, _, mascara) in enumerate(filas):
+        posiciones[k] = fila_tema.setdefault(tema_id, len(fila_tema))
+        columnas[k] = columna_fecha[fecha]
+        mascaras[tema_id] = mascaras.get(tema_id, 0) | (mascara or 0)
+
+    matriz = np.zeros((len(fila_tema), len(fechas)), dtype=np.float64)
+    matriz[posiciones, columnas] = [fila[2] or 0 for fila in filas]
+
+    nombres = historico_temas_db.nombres_fuentes(conn)
+    fuentes = {tema_id: historico_temas_db.fuentes_de_mascara(mascara, nombres) for tema_id, mascara in mascaras.items()}
+    return list(fila_tema), fechas, matriz, fuentes
+
+
+def ewma_final(matriz: np.ndarray, inicio: np.ndarray, alfa: float) -> np.ndarray:
+    """
+    Valor final de la media móvil exponencial de cada fila, como un único producto
+    matriz-vector. Los pesos alfa*(1-alfa)^k se normalizan solo sobre los días desde la
+    primera aparición del tema (`inicio`), para que los ceros previos no la sesguen.
+    """
+    pesos = alfa * (1 - alfa) ** np.arange(matriz.shape[1] - 1, -1, -1, dtype=np.float64)
+    pesos_desde = np.cumsum(pesos[::-1])[::-1]  # pesos_desde[j] = suma de pesos[j:]
+    return (matriz @ pesos) / pesos_desde[inicio]
+
+
+def calcular_metricas(matriz: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Métricas de todas las series a la vez.
+
+    Args:
+        matriz: Cantidad de noticias por tema (filas) y día (columnas, la última es hoy).
+            Cada fila tiene al menos un día con cobertura.
+
+    Returns:
+        Diccionario de arrays de largo igual a la cantidad de temas
+    """
+    cantidad_dias = matriz.shape[1]
+    columnas = np.arange(cantidad_dias)
+    con_cobertura = matriz > 0
+    dias_con_cobertura = con_cobertura.sum(axis=1)
+    inicio = con_cobertura.argmax(axis=1)  # Primera aparición dentro de la ventana
+    ultima = np.where(con_cobertura, columnas, -1).max(axis=1)
+
+    ewma_corta = ewma_final(matriz, inicio, ALFA_CORTA)
+    ewma_larga = ewma_final(matriz, inicio, ALFA_LARGA)
+    momentum = ewma_corta - ewma_larga
+    relativo = momentum / np.maximum(ewma_larga, 1.0)
+
+    tendencia = np.full(len(matriz), "estable", dtype=object)
+    tendencia[relativo > UMBRAL_MOMENTUM] = "creciente"
+    tendencia[relativo < -UMBRAL_MOMENTUM] = "decreciente"
+    tendencia[dias_con_cobertura < 2] = "nuevo"
+
+    # Pico de hoy: es el máximo de la ventana y supera en DESVIOS_PICO desvíos la media de los
+    # días anteriores (contando desde la primera aparición)
+    hoy = matriz[:, -1]
+    previos = np.where(columnas[:-1] >= inicio[:, None], matriz[:, :-1], 0.0)
+    cantidad_previos = np.maximum(cantidad_dias - 1 - inicio, 1)
+    media_previa = previos.sum(axis=1) / cantidad_previos
+    desvio_previo = np.sqrt(np.maximum((previos ** 2).sum(axis=1) / cantidad_previos - media_previa ** 2, 0.0))
+    pico = matriz.max(axis=1)
+    en_pico = (hoy > 0) & (hoy >= pico) & (hoy > media_previa + DESVIOS_PICO * desvio_previo) & (dias_con_cobertura >= 2)
+
+    return {
+        'pico_noticias': pico,
+        'indice_pico': matriz.argmax(axis=1),
+        'en_pico': en_pico,
+        'minimo_noticias': np.where(con_cobertura, matriz, np.inf).min(axis=1),
+        'promedio_noticias_dia': matriz.sum(axis=1) / np.maximum(dias_con_cobertura, 1),
+        'dias_con_cobertura': dias_con_cobertura,
+        'dias_desde_ultima': cantidad_dias - 1 - ultima,
+        'ewma_noticias': ewma_corta,
+        'momentum': momentum,
+        'tendencia': tendencia,
+    }
+
+
+def actualizar_metricas(conn: sqlite3.Connection, fecha: str, dias: int = VENTANA_DIAS) -> Dict[str, Dict]:
+    """
+    Recalcula tendencia y métricas de todos los temas con apariciones en la ventana y las
+    guarda en el histórico con un único executemany.
+
+    Args:
+        conn: Conexión al histórico (ver historico_temas_db)
+        fecha: Fecha de hoy en formato YYYY-MM-DD
+        dias: Días de historia a considerar
+
+    Returns:
+        Diccionario tema_id -> {'tendencia': ..., 'metricas': {...}}
+    """
+    inicio = time.perf_counter()
+    tema_ids, fechas, matriz, fuentes = cargar_matriz(conn, fecha, dias)
+    if not tema_ids:
+        return {}
+    valores = calcular_metricas(matriz)
+
+    resultado = {}
+    for i, tema_id in enumerate(tema_ids):
+        resultado[tema_id] = {
+            'tendencia': valores['tendencia'][i],
+            'metricas': {
+                'pico_noticias': int(valores['pico_noticias'][i]),
+                'fecha_pico': fechas[valores['indice_pico'][i]],
+                'en_pico': bool(valores['en_pico'][i]),
+                'minimo_noticias': int(valores['minimo_noticias'][i]),
+                'promedio_noticias_dia': round(float(valores['promedio_noticias_dia'][i]), 1),
+                'dias_con_cobertura': int(valores['dias_con_cobertura'][i]),
+                'dias_desde_ultima': int(valores['dias_desde_ultima'][i]),
+                'ewma_noticias': round(float(valores['ewma_noticias'][i]), 2),
+                'momentum': round(float(valores['momentum'][i]), 2),
+                'fuentes_unicas': fuentes.get(tema_id, []),
+            }
+        }
+
+    with conn:
+        conn.executemany(
+            'UPDATE temas SET tendencia = ?, metricas = ? WHERE tema_id = ?',
+            [(datos['tendencia'], json.dumps(datos['metricas'], ensure_ascii=False), tema_id)
+             for tema_id, datos in resultado.items()]
+        )
+
+    logging.info(f"  📈 Métricas de {len(tema_ids)} temas ({dias} días) en {(time.perf_counter() - inicio) * 1000:.0f} ms")
+    return resultado
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    parser = argparse.ArgumentParser(description="Recalcular métricas de los temas del histórico")
+    parser.add_argument("--fecha", default=datetime.now().strftime("%Y-%m-%d"), help="Fecha de referencia (YYYY-MM-DD)")
+    parser.add_argument("--top", type=int, default=10, help="Temas con más momentum a mostrar")
+    args = parser.parse_args()
+
+    conn = historico_temas_db.get_connection()
+    resultado = actualizar_metricas(conn, args.fecha)
+    nombres = {fila['tema_id']: fila['tema'] for fila in conn.execute('SELECT tema_id, tema FROM temas')}
+    conn.close()
+
+    logging.info("=" * 70)
+    logging.info(f"TEMAS CON MÁS MOMENTUM ({args.fecha})")
+    logging.info("=" * 70)
+    ordenados = sorted(resultado.items(), key=lambda item: item[1]['metricas']['momentum'], reverse=True)
+    for tema_id, datos in ordenados[:args.top]:
+        metricas = datos['metricas']
+        pico = " ⭐ pico" if metricas['en_pico'] else ""
+        logging.info(f"• {nombres.get(tema_id, tema_id)} [{datos['tendencia']}] "
+                     f"momentum {metricas['momentum']:+.2f}, pico {metricas['pico_noticias']} ({metricas['fecha_pico']}){pico}")
+
+
+if __name__ == "__main__":
+    main()
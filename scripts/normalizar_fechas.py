@@ -4,11 +4,14 @@ Convierte las fechas a formato estándar y zona horaria local (UTC-3).
 """
 
 import json
+from functools import lru_cache
 from pathlib import Path
 from datetime import datetime, timezone, timedelta
 from dateutil import parser
 import logging
 
+import instrumentacion
+
 # Configuración de logging
 logging.basicConfig(
     level=logging.INFO,
@@ -23,10 +26,38 @@ NORMALIZED_DIR = BASE_DIR / "data" / "normalized"
 # Zona horaria de Argentina (UTC-3)
 ARG_TIMEZONE = timezone(timedelta(hours=-3))
 
+# Fechas ya parseadas (se reutilizan entre corridas en el modo daemon)
+TAMANO_CACHE_FECHAS = 20000
+
+# Fechas por defecto distintas en día, mes y año: si un string da el mismo resultado con
+# ambas, trae la fecha completa (dateutil completa lo que falta con la fecha de hoy)
+FECHA_DEFECTO_A = datetime(2000, 1, 1)
+FECHA_DEFECTO_B = datetime(2001, 2, 2)
+
+
+@lru_cache(maxsize=TAMANO_CACHE_FECHAS)
+def parsear_fecha_completa(fecha_str: str) -> datetime:
+    """
+    Parsea un string con día, mes y año (el resultado no depende de la fecha de hoy,
+    por eso se puede cachear).
+    
+    Returns:
+        Objeto datetime con timezone, o None si al string le falta el día, el mes o el año
+    """
+    dt = parser.parse(fecha_str, default=FECHA_DEFECTO_A)
+    if dt != parser.parse(fecha_str, default=FECHA_DEFECTO_B):
+        return None
+    
+    # Si no tiene timezone, asumir UTC
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
 
 def parsear_fecha(fecha_str: str) -> datetime:
     """
-    Parsea un string de fecha a objeto datetime.
+    Parsea un string de fecha a objeto datetime. Las fechas completas se cachean; las
+    parciales (solo la hora, sin año) se completan con el día de hoy y no se cachean.
     
     Args:
         fecha_str: String con la fecha en formato RSS o similar
@@ -35,12 +66,12 @@ def parsear_fecha(fecha_str: str) -> datetime:
         Objeto datetime con timezone
     """
     try:
-        # dateutil.parser.parse puede manejar múltiples formatos
-        dt = parser.parse(fecha_str)
-        
-        # Si no tiene timezone, asumir UTC
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
+        dt = parsear_fecha_completa(fecha_str)
+        if dt is None:
+            # dateutil.parser.parse puede manejar múltiples formatos
+            dt = parser.parse(fecha_str)
+            if dt.tzinfo is None:
+                dt = dt.replace(tzinfo=timezone.utc)
         
         return dt
     except Exception as e:
@@ -175,22 +206,27 @@ def procesar_archivo(archivo_entrada: Path, archivo_salida: Path):
         logging.info(f"Procesando: {archivo_entrada.name}")
         
         # Leer archivo
-        with open(archivo_entrada, "r", encoding="utf-8") as f:
-            noticias = json.load(f)
+        with instrumentacion.medir("leer", detalle=archivo_entrada.name) as medicion:
+            with open(archivo_entrada, "r", encoding="utf-8") as f:
+                noticias = json.load(f)
+            medicion.salida = len(noticias)
         
         if not noticias:
             logging.warning(f"Archivo vacío: {archivo_entrada.name}")
             return
         
         # Normalizar cada noticia
-        noticias_normalizadas = []
-        for noticia in noticias:
-            noticia_normalizada = normalizar_noticia(noticia)
-            noticias_normalizadas.append(noticia_normalizada)
+        with instrumentacion.medir("normalizar", detalle=archivo_entrada.name, entrada=len(noticias)) as medicion:
+            noticias_normalizadas = []
+            for noticia in noticias:
+                noticia_normalizada = normalizar_noticia(noticia)
+                noticias_normalizadas.append(noticia_normalizada)
+            medicion.salida = len(noticias_normalizadas)
         
         # Guardar archivo normalizado
-        with open(archivo_salida, "w", encoding="utf-8") as f:
-            json.dump(noticias_normalizadas, f, ensure_ascii=False, indent=2)
+        with instrumentacion.medir("escribir", detalle=archivo_salida.name, entrada=len(noticias_normalizadas)):
+            with open(archivo_salida, "w", encoding="utf-8") as f:
+                json.dump(noticias_normalizadas, f, ensure_ascii=False, indent=2)
         
         logging.info(f"Guardado: {archivo_salida.name} ({len(noticias_normalizadas)} noticias)")
         
@@ -0,0 +1,239 @@
+"""
+Orquestador de etapas del pipeline con caché por huella.
+
+Cada etapa se declara como un diccionario con:
+- nombre, titulo: identificador y texto para los logs
+- funcion: lo que ejecuta la etapa (el main() del script)
+- modulos: módulos cuyo código forma parte de la huella (versión del código)
+- entradas / salidas: funciones que devuelven las rutas que lee / escribe
+- depende_de: nombres de etapas anteriores (el orden declarado debe respetarlas)
+- config: función opcional que devuelve un texto de configuración (p.ej. la fecha)
+- externa: la etapa lee datos de afuera (feeds): no se saltea en una corrida nueva
+- critica: si falla, no se ejecutan las etapas que dependen de ella
+
+La huella de una etapa es el hash del código de sus módulos, su configuración, el
+contenido de sus entradas y el id de la última ejecución de cada etapa de la que
+depende: si una etapa se ejecuta, todas las que dependen de ella se ejecutan de nuevo.
+Si la huella y las salidas no cambiaron desde la última ejecución exitosa, la etapa
+se saltea. Si una etapa reescribe la salida de otra anterior de la que depende (la
+clasificación sobre el dataset integrado), el hash registrado se actualiza también en
+esa etapa para que no se repita en la corrida siguiente (nunca al revés: la salida
+nueva de una etapa anterior no cuenta como salida de las posteriores).
+
+El estado se guarda en data/pipeline_estado.json después de cada etapa: con
+reanudar=True, una corrida que falló continúa desde la etapa que falló (las etapas
+externas ya completadas en esa corrida no se repiten).
+
+Cada etapa ejecutada se mide con instrumentacion.py y la corrida deja un reporte de
+rendimiento en data/reportes/. Las etapas elegidas con PIPELINE_PERFILAR (ver
+perfilado.py) se ejecutan además bajo cProfile y un muestreador de pilas.
+"""
+
+import hashlib
+import json
+import time
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Set
+import logging
+
+import instrumentacion
+import perfilado
+
+# Rutas
+BASE_DIR = Path(__file__).parent.parent
+ESTADO_PATH = BASE_DIR / "data" / "pipeline_estado.json"
+
+TAMANO_BLOQUE = 1 << 20  # Lectura de archivos para hashear
+
+
+def hash_archivo(ruta: Path) -> str:
+    """sha256 del contenido de un archivo."""
+    digest = hashlib.sha256()
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(TAMANO_BLOQUE), b""):
+            digest.update(bloque)
+    return digest.hexdigest()
+
+
+def ruta_relativa(ruta: Path) -> str:
+    try:
+        return str(Path(ruta).resolve().relative_to(BASE_DIR.resolve()))
+    except ValueError:
+        return str(ruta)
+
+
+def hashes_archivos(rutas: List[Path]) -> Dict[str, str]:
+    """Ruta relativa -> hash de cada archivo existente, ordenado por ruta."""
+    return {ruta_relativa(r): hash_archivo(r) for r in sorted(rutas) if Path(r).is_file()}
+
+
+def calcular_huella(etapa: Dict, id_corrida: str, registros: Dict[str, Dict]) -> str:
+    """
+    Huella de una etapa: código de sus módulos + configuración + contenido de sus entradas
+    + id de la última ejecución de las etapas de las que depende (+ id de la corrida si la
+    etapa es externa).
+    """
+    digest = hashlib.sha256()
+    for dependencia in etapa.get('depende_de', []):
+        digest.update(registros.get(dependencia, {}).get('ejecucion', '').encode())
+    for modulo in etapa.get('modulos', []):
+        digest.update(hash_archivo(Path(modulo.__file__)).encode())
+    if etapa.get('config'):
+        digest.update(str(etapa['config']()).encode("utf-8"))
+    if etapa.get('externa'):
+        digest.update(id_corrida.encode())
+    digest.update(json.dumps(hashes_archivos(etapa['entradas']()), sort_keys=True).encode())
+    return digest.hexdigest()
+
+
+def cargar_estado() -> Dict:
+    if ESTADO_PATH.exists():
+        try:
+            with open(ESTADO_PATH, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception as e:
+            logging.warning(f"⚠️  No se pudo leer {ESTADO_PATH.name}, se ejecutan todas las etapas: {str(e)}")
+    return {'corrida': {}, 'etapas': {}}
+
+
+def guardar_estado(estado: Dict):
+    """Escribe el estado de forma atómica (archivo temporal + reemplazo)."""
+    ESTADO_PATH.parent.mkdir(parents=True, exist_ok=True)
+    temporal = ESTADO_PATH.with_suffix(".tmp")
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(estado, f, ensure_ascii=False, indent=2)
+    temporal.replace(ESTADO_PATH)
+
+
+def salidas_intactas(registro: Dict) -> bool:
+    """True si las salidas registradas siguen existiendo con el mismo contenido."""
+    salidas = registro.get('salidas', {})
+    if not salidas:
+        return False
+    for ruta, digest in salidas.items():
+        archivo = BASE_DIR / ruta
+        if not archivo.is_file() or hash_archivo(archivo) != digest:
+            return False
+    return True
+
+
+def ancestros(nombre: str, por_nombre: Dict[str, Dict]) -> Set[str]:
+    """Etapas de las que depende `nombre`, directa o indirectamente."""
+    encontrados, pendientes = set(), list(por_nombre[nombre].get('depende_de', []))
+    while pendientes:
+        dependencia = pendientes.pop()
+        if dependencia not in encontrados:
+            encontrados.add(dependencia)
+            pendientes.extend(por_nombre[dependencia].get('depende_de', []))
+    return encontrados
+
+
+def ejecutar_etapas(etapas: List[Dict], reanudar: bool = False, forzar: bool = False,
+                    medir_memoria: bool = True) -> Dict[str, str]:
+    """
+    Ejecuta las etapas en el orden declarado, salteando las que no cambiaron.
+
+    Args:
+        etapas: Etapas a ejecutar (ver docstring del módulo)
+        reanudar: Continuar la última corrida si no terminó bien
+        forzar: Ejecutar todas las etapas aunque su huella no haya cambiado
+        medir_memoria: Medir el pico de memoria de cada paso (tracemalloc)
+
+    Returns:
+        Diccionario nombre -> "ok", "sin_cambios", "error" u "omitida"
+
+    Raises:
+        ValueError: si una etapa depende de otra que no está declarada antes
+    """
+    declaradas = set()
+    for etapa in etapas:
+        faltantes = [d for d in etapa.get('depende_de', []) if d not in declaradas]
+        if faltantes:
+            raise ValueError(f"La etapa '{etapa['nombre']}' depende de {faltantes}, que no están declaradas antes")
+        declaradas.add(etapa['nombre'])
+
+    estado = cargar_estado()
+    corrida = estado.get('corrida', {})
+    if reanudar and corrida.get('id') and corrida.get('estado') != 'completa':
+        logging.info(f"↻ Reanudando la corrida {corrida['id']} del {corrida.get('inicio', '?')}")
+    else:
+        corrida = {'id': uuid.uuid4().hex[:12], 'inicio': datetime.now().isoformat()}
+    corrida['estado'] = 'en_curso'
+    estado['corrida'] = corrida
+    guardar_estado(estado)
+
+    resultados = {}
+    instrumentacion.iniciar_reporte(corrida['id'], medir_memoria=medir_memoria)
+    try:
+        _ejecutar(etapas, estado, corrida, resultados, forzar)
+    finally:
+        # Las etapas perfiladas tardan más: comparar_reportes lo advierte
+        perfiladas = [e['nombre'] for e in etapas if perfilado.debe_perfilar(e['nombre'])]
+        instrumentacion.guardar_reporte({'resultados': resultados, 'etapas_perfiladas': perfiladas})
+
+    completa = all(resultados.get(e['nombre']) in ("ok", "sin_cambios") or not e.get('critica', True)
+                   for e in etapas)
+    corrida['estado'] = 'completa' if completa else 'fallida'
+    corrida['fin'] = datetime.now().isoformat()
+    guardar_estado(estado)
+    return resultados
+
+
+def _ejecutar(etapas: List[Dict], estado: Dict, corrida: Dict, resultados: Dict[str, str], forzar: bool):
+    """Recorre las etapas y completa `resultados` (ver ejecutar_etapas)."""
+    por_nombre = {etapa['nombre']: etapa for etapa in etapas}
+    for numero, etapa in enumerate(etapas, 1):
+        nombre = etapa['nombre']
+        logging.info("\n" + "=" * 70)
+        logging.info(f"PASO {numero}/{len(etapas)}: {etapa['titulo']}")
+        logging.info("=" * 70)
+
+        fallidas = [d for d in etapa.get('depende_de', []) if resultados.get(d) in ("error", "omitida")]
+        if fallidas:
+            logging.warning(f"⏭️  Omitida: depende de {', '.join(fallidas)}, que no se completó")
+            resultados[nombre] = "omitida"
+            continue
+
+        huella = calcular_huella(etapa, corrida['id'], estado['etapas'])
+        registro = estado['etapas'].get(nombre, {})
+        if (not forzar and registro.get('estado') == 'ok' and registro.get('huella') == huella
+                and salidas_intactas(registro)):
+            logging.info(f"⏭️  Sin cambios desde {registro.get('fin', '?')} (huella {huella[:12]}): se saltea")
+            resultados[nombre] = "sin_cambios"
+            continue
+
+        inicio = time.perf_counter()
+        error = None
+        try:
+            with instrumentacion.medir(nombre), perfilado.perfilar(nombre, corrida['id']):
+                etapa['funcion']()
+            if not etapa['salidas']():
+                error = "no generó salidas"
+        except Exception as e:
+            error = str(e)
+        duracion = round(time.perf_counter() - inicio, 2)
+
+        if error:
+            logging.error(f"✗ Error en {nombre}: {error}")
+            estado['etapas'][nombre] = {'estado': 'error', 'huella': huella, 'error': error,
+                                        'fin': datetime.now().isoformat(), 'duracion_segundos': duracion}
+            resultados[nombre] = "error"
+        else:
+            logging.info(f"✓ {nombre} completada en {duracion:.2f}s")
+            salidas = hashes_archivos(etapa['salidas']())
+            estado['etapas'][nombre] = {'estado': 'ok', 'huella': huella, 'salidas': salidas,
+                                        'ejecucion': uuid.uuid4().hex[:12],
+                                        'fin': datetime.now().isoformat(), 'duracion_segundos': duracion}
+            # Si reescribió la salida de una etapa anterior, esa etapa la registra con el contenido nuevo
+            for otro in ancestros(nombre, por_nombre):
+                registro_otro = estado['etapas'].get(otro, {})
+                for ruta in registro_otro.get('salidas', {}).keys() & salidas.keys():
+                    registro_otro['salidas'][ruta] = salidas[ruta]
+            resultados[nombre] = "ok"
+        guardar_estado(estado)
+
+        if error and etapa.get('critica', True):
+            logging.error(f"Pipeline detenido por error en {nombre} (se puede continuar con --reanudar)")
+            break
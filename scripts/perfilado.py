@@ -0,0 +1,166 @@
+"""
+Perfilado opcional de etapas del pipeline.
+
+Se activa con la variable de entorno PIPELINE_PERFILAR o con --perfilar en
+ejecutar_pipeline.py, indicando las etapas separadas por coma ("todas" perfila todas):
+
+    PIPELINE_PERFILAR=normalizar_fechas,clasificar_categorias_url python scripts/ejecutar_pipeline.py
+    python scripts/ejecutar_pipeline.py --perfilar todas
+
+Por cada etapa perfilada se guardan en data/perfiles/, con el nombre de la corrida y la etapa:
+- .pstats: perfil determinístico de cProfile (abrir con pstats, snakeviz, etc.)
+- .collapsed: pilas muestreadas cada INTERVALO_MUESTREO segundos en formato
+  "a;b;c cantidad", el que aceptan flamegraph.pl, speedscope e inferno
+
+Las etapas no seleccionadas no pagan nada más que una búsqueda en un conjunto.
+
+También se puede perfilar un script suelto (p.ej. uno que no está en el pipeline):
+    python scripts/perfilado.py agrupar_temas [argumentos del script]
+"""
+
+import cProfile
+import importlib
+import io
+import os
+import pstats
+import sys
+import threading
+import uuid
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Optional, Set
+import logging
+
+# Rutas
+BASE_DIR = Path(__file__).parent.parent
+PERFILES_DIR = BASE_DIR / "data" / "perfiles"
+
+VARIABLE_ENTORNO = "PIPELINE_PERFILAR"
+TODAS = "todas"
+INTERVALO_MUESTREO = 0.005  # Segundos entre muestras de la pila
+FUNCIONES_EN_LOG = 8        # Funciones con más tiempo propio que se muestran al terminar
+
+# Selección hecha por línea de comandos (None: se usa la variable de entorno)
+_seleccion: Optional[Set[str]] = None
+
+
+def configurar(etapas: Optional[str]):
+    """
+    Define qué etapas perfilar (tiene prioridad sobre PIPELINE_PERFILAR).
+
+    Args:
+        etapas: Nombres separados por coma, "todas", o None para volver a la variable de entorno
+    """
+    global _seleccion
+    _seleccion = None if etapas is None else {e.strip() for e in etapas.split(",") if e.strip()}
+
+
+def etapas_seleccionadas() -> Set[str]:
+    if _seleccion is not None:
+        return _seleccion
+    return {e.strip() for e in os.environ.get(VARIABLE_ENTORNO, "").split(",") if e.strip()}
+
+
+def debe_perfilar(nombre: str) -> bool:
+    seleccion = etapas_seleccionadas()
+    return nombre in seleccion or TODAS in seleccion
+
+
+def nombre_marco(frame) -> str:
+    """'modulo.funcion' de un marco de la pila (sin ';' ni espacios)."""
+    codigo = frame.f_code
+    modulo = frame.f_globals.get("__name__") or Path(codigo.co_filename).stem
+    funcion = getattr(codigo, "co_qualname", codigo.co_name)
+    return f"{modulo}.{funcion}".replace(";", ":").replace(" ", "_")
+
+
+class Muestreador(threading.Thread):
+    """Hilo que cuenta las pilas de otro hilo cada INTERVALO_MUESTREO segundos."""
+
+    def __init__(self, id_hilo: int, intervalo: float = INTERVALO_MUESTREO):
+        super().__init__(daemon=True, name="muestreador-perfilado")
+        self.id_hilo = id_hilo
+        self.intervalo = intervalo
+        self.pilas = Counter()
+        self._detener = threading.Event()
+
+    def run(self):
+        while not self._detener.wait(self.intervalo):
+            frame = sys._current_frames().get(self.id_hilo)
+            marcos = []
+            while frame is not None:
+                marcos.append(nombre_marco(frame))
+                frame = frame.f_back
+            if marcos:
+                self.pilas[";".join(reversed(marcos))] += 1
+
+    def detener(self):
+        self._detener.set()
+        self.join()
+
+
+def guardar_perfil(perfil: cProfile.Profile, pilas: Counter, nombre: str, id_corrida: str) -> Path:
+    """Escribe el .pstats y el .collapsed de una etapa y loguea las funciones más costosas."""
+    PERFILES_DIR.mkdir(parents=True, exist_ok=True)
+    base = PERFILES_DIR / f"{datetime.now().strftime('%Y-%m-%d_%H%M%S')}_{id_corrida}_{nombre}"
+
+    perfil.dump_stats(str(base) + ".pstats")
+    with open(str(base) + ".collapsed", "w", encoding="utf-8") as f:
+        for pila, cantidad in sorted(pilas.items()):
+            f.write(f"{pila} {cantidad}\n")
+
+    texto = io.StringIO()
+    pstats.Stats(perfil, stream=texto).sort_stats("tottime").print_stats(FUNCIONES_EN_LOG)
+    logging.info(f"🔬 Perfil de {nombre}: {base}.pstats / .collapsed ({sum(pilas.values())} muestras)")
+    for linea in texto.getvalue().splitlines():
+        if linea.strip():
+            logging.info(f"   {linea}")
+    return base
+
+
+@contextmanager
+def perfilar(nombre: str, id_corrida: str):
+    """
+    Perfila el bloque si la etapa está seleccionada; si no, no hace nada.
+
+    Args:
+        nombre: Nombre de la etapa
+        id_corrida: Identificador de la corrida (va en el nombre de los archivos)
+    """
+    if not debe_perfilar(nombre):
+        yield
+        return
+
+    perfil = cProfile.Profile()
+    muestreador = Muestreador(threading.get_ident())
+    muestreador.start()
+    perfil.enable()
+    try:
+        yield
+    finally:
+        perfil.disable()
+        muestreador.detener()
+        try:
+            guardar_perfil(perfil, muestreador.pilas, nombre, id_corrida)
+        except Exception as e:
+            logging.error(f"Error al guardar el perfil de {nombre}: {str(e)}")
+
+
+def main():
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    if len(sys.argv) < 2:
+        logging.error("Uso: python scripts/perfilado.py MODULO [argumentos del script]")
+        sys.exit(2)
+
+    nombre = sys.argv[1].removesuffix(".py")
+    sys.argv = [f"{nombre}.py"] + sys.argv[2:]
+    modulo = importlib.import_module(nombre)
+    configurar(nombre)
+    with perfilar(nombre, uuid.uuid4().hex[:12]):
+        modulo.main()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""
+Planificador compartido de solicitudes a Gemini.
+Reemplaza los sleeps fijos de los scripts de IA por un único punto de salida hacia la API:
+- Un solo cliente de genai reutilizado en todas las llamadas.
+- Limitador de cubeta de tokens dimensionado con las cuotas del modelo (RPM y TPM).
+- Concurrencia acotada: varios hilos trabajadores consumen una cola de prioridad.
+- Reintentos con backoff exponencial con jitter ante 429 / 503.
+
+Uso:
+    planificador = PlanificadorGemini(api_key)
+    futuro = planificador.enviar(prompt)              # no bloquea
+    texto = futuro.result()
+    texto = planificador.generar(prompt)              # bloquea hasta la respuesta
+    planificador.cerrar()
+
+Cuotas configurables por variables de entorno:
+    GEMINI_MODELO, GEMINI_RPM, GEMINI_TPM, GEMINI_CONCURRENCIA, GEMINI_BASE_URL
+"""
+
+import heapq
+import itertools
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, Optional
+import logging
+
+try:
+    from google import genai
+except ImportError:
+    genai = None  # Se informa al crear el planificador (ver verificar_sdk)
+
+# Modelo y cuotas (capa gratuita de gemini-2.5-flash; ajustables por entorno)
+MODELO_GEMINI = os.getenv("GEMINI_MODELO", "gemini-2.5-flash")
+LIMITE_RPM = int(os.getenv("GEMINI_RPM", "10"))            # Solicitudes por minuto
+LIMITE_TPM = int(os.getenv("GEMINI_TPM", "250000"))        # Tokens por minuto
+MAX_CONCURRENTES = int(os.getenv("GEMINI_CONCURRENCIA", "4"))
+
+# Reintentos
+MAX_INTENTOS = 5
+ESPERA_BASE = 2.0     # Segundos del primer backoff
+ESPERA_MAXIMA = 60.0  # Tope del backoff
+ERRORES_REINTENTABLES = ("429", "503", "UNAVAILABLE", "RESOURCE_EXHAUSTED")
+
+# Prioridades (menor = se atiende antes)
+PRIORIDAD_ALTA = 0
+PRIORIDAD_NORMAL = 10
+PRIORIDAD_BAJA = 20
+
+# Estimación de tokens
+CARACTERES_POR_TOKEN = 4
+TOKENS_RESPUESTA_ESTIMADOS = 800
+
+
+def estimar_tokens(texto: str) -> int:
+    """
+    Estimación rápida de tokens de un prompt (sin llamar a la API).
+    """
+    return len(texto) // CARACTERES_POR_TOKEN + 1
+
+
+def es_error_reintentable(error: Exception) -> bool:
+    """
+    Indica si el error es de sobrecarga o de cuota (429 / 503) y conviene reintentar.
+    """
+    mensaje = f"{getattr(error, 'code', '')} {error}"
+    return any(marca in mensaje for marca in ERRORES_REINTENTABLES)
+
+
+class CuboTokens:
+    """
+    Cubeta de tokens: se recarga de forma continua a `capacidad` unidades por minuto.
+    No es thread-safe por sí sola; la protege el lock del planificador.
+    """
+
+    def __init__(self, capacidad: float):
+        self.capacidad = capacidad
+        self.disponibles = capacidad
+        self.recarga_por_segundo = capacidad / 60.0
+        self.ultima_recarga = time.monotonic()
+
+    def _recargar(self):
+        ahora = time.monotonic()
+        self.disponibles = min(self.capacidad, self.disponibles + (ahora - self.ultima_recarga) * self.recarga_por_segundo)
+        self.ultima_recarga = ahora
+
+    def tiempo_espera(self, cantidad: float) -> float:
+        """
+        Segundos que faltan para poder consumir `cantidad` (0 si ya se puede).
+        """
+        self._recargar()
+        cantidad = min(cantidad, self.capacidad)
+        faltante = cantidad - self.disponibles
+        return max(0.0, faltante / self.recarga_por_segundo)
+
+    def consumir(self, cantidad: float):
+        self.disponibles -= min(cantidad, self.capacidad)
+
+    def vaciar(self):
+        """
+        Deja la cubeta vacía (tras un 429 el servidor indica que la cuota ya se agotó).
+        """
+        self._recargar()
+        self.disponibles = 0.0
+
+
+def verificar_sdk():
+    """
+    Raises:
+        ImportError: si google-genai no está instalado
+    """
+    if genai is None:
+        raise ImportError("google-genai no está instalado. Instálalo con: pip install google-genai")
+
+
+class PlanificadorGemini:
+    """
+    Cola de prioridad de prompts atendida por hilos trabajadores, con límites de cuota compartidos.
+    """
+
+    def __init__(self, api_key: str, modelo: str = MODELO_GEMINI, rpm: int = LIMITE_RPM,
+                 tpm: int = LIMITE_TPM, max_concurrentes: int = MAX_CONCURRENTES):
+        verificar_sdk()
+        base_url = os.getenv("GEMINI_BASE_URL")
+        if base_url:
+            self.client = genai.Client(api_key=api_key, http_options={'base_url': base_url})
+        else:
+            self.client = genai.Client(api_key=api_key)
+
+        self.modelo = modelo
+        self.cubo_solicitudes = CuboTokens(rpm)
+        self.cubo_tokens = CuboTokens(tpm)
+
+        self._lock = threading.Lock()
+        self._hay_tareas = threading.Condition()
+        self._cola = []
+        self._secuencia = itertools.count()
+        self._cerrado = False
+        self._hilos = [
+            threading.Thread(target=self._trabajador, name=f"gemini-{i}", daemon=True)
+            for i in range(max_concurrentes)
+        ]
+        for hilo in self._hilos:
+            hilo.start()
+
+        self.estadisticas = {
+            'solicitudes': 0,
+            'reintentos': 0,
+            'errores': 0,
+            'tokens_estimados': 0,
+            'segundos_en_espera': 0.0,
+        }
+
+    def enviar(self, prompt: str, prioridad: int = PRIORIDAD_NORMAL, config: Optional[Dict] = None) -> Future:
+        """
+        Encola un prompt y devuelve un Future con el texto de la respuesta.
+
+        Args:
+            prompt: Prompt a enviar
+            prioridad: Menor valor = se atiende antes (ver PRIORIDAD_*)
+            config: Configuración de generación (p.ej. {'response_mime_type': 'application/json'})
+
+        Returns:
+            Future cuyo resultado es el texto de la respuesta
+        """
+        futuro = Future()
+        with self._hay_tareas:
+            if self._cerrado:
+                raise RuntimeError("El planificador de Gemini ya está cerrado")
+            heapq.heappush(self._cola, (prioridad, next(self._secuencia), prompt, config, futuro))
+            self._hay_tareas.notify()
+        return futuro
+
+    def generar(self, prompt: str, prioridad: int = PRIORIDAD_NORMAL, config: Optional[Dict] = None) -> str:
+        """
+        Envía un prompt y espera la respuesta.
+        """
+        return self.enviar(prompt, prioridad, config).result()
+
+    def cerrar(self):
+        """
+        Termina los hilos trabajadores una vez atendidas las tareas pendientes.
+        """
+        with self._hay_tareas:
+            self._cerrado = True
+            self._hay_tareas.notify_all()
+        for hilo in self._hilos:
+            hilo.join()
+
+    def resumen_estadisticas(self) -> str:
+        e = self.estadisticas
+        return (
+            f"{e['solicitudes']} solicitudes, {e['reintentos']} reintentos, {e['errores']} errores, "
+            f"~{e['tokens_estimados']} tokens, {e['segundos_en_espera']:.1f}s esperando cuota"
+        )
+
+    def _trabajador(self):
+        while True:
+            with self._hay_tareas:
+                while not self._cola and not self._cerrado:
+                    self._hay_tareas.wait()
+                if not self._cola:
+                    return
+                _, _, prompt, config, futuro = heapq.heappop(self._cola)
+
+            if not futuro.set_running_or_notify_cancel():
+                continue
+            try:
+                futuro.set_result(self._llamar_con_reintentos(prompt, config))
+            except Exception as e:
+                futuro.set_exception(e)
+
+    def _esperar_cupo(self, tokens: int):
+        """
+        Bloquea hasta que ambas cubetas (RPM y TPM) tengan cupo y lo consume.
+        """
+        while True:
+            with self._lock:
+                espera = max(self.cubo_solicitudes.tiempo_espera(1), self.cubo_tokens.tiempo_espera(tokens))
+                if espera <= 0:
+                    self.cubo_solicitudes.consumir(1)
+                    self.cubo_tokens.consumir(tokens)
+                    return
+                self.estadisticas['segundos_en_espera'] += espera
+            time.sleep(espera)
+
+    def _llamar_con_reintentos(self, prompt: str, config: Optional[Dict] = None) -> str:
+        tokens = estimar_tokens(prompt) + TOKENS_RESPUESTA_ESTIMADOS
+
+        for intento in range(MAX_INTENTOS):
+            self._esperar_cupo(tokens)
+            with self._lock:
+                self.estadisticas['solicitudes'] += 1
+                self.estadisticas['tokens_estimados'] += tokens
+
+            try:
+                if config:
+                    response = self.client.models.generate_content(model=self.modelo, contents=[prompt], config=config)
+                else:
+                    response = self.client.models.generate_content(model=self.modelo, contents=[prompt])
+                return getattr(response, "text", "") or ""
+
+            except Exception as e:
+                if not es_error_reintentable(e) or intento == MAX_INTENTOS - 1:
+                    with self._lock:
+                        self.estadisticas['errores'] += 1
+                    if es_error_reintentable(e):
+                        logging.error(f"Servicio sobrecargado después de {MAX_INTENTOS} intentos")
+                    raise
+
+                # Backoff exponencial con jitter completo; un 429 agota la cuota para todos los hilos
+                espera = random.uniform(0, min(ESPERA_MAXIMA, ESPERA_BASE * 2 ** intento))
+                with self._lock:
+                    self.estadisticas['reintentos'] += 1
+                    if "429" in str(e) or "RESOURCE_EXHAUSTED" in str(e):
+                        self.cubo_solicitudes.vaciar()
+                logging.warning(f"Servicio sobrecargado. Reintentando en {espera:.1f}s... (intento {intento + 1}/{MAX_INTENTOS})")
+                time.sleep(espera)
+
+        raise Exception("No se pudo completar la solicitud después de múltiples intentos")
@@ -0,0 +1,343 @@
+"""
+Resumen extractivo local (sin IA) de las noticias de cada categoría.
+Arma el resumen con las oraciones más representativas de títulos y bajadas:
+- Vectoriza las oraciones con TF-IDF (numpy, sin llamadas externas).
+- Puntúa cada oración combinando TextRank sobre la matriz de similitud coseno y
+  la cercanía al centroide de la categoría, con un plus para la oración de apertura
+  y para las notas que publicaron varios medios.
+- Elige las mejores evitando oraciones redundantes entre sí.
+
+Se usa como respaldo de generar_resumenes_gemini.py cuando la API falla y como
+etapa de resúmenes del pipeline sin IA. Resume las 30 noticias de una categoría
+en milisegundos.
+
+Uso:
+    python scripts/resumen_extractivo.py
+"""
+
+import json
+import math
+import re
+import shutil
+import unicodedata
+from collections import Counter
+from pathlib import Path
+from datetime import datetime
+from typing import List, Dict, Tuple
+import logging
+
+import numpy as np
+
+import compactar_prompt
+import instrumentacion
+from seleccion_noticias import CATEGORIAS, filtrar_y_ordenar_noticias
+
+# Configuración de logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+# Rutas
+BASE_DIR = Path(__file__).parent.parent
+DATA_DIR = BASE_DIR / "data"
+FRONTEND_DIR = BASE_DIR / "frontend" / "data"
+OUTPUT_DIR = BASE_DIR / "data"
+
+# Parámetros del resumen
+MAX_ORACIONES = 6            # Oraciones del resumen
+MAX_PALABRAS = 250           # Tope de palabras del resumen
+MAX_ORACIONES_POR_NOTA = 1   # Por nota (la misma noticia publicada por varios medios cuenta una vez)
+MIN_PALABRAS_ORACION = 6     # Oraciones más cortas no aportan (firmas, epígrafes)
+MAX_PALABRAS_ORACION = 60    # Oraciones más largas suelen ser errores de segmentación
+MAX_CARACTERES_CONTENIDO = 1500  # Del contenido completo (si lo hay) solo se usa el comienzo
+
+# Puntaje
+AMORTIGUACION = 0.85         # Factor de amortiguación de TextRank
+ITERACIONES_TEXTRANK = 50
+TOLERANCIA_TEXTRANK = 1e-6
+PESO_TEXTRANK = 0.5          # El resto del peso es la cercanía al centroide
+PLUS_APERTURA = 0.15         # Título y primera oración de cada noticia
+PLUS_POR_FUENTE = 0.1        # Por cada medio adicional que publicó la misma nota
+UMBRAL_REDUNDANCIA = 0.5     # Similitud coseno máxima con una oración ya elegida
+
+FIN_ORACION = re.compile(r'(?<=[.!?…])\s+(?=[¿¡"“«A-ZÁÉÍÓÚÑ0-9])')
+
+PALABRAS_VACIAS = compactar_prompt.PALABRAS_VACIAS | {
+    "como", "más", "mas", "pero", "este", "esta", "estos", "estas", "ese", "esa", "fue", "ser",
+    "son", "está", "hay", "ya", "le", "les", "entre", "sobre", "también", "porque", "cuando",
+    "donde", "hasta", "muy", "dos", "tres", "año", "años", "dijo", "según", "había", "han", "ha",
+}
+
+
+def tokenizar(texto: str) -> List[str]:
+    """
+    Palabras significativas de un texto (minúsculas, sin acentos ni palabras vacías).
+    """
+    texto = unicodedata.normalize("NFKD", texto.lower())
+    texto = "".join(c for c in texto if not unicodedata.combining(c))
+    return [p for p in re.findall(r"[a-zñ0-9]+", texto) if len(p) > 1 and p not in PALABRAS_VACIAS]
+
+
+def dividir_oraciones(texto: str) -> List[str]:
+    """
+    Divide un texto en oraciones descartando las demasiado cortas o largas.
+    """
+    oraciones = []
+    for oracion in FIN_ORACION.split(texto):
+        oracion = oracion.strip()
+        if MIN_PALABRAS_ORACION <= len(oracion.split()) <= MAX_PALABRAS_ORACION:
+            oraciones.append(oracion)
+    return oraciones
+
+
+def extraer_oraciones(noticias: List[Dict]) -> List[Dict]:
+    """
+    Oraciones candidatas de cada noticia: el título y las de la bajada (o del comienzo
+    del contenido completo, si la noticia lo tiene).
+
+    Returns:
+        Lista de {'texto', 'noticia' (índice), 'apertura' (bool)}
+    """
+    candidatas = []
+    for i, noticia in enumerate(noticias):
+        titulo = compactar_prompt.limpiar_texto(noticia.get('titulo', ''))
+        cuerpo = compactar_prompt.limpiar_texto(noticia.get('resumen', ''))
+        if len(cuerpo.split()) < MIN_PALABRAS_ORACION * 2 and noticia.get('contenido_completo'):
+            cuerpo = compactar_prompt.limpiar_texto(noticia['contenido_completo'][:MAX_CARACTERES_CONTENIDO])
+
+        vistas = set()
+        if len(titulo.split()) >= MIN_PALABRAS_ORACION:
+            candidatas.append({'texto': titulo.rstrip(".") + ".", 'noticia': i, 'apertura': True})
+            vistas.add(titulo.rstrip(".").lower())
+
+        for posicion, oracion in enumerate(dividir_oraciones(cuerpo)):
+            # Muchas bajadas repiten el título como primera oración
+            if oracion.rstrip(".").lower() in vistas:
+                continue
+            vistas.add(oracion.rstrip(".").lower())
+            candidatas.append({'texto': oracion, 'noticia': i, 'apertura': posicion == 0})
+
+    return candidatas
+
+
+def matriz_tfidf(documentos: List[List[str]]) -> np.ndarray:
+    """
+    Matriz TF-IDF (documentos x vocabulario) con tf sublineal y filas normalizadas (L2).
+    """
+    vocabulario = {}
+    for tokens in documentos:
+        for token in tokens:
+            vocabulario.setdefault(token, len(vocabulario))
+
+    matriz = np.zeros((len(documentos), max(len(vocabulario), 1)))
+    for fila, tokens in enumerate(documentos):
+        for token, cantidad in Counter(tokens).items():
+            matriz[fila, vocabulario[token]] = 1.0 + math.log(cantidad)
+
+    frecuencia_documentos = np.count_nonzero(matriz, axis=0)
+    idf = np.log((1 + len(documentos)) / (1 + frecuencia_documentos)) + 1.0
+    matriz *= idf
+
+    normas = np.linalg.norm(matriz, axis=1, keepdims=True)
+    normas[normas == 0] = 1.0
+    return matriz / normas
+
+
+def puntuar_textrank(similitud: np.ndarray) -> np.ndarray:
+    """
+    TextRank por iteración de potencias sobre la matriz de similitud (sin la diagonal).
+
+    Returns:
+        Puntaje de cada oración (suma 1)
+    """
+    n = similitud.shape[0]
+    pesos = similitud.copy()
+    np.fill_diagonal(pesos, 0.0)
+    sumas = pesos.sum(axis=1, keepdims=True)
+    # Las oraciones sin vecinos reparten su peso uniformemente
+    transicion = np.divide(pesos, sumas, out=np.full_like(pesos, 1.0 / n), where=sumas > 0)
+
+    puntajes = np.full(n, 1.0 / n)
+    for _ in range(ITERACIONES_TEXTRANK):
+        nuevos = (1 - AMORTIGUACION) / n + AMORTIGUACION * transicion.T @ puntajes
+        if np.abs(nuevos - puntajes).sum() < TOLERANCIA_TEXTRANK:
+            return nuevos
+        puntajes = nuevos
+    return puntajes
+
+
+def normalizar(valores: np.ndarray) -> np.ndarray:
+    """Lleva los valores al rango [0, 1]."""
+    rango = valores.max() - valores.min()
+    if rango == 0:
+        return np.ones_like(valores)
+    return (valores - valores.min()) / rango
+
+
+def agrupar_notas(noticias: List[Dict]) -> Tuple[List[int], List[int]]:
+    """
+    Agrupa las noticias que son la misma nota en distintos medios (títulos casi idénticos).
+
+    Returns:
+        (número de nota de cada noticia, cantidad de medios que publicaron cada noticia)
+    """
+    notas = [0] * len(noticias)
+    cantidades = [1] * len(noticias)
+    for numero, grupo in enumerate(compactar_prompt.agrupar_casi_duplicados(noticias)):
+        fuentes = len({noticias[i].get('fuente', '') for i in grupo})
+        for i in grupo:
+            notas[i] = numero
+            cantidades[i] = fuentes
+    return notas, cantidades
+
+
+def seleccionar_oraciones(noticias: List[Dict], max_oraciones: int = MAX_ORACIONES,
+                          max_palabras: int = MAX_PALABRAS) -> List[Tuple[Dict, float]]:
+    """
+    Elige las oraciones del resumen por puntaje, descartando las redundantes.
+
+    Returns:
+        Lista de (oración candidata, puntaje) en orden de importancia
+    """
+    candidatas = extraer_oraciones(noticias)
+    if not candidatas:
+        return []
+
+    matriz = matriz_tfidf([tokenizar(c['texto']) for c in candidatas])
+    similitud = matriz @ matriz.T
+
+    centroide = matriz.sum(axis=0)
+    norma = np.linalg.norm(centroide)
+    cercania = matriz @ (centroide / norma) if norma else np.zeros(len(candidatas))
+
+    puntajes = PESO_TEXTRANK * normalizar(puntuar_textrank(similitud)) + (1 - PESO_TEXTRANK) * normalizar(cercania)
+
+    notas, cantidad_fuentes = agrupar_notas(noticias)
+    for k, candidata in enumerate(candidatas):
+        if candidata['apertura']:
+            puntajes[k] += PLUS_APERTURA
+        puntajes[k] += PLUS_POR_FUENTE * (cantidad_fuentes[candidata['noticia']] - 1)
+
+    elegidas = []
+    palabras = 0
+    por_nota = Counter()
+    for k in np.argsort(-puntajes):
+        candidata = candidatas[k]
+        nota = notas[candidata['noticia']]
+        if por_nota[nota] >= MAX_ORACIONES_POR_NOTA:
+            continue
+        if elegidas and similitud[k, elegidas].max() > UMBRAL_REDUNDANCIA:
+            continue
+        largo = len(candidata['texto'].split())
+        if elegidas and palabras + largo > max_palabras:
+            continue
+
+        elegidas.append(k)
+        palabras += largo
+        por_nota[nota] += 1
+        if len(elegidas) >= max_oraciones:
+            break
+
+    return [(candidatas[k], float(puntajes[k])) for k in elegidas]
+
+
+def resumir_noticias(noticias: List[Dict], max_oraciones: int = MAX_ORACIONES,
+                     max_palabras: int = MAX_PALABRAS) -> str:
+    """
+    Resumen extractivo de una lista de noticias: un párrafo por oración elegida,
+    de la más a la menos representativa.
+
+    Args:
+        noticias: Noticias de la categoría (en el orden del frontend)
+        max_oraciones: Máximo de oraciones del resumen
+        max_palabras: Tope aproximado de palabras
+
+    Returns:
+        Texto del resumen (vacío si no hay oraciones utilizables)
+    """
+    elegidas = seleccionar_oraciones(noticias, max_oraciones, max_palabras)
+    return "\n\n".join(candidata['texto'] for candidata, _ in elegidas)
+
+
+def resumir_categoria(noticias_categoria: List[Dict], categoria: str) -> Dict:
+    """
+    Entrada de resumenes_{fecha}.json para una categoría, con el mismo formato que
+    generan los resúmenes de Gemini.
+    """
+    inicio = datetime.now()
+    texto = resumir_noticias(noticias_categoria)
+    milisegundos = (datetime.now() - inicio).total_seconds() * 1000
+    logging.info(f"✓ Resumen extractivo de {categoria}: {len(texto)} caracteres en {milisegundos:.0f} ms")
+
+    return {
+        "resumen": texto or "No hay noticias disponibles para esta categoría.",
+        "cantidad_noticias": len(noticias_categoria),
+        "fecha_generacion": datetime.now().isoformat(),
+        "categoria": categoria,
+        "modo": "extractivo"
+    }
+
+
+def cargar_json_noticias() -> Dict:
+    """
+    Carga el dataset consolidado más reciente de data/.
+    """
+    archivos = list(DATA_DIR.glob("noticias_*.json"))
+    if not archivos:
+        raise FileNotFoundError(f"No se encontró ningún archivo de noticias en {DATA_DIR}")
+
+    archivo = max(archivos, key=lambda p: p.stat().st_mtime)
+    logging.info(f"Cargando noticias desde: {archivo.name}")
+    with open(archivo, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    """
+    Genera los resúmenes extractivos de todas las categorías (modo sin IA).
+    """
+    logging.info("=" * 70)
+    logging.info("GENERACIÓN DE RESÚMENES EXTRACTIVOS (SIN IA)")
+    logging.info("=" * 70)
+
+    try:
+        data = cargar_json_noticias()
+    except Exception as e:
+        logging.error(f"Error al cargar noticias: {str(e)}")
+        return
+
+    noticias = data.get("noticias", [])
+    fecha_consolidacion = data.get("fecha_consolidacion", datetime.now().strftime("%Y-%m-%d"))
+
+    resumenes = {}
+    for categoria in CATEGORIAS:
+        noticias_categoria = filtrar_y_ordenar_noticias(
+            noticias, categoria, excluir_infobae=(categoria == "internacional")
+        )
+        with instrumentacion.medir("resumir", detalle=categoria, entrada=len(noticias_categoria)):
+            resumenes[categoria] = resumir_categoria(noticias_categoria, categoria)
+
+    nombre_archivo = f"resumenes_{fecha_consolidacion}.json"
+    archivo_salida = OUTPUT_DIR / nombre_archivo
+    resultado = {
+        "fecha_consolidacion": fecha_consolidacion,
+        "fecha_generacion": datetime.now().isoformat(),
+        "resumenes": resumenes
+    }
+
+    OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    with open(archivo_salida, "w", encoding="utf-8") as f:
+        json.dump(resultado, f, ensure_ascii=False, indent=2)
+
+    try:
+        FRONTEND_DIR.mkdir(parents=True, exist_ok=True)
+        shutil.copy2(archivo_salida, FRONTEND_DIR / nombre_archivo)
+    except Exception as e:
+        logging.error(f"No se pudo copiar a frontend/data: {str(e)}")
+
+    logging.info(f"💾 Resúmenes guardados en: {archivo_salida}")
+
+
+if __name__ == "__main__":
+    main()
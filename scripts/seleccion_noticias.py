@@ -0,0 +1,107 @@
+"""
+Selección de las noticias que se muestran por categoría en el frontend.
+Replica el filtrado, el orden y el intercalado por fuente de frontend/js/app.js para
+que los resúmenes (con IA o extractivos) cubran exactamente las noticias visibles.
+"""
+
+from typing import List, Dict
+
+# Categorías a procesar (en el mismo orden que el frontend)
+CATEGORIAS = ["internacional", "politica", "economia", "sociedad"]
+
+# Número de noticias por categoría
+NUM_NOTICIAS = 30
+
+
+def intercalar_por_fuente(noticias: List[Dict]) -> List[Dict]:
+    """
+    Intercala noticias por fuente para evitar noticias consecutivas de la misma fuente.
+    Replica la lógica del frontend.
+    
+    Args:
+        noticias: Lista de noticias ya ordenadas por fecha
+        
+    Returns:
+        Lista de noticias intercaladas por fuente
+    """
+    # 1. Agrupar noticias por fuente
+    noticias_por_fuente = {}
+    for noticia in noticias:
+        fuente = noticia.get("fuente", "Sin fuente")
+        if fuente not in noticias_por_fuente:
+            noticias_por_fuente[fuente] = []
+        noticias_por_fuente[fuente].append(noticia)
+    
+    # 2. Cada grupo ya está ordenado por fecha (más recientes primero)
+    # 3. Intercalar usando algoritmo round-robin
+    resultado = []
+    fuentes = list(noticias_por_fuente.keys())
+    indices = {fuente: 0 for fuente in fuentes}
+    
+    hay_mas_noticias = True
+    while hay_mas_noticias:
+        hay_mas_noticias = False
+        
+        # Agregar una noticia de cada fuente en orden
+        for fuente in fuentes:
+            cola_fuente = noticias_por_fuente[fuente]
+            if indices[fuente] < len(cola_fuente):
+                resultado.append(cola_fuente[indices[fuente]])
+                indices[fuente] += 1
+                hay_mas_noticias = True
+    
+    return resultado
+
+
+def filtrar_y_ordenar_noticias(noticias: List[Dict], categoria: str, excluir_infobae: bool = False) -> List[Dict]:
+    """
+    Filtra noticias por categoría y las ordena como en el frontend.
+    
+    Args:
+        noticias: Lista completa de noticias
+        categoria: Categoría a filtrar
+        excluir_infobae: Si True, excluye Infobae de la categoría internacional
+        
+    Returns:
+        Lista de noticias filtradas y ordenadas
+    """
+    # Filtrar por categoría
+    noticias_filtradas = []
+    for noticia in noticias:
+        categoria_noticia = noticia.get("categoria_url", "").lower().strip()
+        
+        # Si no tiene categoria_url, usar categoria como fallback
+        if not categoria_noticia or categoria_noticia == "":
+            categoria_noticia = noticia.get("categoria", "").lower().strip()
+            if categoria_noticia == "no categorizada" or categoria_noticia == "":
+                categoria_noticia = "otros"
+        
+        # Verificar si cumple la categoría
+        cumple_categoria = categoria_noticia == categoria.lower()
+        
+        # Excluir Infobae de internacional
+        if categoria.lower() == "internacional" and excluir_infobae:
+            if noticia.get("fuente") == "Infobae":
+                cumple_categoria = False
+        
+        if cumple_categoria:
+            noticias_filtradas.append(noticia)
+    
+    # Ordenar por fecha descendente
+    def obtener_fecha_sort(noticia: Dict) -> str:
+        fecha_local = noticia.get("fecha_local", "")
+        if fecha_local:
+            return fecha_local
+        return noticia.get("fecha_original", "")
+    
+    noticias_ordenadas = sorted(
+        noticias_filtradas,
+        key=obtener_fecha_sort,
+        reverse=True
+    )
+    
+    # Intercalar por fuente
+    noticias_intercaladas = intercalar_por_fuente(noticias_ordenadas)
+    
+    # Tomar solo las primeras NUM_NOTICIAS
+    return noticias_intercaladas[:NUM_NOTICIAS]
@@ -0,0 +1,294 @@
+"""
+Servidor local que imita la API REST de Gemini (generateContent) para probar y
+medir los scripts de IA sin la API real ni cuota.
+
+Atiende POST /v1beta/models/{modelo}:generateContent con el mismo formato de
+request/response que usa google-genai, y permite:
+- Latencia configurable (fija + jitter aleatorio).
+- Inyección de errores 429 (RESOURCE_EXHAUSTED) y 503 (UNAVAILABLE) con probabilidad dada.
+- Respuestas enlatadas (archivo JSON {"fragmento del prompt": "respuesta"}) o,
+  si ninguna coincide, respuestas armadas con plantillas según el tipo de prompt
+  (agrupación de temas -> JSON de temas; fusión de temas -> JSON de grupos;
+  nombres de grupos locales -> JSON de nombres;
+  resúmenes en lote -> JSON por categoría;
+  resumen -> texto con el formato esperado).
+
+Uso:
+    python scripts/servidor_gemini_simulado.py --puerto 8799 --latencia 0.8 --tasa-429 0.1
+
+    # En otra terminal, apuntar los scripts al servidor
+    GEMINI_BASE_URL=http://127.0.0.1:8799 GEMINI_API_KEY=local python scripts/agrupar_temas.py
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+import logging
+
+# Configuración de logging
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s"
+)
+
+# Parámetros por defecto
+PUERTO = 8799
+LATENCIA = 0.5        # Segundos de latencia base por respuesta
+JITTER = 0.2          # Segundos de variación aleatoria (+/-)
+TEMAS_POR_AGRUPACION = 6
+TITULARES_POR_TEMA = 4
+
+RUTA_GENERATE = re.compile(r"^/v1beta/models/([^/:]+):generateContent")
+
+ERRORES = {
+    429: ("RESOURCE_EXHAUSTED", "Resource has been exhausted (e.g. check quota)."),
+    503: ("UNAVAILABLE", "The model is overloaded. Please try again later."),
+}
+
+
+class ConfiguracionSimulador:
+    """
+    Comportamiento del servidor y contadores de lo atendido (compartidos entre hilos).
+    """
+
+    def __init__(self, latencia: float = LATENCIA, jitter: float = JITTER, tasa_429: float = 0.0,
+                 tasa_503: float = 0.0, respuestas: Optional[Dict[str, str]] = None, semilla: Optional[int] = None):
+        self.latencia = latencia
+        self.jitter = jitter
+        self.tasa_429 = tasa_429
+        self.tasa_503 = tasa_503
+        self.respuestas = respuestas or {}
+        self.azar = random.Random(semilla)
+        self.lock = threading.Lock()
+        self.contadores = {'solicitudes': 0, 'exitos': 0, 'errores_429': 0, 'errores_503': 0}
+
+    def sumar(self, clave: str):
+        with self.lock:
+            self.contadores[clave] += 1
+
+    def sortear_error(self) -> Optional[int]:
+        with self.lock:
+            valor = self.azar.random()
+        if valor < self.tasa_429:
+            return 429
+        if valor < self.tasa_429 + self.tasa_503:
+            return 503
+        return None
+
+    def demora(self) -> float:
+        with self.lock:
+            variacion = self.azar.uniform(-self.jitter, self.jitter)
+        return max(0.0, self.latencia + variacion)
+
+
+def extraer_prompt(cuerpo: Dict) -> str:
+    """
+    Junta el texto de todas las partes de 'contents' de un request generateContent.
+    """
+    textos = []
+    for contenido in cuerpo.get('contents', []):
+        for parte in contenido.get('parts', []):
+            if 'text' in parte:
+                textos.append(parte['text'])
+    return "\n".join(textos)
+
+
+def responder_agrupacion(prompt: str) -> str:
+    """
+    Respuesta de plantilla para el prompt de agrupación: temas con titulares consecutivos.
+    """
+    indices = [int(n) for n in re.findall(r"^(\d+)\. ", prompt, re.MULTILINE)]
+    temas = []
+    for k in range(min(TEMAS_POR_AGRUPACION, len(indices) // TITULARES_POR_TEMA)):
+        grupo = indices[k * TITULARES_POR_TEMA:(k + 1) * TITULARES_POR_TEMA]
+        titular = re.search(rf"^{grupo[0]}\. (.+?)(?: \[|$)", prompt, re.MULTILINE)
+        nombre = " ".join(titular.group(1).split()[:6]) if titular else f"Tema simulado {k + 1}"
+        temas.append({'tema': nombre, 'indices_titulares': grupo})
+    return "```json\n" + json.dumps({'temas': temas}, ensure_ascii=False, indent=2) + "\n```"
+
+
+def responder_fusion(prompt: str) -> str:
+    """
+    Respuesta de plantilla para el paso de fusión de temas: une los temas de a pares.
+    """
+    nombres = re.findall(r"^\d+\. (.+?) \[", prompt, re.MULTILINE)
+    temas = []
+    for k in range(0, min(len(nombres), TEMAS_POR_AGRUPACION * 2), 2):
+        indices = [i + 1 for i in range(k, min(k + 2, len(nombres)))]
+        temas.append({'tema': nombres[k], 'indices_temas': indices})
+    return "```json\n" + json.dumps({'temas': temas}, ensure_ascii=False, indent=2) + "\n```"
+
+
+def responder_nombres(prompt: str) -> str:
+    """
+    Respuesta de plantilla para nombrar grupos ya armados: el nombre sale del primer titular.
+    """
+    grupos = re.findall(r"^Grupo (\d+) .*\n  - (.+?) \[", prompt, re.MULTILINE)
+    temas = [
+        {'grupo': int(numero), 'tema': " ".join(titular.split()[:6])}
+        for numero, titular in grupos[:TEMAS_POR_AGRUPACION]
+    ]
+    return "```json\n" + json.dumps({'temas': temas}, ensure_ascii=False, indent=2) + "\n```"
+
+
+def responder_resumen(prompt: str) -> str:
+    """
+    Respuesta de plantilla para prompts de resumen: arma bullets con los títulos citados.
+    """
+    titulos = re.findall(r"^\d+\. (.+)$", prompt, re.MULTILINE)[:5]
+    bullets = "\n".join(f"• {titulo.strip()}" for titulo in titulos) or "• Sin noticias"
+    return (
+        "📌 **¿Qué está pasando?**\n" + bullets + "\n\n"
+        "🔍 **Datos clave:**\n• Respuesta generada por el servidor simulado\n\n"
+        "⚡ **Desarrollo:**\n• Texto de relleno para pruebas de carga\n\n"
+        "💡 **¿Por qué importa?**\n• Permite medir el pipeline sin la API real"
+    )
+
+
+def responder_lote(prompt: str) -> str:
+    """
+    Respuesta de plantilla para el prompt de resúmenes en lote: JSON con un resumen por categoría.
+    """
+    resumenes = {}
+    secciones = re.split(r"^### (\w+)$", prompt, flags=re.MULTILINE)
+    for categoria, cuerpo in zip(secciones[1::2], secciones[2::2]):
+        resumenes[categoria] = responder_resumen(cuerpo)
+    return json.dumps(resumenes, ensure_ascii=False, indent=2)
+
+
+def generar_respuesta(prompt: str, respuestas: Dict[str, str]) -> str:
+    """
+    Respuesta enlatada si algún fragmento coincide; si no, plantilla según el tipo de prompt.
+    """
+    for fragmento, respuesta in respuestas.items():
+        if fragmento in prompt:
+            return respuesta
+    if "agrupalos por tema" in prompt:
+        return responder_agrupacion(prompt)
+    if "Unificá los que se refieren" in prompt:
+        return responder_fusion(prompt)
+    if "Poné un nombre a cada grupo" in prompt:
+        return responder_nombres(prompt)
+    if "PARA CADA CATEGORÍA" in prompt:
+        return responder_lote(prompt)
+    return responder_resumen(prompt)
+
+
+def crear_handler(config: ConfiguracionSimulador):
+    """
+    Crea la clase de handler HTTP ligada a una configuración.
+    """
+
+    class HandlerGemini(BaseHTTPRequestHandler):
+
+        def log_message(self, formato, *args):
+            logging.debug(formato % args)
+
+        def _enviar_json(self, estado: int, datos: Dict):
+            cuerpo = json.dumps(datos, ensure_ascii=False).encode("utf-8")
+            self.send_response(estado)
+            self.send_header("Content-Type", "application/json; charset=UTF-8")
+            self.send_header("Content-Length", str(len(cuerpo)))
+            self.end_headers()
+            self.wfile.write(cuerpo)
+
+        def do_POST(self):
+            coincidencia = RUTA_GENERATE.match(self.path)
+            largo = int(self.headers.get("Content-Length", 0))
+            datos = self.rfile.read(largo) if largo else b"{}"
+
+            if not coincidencia:
+                self._enviar_json(404, {'error': {'code': 404, 'message': f"Ruta no soportada: {self.path}", 'status': 'NOT_FOUND'}})
+                return
+
+            config.sumar('solicitudes')
+            time.sleep(config.demora())
+
+            codigo_error = config.sortear_error()
+            if codigo_error:
+                config.sumar(f'errores_{codigo_error}')
+                estado, mensaje = ERRORES[codigo_error]
+                self._enviar_json(codigo_error, {'error': {'code': codigo_error, 'message': mensaje, 'status': estado}})
+                return
+
+            prompt = extraer_prompt(json.loads(datos or b"{}"))
+            texto = generar_respuesta(prompt, config.respuestas)
+            tokens_prompt = len(prompt) // 4 + 1
+            tokens_respuesta = len(texto) // 4 + 1
+
+            config.sumar('exitos')
+            self._enviar_json(200, {
+                'candidates': [{
+                    'content': {'parts': [{'text': texto}], 'role': 'model'},
+                    'finishReason': 'STOP',
+                    'index': 0,
+                }],
+                'usageMetadata': {
+                    'promptTokenCount': tokens_prompt,
+                    'candidatesTokenCount': tokens_respuesta,
+                    'totalTokenCount': tokens_prompt + tokens_respuesta,
+                },
+                'modelVersion': coincidencia.group(1),
+            })
+
+    return HandlerGemini
+
+
+def iniciar_servidor(config: ConfiguracionSimulador, puerto: int = 0) -> ThreadingHTTPServer:
+    """
+    Levanta el servidor en un hilo de fondo (puerto 0 = uno libre cualquiera).
+
+    Returns:
+        Servidor en ejecución (url en servidor.url; detener con servidor.shutdown())
+    """
+    servidor = ThreadingHTTPServer(("127.0.0.1", puerto), crear_handler(config))
+    servidor.daemon_threads = True
+    servidor.url = f"http://127.0.0.1:{servidor.server_address[1]}"
+    threading.Thread(target=servidor.serve_forever, name="gemini-simulado", daemon=True).start()
+    return servidor
+
+
+def cargar_respuestas(ruta: Optional[str]) -> Dict[str, str]:
+    if not ruta:
+        return {}
+    with open(ruta, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local que imita la API generateContent de Gemini")
+    parser.add_argument("--puerto", type=int, default=PUERTO)
+    parser.add_argument("--latencia", type=float, default=LATENCIA, help="Segundos de latencia base")
+    parser.add_argument("--jitter", type=float, default=JITTER, help="Variación aleatoria de la latencia (segundos)")
+    parser.add_argument("--tasa-429", type=float, default=0.0, help="Probabilidad de responder 429 RESOURCE_EXHAUSTED")
+    parser.add_argument("--tasa-503", type=float, default=0.0, help="Probabilidad de responder 503 UNAVAILABLE")
+    parser.add_argument("--respuestas", help="JSON con respuestas enlatadas {fragmento_del_prompt: respuesta}")
+    args = parser.parse_args()
+
+    config = ConfiguracionSimulador(
+        latencia=args.latencia, jitter=args.jitter, tasa_429=args.tasa_429,
+        tasa_503=args.tasa_503, respuestas=cargar_respuestas(args.respuestas)
+    )
+    servidor = ThreadingHTTPServer(("127.0.0.1", args.puerto), crear_handler(config))
+
+    logging.info("=" * 70)
+    logging.info(f"SERVIDOR GEMINI SIMULADO en http://127.0.0.1:{args.puerto}")
+    logging.info(f"Latencia {args.latencia}s ±{args.jitter}s | 429: {args.tasa_429:.0%} | 503: {args.tasa_503:.0%}")
+    logging.info("=" * 70)
+
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        servidor.server_close()
+        logging.info(f"Atendido: {config.contadores}")
+
+
+if __name__ == "__main__":
+    main()
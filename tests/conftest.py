@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# Los scripts se importan como módulos sueltos (igual que entre ellos)
+sys.path.insert(0, str(Path(__file__).parent.parent / "scripts"))
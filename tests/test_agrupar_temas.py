@@ -0,0 +1,69 @@
+"""
+Temas repetidos dentro de una misma corrida de agrupar_temas.
+"""
+
+import pytest
+
+import agrupar_temas
+import historico_temas_db
+
+FECHA = "2026-03-10"
+
+
+@pytest.fixture
+def conn(tmp_path, monkeypatch):
+    monkeypatch.setattr(historico_temas_db, "TEMAS_DIR", tmp_path)
+    monkeypatch.setattr(historico_temas_db, "DB_PATH", tmp_path / "historico_temas.db")
+    monkeypatch.setattr(historico_temas_db, "ARCHIVO_JSON_ANTERIOR", tmp_path / "historico_temas.json")
+    conexion = historico_temas_db.get_connection()
+    yield conexion
+    conexion.close()
+
+
+def noticias(cantidad):
+    return [{'titulo': f"Nota {i}", 'link': f"https://medio{i}.com/nota", 'fuente': f"Medio {i}"}
+            for i in range(1, cantidad + 1)]
+
+
+def test_nombres_iguales_o_similares_se_fusionan(conn):
+    temas = [
+        {'tema': "Paro docente universitario", 'indices_titulares': [1, 2]},
+        {'tema': "El paro docente universitario", 'indices_titulares': [2, 3]},
+        {'tema': "Paro docente universitario nacional", 'indices_titulares': [4]},
+    ]
+
+    unificados = agrupar_temas.unificar_temas_corrida(temas, noticias(4), conn, FECHA)
+
+    assert len(unificados) == 1
+    assert unificados[0]['tema'] == "Paro docente universitario"
+    assert unificados[0]['indices_titulares'] == [1, 2, 3, 4]
+    assert not unificados[0]['es_recurrente']
+
+
+def test_temas_que_coinciden_con_el_mismo_tema_del_historico_se_fusionan(conn):
+    historico_temas_db.registrar_aparicion(
+        conn, "riesgo_pais_baja_20260309", "Riesgo país baja", "riesgo pais baja", "2026-03-09",
+        2, "Resumen anterior", ["Medio 1", "Medio 2"], "economia"
+    )
+    temas = [
+        {'tema': "Riesgo país baja", 'indices_titulares': [1]},
+        {'tema': "Bonos y riesgo país", 'indices_titulares': [2]},
+        {'tema': "Riesgo país en baja", 'indices_titulares': [3]},
+    ]
+
+    unificados = agrupar_temas.unificar_temas_corrida(temas, noticias(3), conn, FECHA)
+
+    assert [t['tema_id'] for t in unificados] == ["riesgo_pais_baja_20260309", "bonos_y_riesgo_20260310"]
+    assert unificados[0]['es_recurrente']
+    assert unificados[0]['indices_titulares'] == [1, 3]
+
+
+def test_temas_distintos_con_el_mismo_comienzo_no_comparten_id(conn):
+    temas = [
+        {'tema': "Inflación de marzo en alimentos", 'indices_titulares': [1]},
+        {'tema': "Inflación de marzo según consultoras privadas", 'indices_titulares': [2]},
+    ]
+
+    unificados = agrupar_temas.unificar_temas_corrida(temas, noticias(2), conn, FECHA)
+
+    assert [t['tema_id'] for t in unificados] == ["inflacion_de_marzo_20260310", "inflacion_de_marzo_20260310_2"]
@@ -0,0 +1,45 @@
+"""
+Ruteo de extractores por dominio: qué intentos se prueban y se registran.
+"""
+
+import estadisticas_extractores
+import extraer_contenido
+
+
+def test_sin_datos_explora_con_todos():
+    orden, explorar = estadisticas_extractores.ordenar_extractores({}, "clarin.com", ["sitio", "newspaper3k"])
+    assert explorar
+    assert orden == ["sitio", "newspaper3k"]
+
+
+def test_con_datos_y_sin_epsilon_no_explora(monkeypatch):
+    monkeypatch.setattr(estadisticas_extractores, "EPSILON_EXPLORACION", 0.0)
+    estadisticas = {"clarin.com": {
+        "sitio": {'intentos': 10, 'exitos': 2, 'segundos': 0.1},
+        "newspaper3k": {'intentos': 10, 'exitos': 9, 'segundos': 1.0},
+    }}
+    orden, explorar = estadisticas_extractores.ordenar_extractores(estadisticas, "clarin.com", ["sitio", "newspaper3k"])
+    assert not explorar
+    assert orden == ["newspaper3k", "sitio"]
+
+
+def test_probar_todos_registra_cada_extractor(monkeypatch):
+    llamados = []
+
+    def extractor(nombre, contenido):
+        def extraer(url, html):
+            llamados.append(nombre)
+            return contenido
+        return extraer
+
+    monkeypatch.setattr(extraer_contenido, "EXTRACTORES", [
+        ("a", extractor("a", "texto de a")), ("b", extractor("b", "texto de b")), ("c", extractor("c", None)),
+    ])
+
+    contenido, metodo, intentos = extraer_contenido.extraer_texto_html("u", "<html>", ["a", "b", "c"])
+    assert (contenido, metodo) == ("texto de a", "a")
+    assert [i[0] for i in intentos] == ["a"]
+
+    contenido, metodo, intentos = extraer_contenido.extraer_texto_html("u", "<html>", ["c", "a", "b"], probar_todos=True)
+    assert (contenido, metodo) == ("texto de a", "a")
+    assert [(i[0], i[1]) for i in intentos] == [("c", False), ("a", True), ("b", True)]
@@ -0,0 +1,68 @@
+"""
+Reglas por medio: selectores de contenedor y bloques descartados.
+
+Las páginas de fixtures_html/ son sintéticas: reproducen a mano la estructura que
+esperan REGLAS_SITIOS (contenedor, párrafos y bloques de relacionadas, publicidad,
+newsletter, etc.) para probar el parser. No son notas descargadas de cada medio, así
+que no validan que los selectores sigan coincidiendo con el HTML real: para eso,
+correr benchmark_extractores.py sobre notas guardadas con --guardar.
+"""
+
+from pathlib import Path
+
+import pytest
+
+import extractores_sitios
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures_html"
+
+PARRAFO = "Texto del cuerpo de la nota con suficiente largo para superar el mínimo. " * 4
+
+
+def html_con(clases_bloque: str) -> str:
+    return (
+        "<html><body><article>"
+        f"<div class=\"{clases_bloque}\"><p>{PARRAFO}</p></div>"
+        "<div class=\"share-buttons\"><p>Compartir en redes sociales</p></div>"
+        "</article></body></html>"
+    )
+
+
+def test_descarta_solo_clases_completas():
+    texto = extractores_sitios.extraer_con_reglas("clarin.com", html_con("article-body-shared tags-container"))
+
+    assert texto is not None
+    assert "cuerpo de la nota" in texto
+    assert "Compartir" not in texto
+
+
+def test_descarta_bloque_con_clase_de_la_lista():
+    texto = extractores_sitios.extraer_con_reglas("clarin.com", html_con("nota share"))
+
+    assert texto is None
+
+
+def test_articulo_generico_no_corta_el_parseo_antes_del_cuerpo():
+    # Nota destacada de portada, más de un bloque de scripts y recién después el cuerpo
+    relleno = "<script>var x = 1;</script>" * (2 * extractores_sitios.TAMANO_BLOQUE // 26)
+    html = (
+        f"<html><body><article class=\"destacada\"><p>Nota destacada de la portada. {PARRAFO}</p></article>"
+        f"{relleno}<div class=\"body-nota\"><p>{PARRAFO}</p></div></body></html>"
+    )
+
+    texto = extractores_sitios.extraer_con_reglas("clarin.com", html)
+
+    assert texto == PARRAFO.strip()
+
+
+def test_cada_medio_tiene_pagina_sintetica():
+    carpetas = {carpeta.name for carpeta in FIXTURES_DIR.iterdir() if carpeta.is_dir()}
+    assert set(extractores_sitios.REGLAS_SITIOS) <= carpetas
+
+
+@pytest.mark.parametrize("archivo", sorted(FIXTURES_DIR.glob("*/*.html")), ids=lambda archivo: archivo.parent.name)
+def test_parser_extrae_el_cuerpo_de_la_pagina_sintetica(archivo):
+    esperado = archivo.with_suffix(".txt").read_text(encoding="utf-8").strip()
+    texto = extractores_sitios.extraer_con_reglas(archivo.parent.name, archivo.read_text(encoding="utf-8"))
+
+    assert texto == esperado
@@ -0,0 +1,35 @@
+"""
+Prompts de resumen por categoría.
+"""
+
+import generar_resumenes_gemini
+
+NOTICIAS = [
+    {'titulo': "El Banco Central compró reservas por tercera semana", 'fuente': "Clarín"},
+    {'titulo': "El Banco Central compró reservas por tercera semana consecutiva", 'fuente': "La Nación"},
+    {'titulo': "Paro docente universitario de 48 horas", 'fuente': "Página 12"},
+]
+
+
+def test_prompt_informa_las_entradas_tras_fusionar_duplicadas():
+    prompt = generar_resumenes_gemini.crear_prompt_resumen(NOTICIAS, "economia")
+
+    assert "las siguientes 2 noticias" in prompt
+    assert "Fuentes: Clarín, La Nación" in prompt
+
+
+def test_prompt_incremental_informa_las_entradas_nuevas():
+    prompt = generar_resumenes_gemini.crear_prompt_resumen_incremental("Resumen anterior", NOTICIAS, "economia", 10)
+
+    assert "integrando las 2 noticias nuevas" in prompt
+
+
+def test_sin_google_genai_usa_resumenes_extractivos(monkeypatch):
+    llamadas = []
+    monkeypatch.setenv("GEMINI_API_KEY", "clave-de-prueba")
+    monkeypatch.setattr(generar_resumenes_gemini.planificador_gemini, "genai", None)
+    monkeypatch.setattr(generar_resumenes_gemini.resumen_extractivo, "main", lambda: llamadas.append("extractivo"))
+
+    generar_resumenes_gemini.main()
+
+    assert llamadas == ["extractivo"]
@@ -0,0 +1,28 @@
+"""
+Caché de fechas parseadas (se mantiene entre corridas en el modo daemon).
+"""
+
+from datetime import datetime, timezone
+
+import normalizar_fechas
+
+
+def test_fecha_completa_se_cachea():
+    normalizar_fechas.parsear_fecha_completa.cache_clear()
+
+    dt = normalizar_fechas.parsear_fecha("Tue, 10 Mar 2026 14:30:00 +0000")
+
+    assert dt == datetime(2026, 3, 10, 14, 30, tzinfo=timezone.utc)
+    assert normalizar_fechas.parsear_fecha_completa("Tue, 10 Mar 2026 14:30:00 +0000") == dt
+    assert normalizar_fechas.parsear_fecha_completa.cache_info().hits == 1
+
+
+def test_fecha_parcial_no_se_cachea(monkeypatch):
+    assert normalizar_fechas.parsear_fecha("14:30").date() == datetime.now().date()
+    assert normalizar_fechas.parsear_fecha_completa("14:30") is None
+
+    # Al día siguiente (dateutil completa con la fecha de hoy) la misma hora es otra fecha
+    monkeypatch.setattr(normalizar_fechas.parser, "parse",
+                        lambda texto, default=None: (default or datetime(2030, 1, 2)).replace(hour=14, minute=30))
+
+    assert normalizar_fechas.parsear_fecha("14:30") == datetime(2030, 1, 2, 14, 30, tzinfo=timezone.utc)
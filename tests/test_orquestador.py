@@ -0,0 +1,56 @@
+"""
+Caché por huella del orquestador con una etapa que reescribe la salida de otra.
+"""
+
+import pytest
+
+import instrumentacion
+import orquestador
+
+
+@pytest.fixture
+def dataset(tmp_path, monkeypatch):
+    monkeypatch.setattr(orquestador, "BASE_DIR", tmp_path)
+    monkeypatch.setattr(orquestador, "ESTADO_PATH", tmp_path / "pipeline_estado.json")
+    monkeypatch.setattr(instrumentacion, "REPORTES_DIR", tmp_path / "reportes")
+    return tmp_path / "noticias.json"
+
+
+def etapas(dataset, llamadas):
+    def integrar():
+        llamadas.append("integrar")
+        dataset.write_text("integrado", encoding="utf-8")
+
+    def clasificar():
+        llamadas.append("clasificar")
+        dataset.write_text(dataset.read_text(encoding="utf-8") + " clasificado", encoding="utf-8")
+
+    # Como en ejecutar_pipeline: clasificar reescribe el dataset, que no figura entre sus entradas
+    return [
+        {'nombre': "integrar", 'titulo': "Integrar", 'funcion': integrar,
+         'entradas': lambda: [], 'salidas': lambda: [dataset]},
+        {'nombre': "clasificar", 'titulo': "Clasificar", 'funcion': clasificar, 'depende_de': ["integrar"],
+         'entradas': lambda: [], 'salidas': lambda: [dataset]},
+    ]
+
+
+def test_sin_cambios_no_repite_ninguna_etapa(dataset):
+    llamadas = []
+    orquestador.ejecutar_etapas(etapas(dataset, llamadas), medir_memoria=False)
+    resultados = orquestador.ejecutar_etapas(etapas(dataset, llamadas), medir_memoria=False)
+
+    assert resultados == {'integrar': "sin_cambios", 'clasificar': "sin_cambios"}
+    assert llamadas == ["integrar", "clasificar"]
+
+
+def test_si_la_etapa_anterior_se_ejecuta_la_posterior_tambien(dataset):
+    llamadas = []
+    orquestador.ejecutar_etapas(etapas(dataset, llamadas), medir_memoria=False)
+    dataset.unlink()
+
+    resultados = orquestador.ejecutar_etapas(etapas(dataset, llamadas), medir_memoria=False)
+
+    assert resultados == {'integrar': "ok", 'clasificar': "ok"}
+    assert dataset.read_text(encoding="utf-8") == "integrado clasificado"
+    assert orquestador.ejecutar_etapas(etapas(dataset, llamadas), medir_memoria=False) == {
+        'integrar': "sin_cambios", 'clasificar': "sin_cambios"}
@@ -0,0 +1,53 @@
+"""
+Log de progreso de extraer_contenido.py: retomar después de un corte que dejó una
+línea a medias.
+"""
+
+import json
+
+import extraer_contenido
+
+
+def noticia(link, metodo="sitio"):
+    return {'link': link, 'titulo': link, 'contenido_extraido': True, 'metodo_extraccion': metodo}
+
+
+def escribir_log(ruta, noticias, fragmento=""):
+    with open(ruta, "w", encoding="utf-8") as f:
+        for n in noticias:
+            f.write(json.dumps(n) + "\n")
+        f.write(fragmento)
+
+
+def test_agregar_despues_de_linea_truncada(tmp_path):
+    ruta = tmp_path / "progreso.ndjson"
+    escribir_log(ruta, [noticia("a"), noticia("b")], fragmento='{"link": "c", "titu')
+
+    assert extraer_contenido.reparar_progreso(ruta)
+    with open(ruta, "a", encoding="utf-8") as f:
+        extraer_contenido.escribir_progreso(f, noticia("d"))
+
+    completadas = extraer_contenido.cargar_progreso(ruta)
+    assert set(completadas) == {"a", "b", "d"}
+    assert ruta.read_text(encoding="utf-8").count("\n") == 3
+
+
+def test_log_completo_no_se_modifica(tmp_path):
+    ruta = tmp_path / "progreso.ndjson"
+    escribir_log(ruta, [noticia("a")])
+    contenido = ruta.read_bytes()
+
+    assert not extraer_contenido.reparar_progreso(ruta)
+    assert ruta.read_bytes() == contenido
+
+
+def test_unica_linea_truncada_deja_el_log_vacio(tmp_path):
+    ruta = tmp_path / "progreso.ndjson"
+    escribir_log(ruta, [], fragmento='{"link": "a"')
+
+    assert extraer_contenido.reparar_progreso(ruta)
+    assert ruta.read_bytes() == b""
+
+
+def test_log_inexistente(tmp_path):
+    assert not extraer_contenido.reparar_progreso(tmp_path / "no_existe.ndjson")